@@ -56,7 +56,9 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    # One transaction per revision, so revisions using autocommit_block (CREATE INDEX CONCURRENTLY) can leave it.
+    # `connection` must not be in a transaction already.
+    context.configure(connection=connection, target_metadata=target_metadata, transaction_per_migration=True)
 
     with context.begin_transaction():
         context.run_migrations()
@@ -0,0 +1,61 @@
+"""Add reward leaderboard indexes and ranking view
+
+Revision ID: 091266702dd7
+Revises: abfa4078ace3
+Create Date: 2026-10-17 13:00:12.804117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '091266702dd7'
+down_revision: Union[str, None] = 'abfa4078ace3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Built concurrently so rewards stay writable on large tables, which needs to run outside the migration transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_rewards_points_desc_user_id',
+            'rewards',
+            [sa.text('points DESC'), 'user_id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_rewards_streak_desc_user_id',
+            'rewards',
+            [sa.text('streak DESC'), 'user_id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+    # Ranked snapshot for the full leaderboard and "my rank", refreshed by the app (see refresh_leaderboard)
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW reward_leaderboard AS
+        SELECT
+            user_id,
+            points,
+            streak,
+            rank() OVER (ORDER BY points DESC) AS points_rank,
+            rank() OVER (ORDER BY streak DESC) AS streak_rank
+        FROM rewards
+        """
+    )
+    # The unique index is required by REFRESH MATERIALIZED VIEW CONCURRENTLY
+    op.create_index('ix_reward_leaderboard_user_id', 'reward_leaderboard', ['user_id'], unique=True)
+    op.create_index('ix_reward_leaderboard_points_rank', 'reward_leaderboard', ['points_rank', 'user_id'], unique=False)
+    op.create_index('ix_reward_leaderboard_streak_rank', 'reward_leaderboard', ['streak_rank', 'user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS reward_leaderboard")
+    op.drop_index('ix_rewards_streak_desc_user_id', table_name='rewards')
+    op.drop_index('ix_rewards_points_desc_user_id', table_name='rewards')
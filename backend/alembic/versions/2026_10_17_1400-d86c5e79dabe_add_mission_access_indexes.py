@@ -0,0 +1,103 @@
+"""Add composite and partial mission indexes for the repository access patterns
+
+Revision ID: d86c5e79dabe
+Revises: 091266702dd7
+Create Date: 2026-10-17 14:00:27.361842
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd86c5e79dabe'
+down_revision: Union[str, None] = '091266702dd7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Built concurrently so missions stay writable on large tables, which needs to run outside the migration transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_missions_user_id_created_at',
+            'missions',
+            ['user_id', 'created_at', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_missions_user_id_category_id_created_at',
+            'missions',
+            ['user_id', 'category_id', 'created_at', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_missions_user_id_type_created_at',
+            'missions',
+            ['user_id', 'type', 'created_at', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_missions_user_id_created_at_pending',
+            'missions',
+            ['user_id', 'created_at', 'id'],
+            unique=False,
+            postgresql_where=sa.text('NOT is_complete'),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_missions_user_id_created_at_high_priority',
+            'missions',
+            ['user_id', 'created_at', 'id'],
+            unique=False,
+            postgresql_where=sa.text('NOT is_complete AND priority >= 7'),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_missions_user_id_created_at_heavy',
+            'missions',
+            ['user_id', 'created_at', 'id'],
+            unique=False,
+            postgresql_where=sa.text('NOT is_complete AND heaviness >= 7'),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_missions_user_id_true_deadline_pending',
+            'missions',
+            ['user_id', 'true_deadline'],
+            unique=False,
+            postgresql_where=sa.text('NOT is_complete AND true_deadline IS NOT NULL'),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_missions_user_id_personal_deadline',
+            'missions',
+            ['user_id', 'personal_deadline'],
+            unique=False,
+            postgresql_where=sa.text('personal_deadline IS NOT NULL'),
+            postgresql_concurrently=True,
+        )
+        # Leading column of ix_missions_user_id_created_at, which also serves the user_id foreign key
+        op.drop_index(op.f('ix_missions_user_id'), table_name='missions', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f('ix_missions_user_id'), 'missions', ['user_id'], unique=False, postgresql_concurrently=True
+        )
+        op.drop_index('ix_missions_user_id_personal_deadline', table_name='missions', postgresql_concurrently=True)
+        op.drop_index('ix_missions_user_id_true_deadline_pending', table_name='missions', postgresql_concurrently=True)
+        op.drop_index('ix_missions_user_id_created_at_heavy', table_name='missions', postgresql_concurrently=True)
+        op.drop_index(
+            'ix_missions_user_id_created_at_high_priority', table_name='missions', postgresql_concurrently=True
+        )
+        op.drop_index('ix_missions_user_id_created_at_pending', table_name='missions', postgresql_concurrently=True)
+        op.drop_index('ix_missions_user_id_type_created_at', table_name='missions', postgresql_concurrently=True)
+        op.drop_index('ix_missions_user_id_category_id_created_at', table_name='missions', postgresql_concurrently=True)
+        op.drop_index('ix_missions_user_id_created_at', table_name='missions', postgresql_concurrently=True)
@@ -0,0 +1,66 @@
+"""Add full-text and trigram mission search
+
+Revision ID: 3061d1cee148
+Revises: 94a58ef116a6
+Create Date: 2026-10-17 16:00:44.190276
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3061d1cee148'
+down_revision: Union[str, None] = '94a58ef116a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # pg_trgm for the trigram operator class, btree_gin to put user_id in the same GIN indexes
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gin")
+
+    # Adding a stored generated column rewrites the table
+    op.add_column(
+        'missions',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+                "setweight(to_tsvector('english', coalesce(body, '')), 'B')",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+
+    # Built concurrently so missions stay writable on large tables, which needs to run outside the migration transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_missions_user_id_search_vector',
+            'missions',
+            ['user_id', 'search_vector'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_missions_user_id_title_trgm',
+            'missions',
+            ['user_id', 'title'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={'title': 'gin_trgm_ops'},
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_missions_user_id_title_trgm', table_name='missions', postgresql_using='gin')
+    op.drop_index('ix_missions_user_id_search_vector', table_name='missions', postgresql_using='gin')
+    op.drop_column('missions', 'search_vector')
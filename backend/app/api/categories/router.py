@@ -1,13 +1,21 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status, Response
 
+from app.api.routing import SessionReleasingRoute
 from app.models.neuri.schema import CategoryCreate, CategoryRead, CategoryUpdate
-from app.repositories.base import AsyncSession, get_session
-from app.response_models import SuccessResponse, SuccessListResponse
+from app.repositories.base import (
+    MAX_PAGE_SIZE,
+    AsyncSession,
+    PageParams,
+    get_page_params,
+    get_read_session,
+    get_session,
+)
+from app.response_models import SuccessResponse, SuccessListResponse, trusted_list_response
 from app.services.category import CategoryService
 
-router = APIRouter(prefix="/categories", tags=["Categories"])
+router = APIRouter(prefix="/categories", tags=["Categories"], route_class=SessionReleasingRoute)
 
 
 @router.post("/", response_model=SuccessResponse[CategoryRead])
@@ -24,18 +32,30 @@ async def create_category(
 @router.get("/user/{user_id}", response_model=SuccessListResponse[CategoryRead])
 async def list_user_categories(
     user_id: UUID,
-    session: AsyncSession = Depends(get_session),
+    page: PageParams | None = Depends(get_page_params),
+    session: AsyncSession = Depends(get_read_session),
     category_service: CategoryService = Depends(),
-) -> SuccessListResponse[CategoryRead]:
+) -> Response:
     """List categories for a user"""
-    categories = await category_service.list_user_categories(session, user_id)
-    return SuccessListResponse(data=categories)
+    categories = await category_service.list_user_categories(session, user_id, page)
+    return trusted_list_response(CategoryRead, categories.items, categories.meta())
+
+
+@router.get("/batch", response_model=SuccessListResponse[CategoryRead])
+async def get_categories_batch(
+    ids: list[UUID] = Query(..., max_length=MAX_PAGE_SIZE, description="One ids= parameter per id"),
+    session: AsyncSession = Depends(get_read_session),
+    category_service: CategoryService = Depends(),
+) -> Response:
+    """Get several categories by ID in one query, in the order requested. Unknown ids are skipped."""
+    categories = await category_service.get_categories(session, ids)
+    return trusted_list_response(CategoryRead, categories)
 
 
 @router.get("/{category_id}", response_model=SuccessResponse[CategoryRead])
 async def get_category(
     category_id: UUID,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     category_service: CategoryService = Depends(),
 ) -> SuccessResponse[CategoryRead]:
     """Get category by ID"""
@@ -1,28 +1,39 @@
+from typing import AsyncIterator
 from uuid import UUID
-from datetime import datetime
 
-from fastapi import APIRouter, Depends, status
-
-from app.models.neuri.schema import MissionCreate, MissionRead, MissionUpdate, MissionWithRelationsRead
-from app.repositories.base import AsyncSession, get_session
-from app.response_models import SuccessResponse, SuccessListResponse
+from fastapi import APIRouter, Body, Depends, Query, status, Response
+from fastapi.responses import StreamingResponse
+
+from app.api.routing import SessionReleasingRoute
+from app.models.neuri.schema import (
+    MissionCreate,
+    MissionRead,
+    MissionUpdate,
+    MissionWithRelationsRead,
+    RelatedNoteRead,
+    TypeaheadSuggestion,
+)
+from app.repositories.base import (
+    MAX_PAGE_SIZE,
+    AsyncSession,
+    PageParams,
+    ReadFanOut,
+    get_page_params,
+    get_read_fan_out,
+    get_read_session,
+    get_session,
+    managed_read_session,
+)
+from app.response_models import SuccessResponse, SuccessListResponse, ndjson_response, trusted_list_response
 from app.services.mission import MissionService
 from app.models.neuri.request import UpdateMissionRequest, CompleteMissionRequest, BreakDownMissionRequest
 
-router = APIRouter(prefix="/missions", tags=["Missions"])
-
+router = APIRouter(prefix="/missions", tags=["Missions"], route_class=SessionReleasingRoute)
 
-def convert_timezone_aware_to_naive(data: dict) -> dict:
-    """Convert timezone-aware datetimes to naive UTC datetimes for database storage"""
-    from datetime import timezone
-    for key, value in data.items():
-        if isinstance(value, datetime) and value.tzinfo is not None:
-            # Convert to UTC first, then make it naive
-            data[key] = value.astimezone(timezone.utc).replace(tzinfo=None)
-        elif isinstance(value, datetime) and value.tzinfo is None:
-            # If already naive, assume it's UTC
-            data[key] = value
-    return data
+FIELDS_DESCRIPTION = (
+    "Columns to return: 'full' (default), 'summary' (everything except the note body) "
+    "or a comma-separated list of mission fields"
+)
 
 
 @router.post("/", response_model=SuccessResponse[MissionRead])
@@ -32,132 +43,221 @@ async def create_mission(
     mission_service: MissionService = Depends(),
 ) -> SuccessResponse[MissionRead]:
     """Create a new mission"""
-    # Convert timezone-aware datetimes to naive for database
-    mission_dict = convert_timezone_aware_to_naive(mission_data.model_dump())
-    mission_create = MissionCreate(**mission_dict)
-    mission = await mission_service.create_mission(session, mission_create)
+    mission = await mission_service.create_mission(session, mission_data)
     return SuccessResponse(data=mission)
 
 
-@router.get("/user/{user_id}", response_model=SuccessListResponse[MissionRead])
+@router.get("/user/{user_id}", response_model=SuccessListResponse[MissionRead], response_model_exclude_unset=True)
 async def list_user_missions(
     user_id: UUID,
-    session: AsyncSession = Depends(get_session),
+    page: PageParams | None = Depends(get_page_params),
+    fields: str | None = Query(None, description=FIELDS_DESCRIPTION),
+    session: AsyncSession = Depends(get_read_session),
     mission_service: MissionService = Depends(),
-) -> SuccessListResponse[MissionRead]:
+) -> Response:
     """List missions for a user"""
-    missions = await mission_service.list_user_missions(session, user_id)
-    return SuccessListResponse(data=missions)
+    missions = await mission_service.list_user_missions(session, user_id, page, fields)
+    return trusted_list_response(MissionRead, missions.items, missions.meta(), exclude_unset=True)
+
+
+@router.get("/user/{user_id}/stream", response_class=StreamingResponse)
+async def stream_user_missions(
+    user_id: UUID,
+    mission_service: MissionService = Depends(),
+) -> StreamingResponse:
+    """Stream missions for a user as NDJSON"""
+
+    # The stream outlives the request dependencies, so it owns its session
+    async def rows() -> AsyncIterator[MissionRead]:
+        async with managed_read_session() as session:
+            async for mission in mission_service.stream_user_missions(session, user_id):
+                yield mission
 
+    return ndjson_response(rows())
 
-@router.get("/user/{user_id}/today", response_model=SuccessListResponse[MissionRead])
+
+@router.get("/user/{user_id}/today", response_model=SuccessListResponse[MissionRead], response_model_exclude_unset=True)
 async def list_today_missions(
     user_id: UUID,
-    session: AsyncSession = Depends(get_session),
+    page: PageParams | None = Depends(get_page_params),
+    fields: str | None = Query(None, description=FIELDS_DESCRIPTION),
+    session: AsyncSession = Depends(get_read_session),
     mission_service: MissionService = Depends(),
-) -> SuccessListResponse[MissionRead]:
+) -> Response:
     """Get missions due today - ADHD focus"""
-    missions = await mission_service.list_today_missions(session, user_id)
-    return SuccessListResponse(data=missions)
+    missions = await mission_service.list_today_missions(session, user_id, page, fields)
+    return trusted_list_response(MissionRead, missions.items, missions.meta(), exclude_unset=True)
 
 
-@router.get("/user/{user_id}/overdue", response_model=SuccessListResponse[MissionRead])
+@router.get(
+    "/user/{user_id}/overdue",
+    response_model=SuccessListResponse[MissionRead],
+    response_model_exclude_unset=True,
+)
 async def list_overdue_missions(
     user_id: UUID,
-    session: AsyncSession = Depends(get_session),
+    page: PageParams | None = Depends(get_page_params),
+    fields: str | None = Query(None, description=FIELDS_DESCRIPTION),
+    session: AsyncSession = Depends(get_read_session),
     mission_service: MissionService = Depends(),
-) -> SuccessListResponse[MissionRead]:
+) -> Response:
     """Get overdue missions - ADHD urgency"""
-    missions = await mission_service.list_overdue_missions(session, user_id)
-    return SuccessListResponse(data=missions)
+    missions = await mission_service.list_overdue_missions(session, user_id, page, fields)
+    return trusted_list_response(MissionRead, missions.items, missions.meta(), exclude_unset=True)
 
 
-@router.get("/user/{user_id}/high-priority", response_model=SuccessListResponse[MissionRead])
+@router.get(
+    "/user/{user_id}/high-priority",
+    response_model=SuccessListResponse[MissionRead],
+    response_model_exclude_unset=True,
+)
 async def list_high_priority_missions(
     user_id: UUID,
-    session: AsyncSession = Depends(get_session),
+    page: PageParams | None = Depends(get_page_params),
+    fields: str | None = Query(None, description=FIELDS_DESCRIPTION),
+    session: AsyncSession = Depends(get_read_session),
     mission_service: MissionService = Depends(),
-) -> SuccessListResponse[MissionRead]:
+) -> Response:
     """Get high priority missions - ADHD focus"""
-    missions = await mission_service.list_high_priority_missions(session, user_id)
-    return SuccessListResponse(data=missions)
+    missions = await mission_service.list_high_priority_missions(session, user_id, page, fields)
+    return trusted_list_response(MissionRead, missions.items, missions.meta(), exclude_unset=True)
 
 
-@router.get("/user/{user_id}/heavy", response_model=SuccessListResponse[MissionRead])
+@router.get("/user/{user_id}/heavy", response_model=SuccessListResponse[MissionRead], response_model_exclude_unset=True)
 async def list_heavy_missions(
     user_id: UUID,
-    session: AsyncSession = Depends(get_session),
+    page: PageParams | None = Depends(get_page_params),
+    fields: str | None = Query(None, description=FIELDS_DESCRIPTION),
+    session: AsyncSession = Depends(get_read_session),
     mission_service: MissionService = Depends(),
-) -> SuccessListResponse[MissionRead]:
+) -> Response:
     """Get heavy missions that might need breaking down"""
-    missions = await mission_service.list_heavy_missions(session, user_id)
-    return SuccessListResponse(data=missions)
+    missions = await mission_service.list_heavy_missions(session, user_id, page, fields)
+    return trusted_list_response(MissionRead, missions.items, missions.meta(), exclude_unset=True)
 
 
-@router.get("/user/{user_id}/search", response_model=SuccessListResponse[MissionRead])
+@router.get(
+    "/user/{user_id}/search",
+    response_model=SuccessListResponse[MissionRead],
+    response_model_exclude_unset=True,
+)
 async def search_missions(
     user_id: UUID,
-    search_term: str,
-    session: AsyncSession = Depends(get_session),
+    search_term: str = Query(..., min_length=1, max_length=255),
+    page: PageParams | None = Depends(get_page_params),
+    fields: str | None = Query(None, description=FIELDS_DESCRIPTION),
+    session: AsyncSession = Depends(get_read_session),
+    mission_service: MissionService = Depends(),
+) -> Response:
+    """
+    Search missions by title and body - ADHD context awareness.
+    Matches any word of the term, or the term fuzzily in the title, ranked best first and paginated
+    (one default-sized page when no limit is given).
+    """
+    missions = await mission_service.search_missions(session, user_id, search_term, page, fields)
+    return trusted_list_response(MissionRead, missions.items, missions.meta(), exclude_unset=True)
+
+
+@router.get("/user/{user_id}/typeahead", response_model=SuccessListResponse[TypeaheadSuggestion])
+async def typeahead(
+    user_id: UUID,
+    prefix: str = Query(..., min_length=1, max_length=255),
+    limit: int = Query(10, ge=1, le=50),
+    session: AsyncSession = Depends(get_read_session),
     mission_service: MissionService = Depends(),
-) -> SuccessListResponse[MissionRead]:
-    """Search missions by title - ADHD context awareness"""
-    missions = await mission_service.search_missions(session, user_id, search_term)
-    return SuccessListResponse(data=missions)
+) -> Response:
+    """Missions and categories with a title word starting with `prefix`, served from an in-memory index"""
+    suggestions = await mission_service.typeahead(session, user_id, prefix, limit)
+    return trusted_list_response(TypeaheadSuggestion, suggestions)
 
 
-@router.get("/user/{user_id}/category/{category_id}", response_model=SuccessListResponse[MissionRead])
+@router.get(
+    "/user/{user_id}/category/{category_id}",
+    response_model=SuccessListResponse[MissionRead],
+    response_model_exclude_unset=True,
+)
 async def list_category_missions(
     user_id: UUID,
     category_id: UUID,
-    session: AsyncSession = Depends(get_session),
+    page: PageParams | None = Depends(get_page_params),
+    fields: str | None = Query(None, description=FIELDS_DESCRIPTION),
+    session: AsyncSession = Depends(get_read_session),
     mission_service: MissionService = Depends(),
-) -> SuccessListResponse[MissionRead]:
+) -> Response:
     """List missions in a category"""
-    missions = await mission_service.list_category_missions(session, user_id, category_id)
-    return SuccessListResponse(data=missions)
+    missions = await mission_service.list_category_missions(session, user_id, category_id, page, fields)
+    return trusted_list_response(MissionRead, missions.items, missions.meta(), exclude_unset=True)
 
 
-@router.get("/user/{user_id}/type/{mission_type}", response_model=SuccessListResponse[MissionRead])
+@router.get(
+    "/user/{user_id}/type/{mission_type}",
+    response_model=SuccessListResponse[MissionRead],
+    response_model_exclude_unset=True,
+)
 async def list_type_missions(
     user_id: UUID,
     mission_type: str,
-    session: AsyncSession = Depends(get_session),
+    page: PageParams | None = Depends(get_page_params),
+    fields: str | None = Query(None, description=FIELDS_DESCRIPTION),
+    session: AsyncSession = Depends(get_read_session),
     mission_service: MissionService = Depends(),
-) -> SuccessListResponse[MissionRead]:
+) -> Response:
     """List missions by type"""
-    missions = await mission_service.list_type_missions(session, user_id, mission_type)
-    return SuccessListResponse(data=missions)
+    missions = await mission_service.list_type_missions(session, user_id, mission_type, page, fields)
+    return trusted_list_response(MissionRead, missions.items, missions.meta(), exclude_unset=True)
 
 
-@router.get("/user/{user_id}/subtasks/{parent_project_id}", response_model=SuccessListResponse[MissionRead])
+@router.get(
+    "/user/{user_id}/subtasks/{parent_project_id}",
+    response_model=SuccessListResponse[MissionRead],
+    response_model_exclude_unset=True,
+)
 async def list_sub_tasks(
     user_id: UUID,
     parent_project_id: UUID,
-    session: AsyncSession = Depends(get_session),
+    page: PageParams | None = Depends(get_page_params),
+    fields: str | None = Query(None, description=FIELDS_DESCRIPTION),
+    session: AsyncSession = Depends(get_read_session),
     mission_service: MissionService = Depends(),
-) -> SuccessListResponse[MissionRead]:
+) -> Response:
     """List sub-tasks for a project"""
-    missions = await mission_service.list_sub_tasks(session, user_id, parent_project_id)
-    return SuccessListResponse(data=missions)
+    missions = await mission_service.list_sub_tasks(session, user_id, parent_project_id, page, fields)
+    return trusted_list_response(MissionRead, missions.items, missions.meta(), exclude_unset=True)
 
 
-@router.get("/user/{user_id}/routine/{routine_id}", response_model=SuccessListResponse[MissionRead])
+@router.get(
+    "/user/{user_id}/routine/{routine_id}",
+    response_model=SuccessListResponse[MissionRead],
+    response_model_exclude_unset=True,
+)
 async def list_routine_generated_missions(
     user_id: UUID,
     routine_id: UUID,
-    session: AsyncSession = Depends(get_session),
+    page: PageParams | None = Depends(get_page_params),
+    fields: str | None = Query(None, description=FIELDS_DESCRIPTION),
+    session: AsyncSession = Depends(get_read_session),
     mission_service: MissionService = Depends(),
-) -> SuccessListResponse[MissionRead]:
+) -> Response:
     """List missions generated by a routine"""
-    missions = await mission_service.list_routine_generated_missions(session, user_id, routine_id)
-    return SuccessListResponse(data=missions)
+    missions = await mission_service.list_routine_generated_missions(session, user_id, routine_id, page, fields)
+    return trusted_list_response(MissionRead, missions.items, missions.meta(), exclude_unset=True)
+
+
+@router.get("/batch", response_model=SuccessListResponse[MissionRead])
+async def get_missions_batch(
+    ids: list[UUID] = Query(..., max_length=MAX_PAGE_SIZE, description="One ids= parameter per id"),
+    session: AsyncSession = Depends(get_read_session),
+    mission_service: MissionService = Depends(),
+) -> Response:
+    """Get several missions by ID in one query, in the order requested. Unknown ids are skipped."""
+    missions = await mission_service.get_missions(session, ids)
+    return trusted_list_response(MissionRead, missions)
 
 
 @router.get("/{mission_id}", response_model=SuccessResponse[MissionRead])
 async def get_mission(
     mission_id: UUID,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     mission_service: MissionService = Depends(),
 ) -> SuccessResponse[MissionRead]:
     """Get mission by ID"""
@@ -168,14 +268,26 @@ async def get_mission(
 @router.get("/{mission_id}/with-relations", response_model=SuccessResponse[MissionWithRelationsRead])
 async def get_mission_with_relations(
     mission_id: UUID,
-    session: AsyncSession = Depends(get_session),
+    reads: ReadFanOut = Depends(get_read_fan_out),
     mission_service: MissionService = Depends(),
 ) -> SuccessResponse[MissionWithRelationsRead]:
-    """Get mission with all relations"""
-    mission = await mission_service.get_mission_with_relations(session, mission_id)
+    """Get mission with all relations, the sub-task tree and the parent project are read concurrently"""
+    mission = await mission_service.get_mission_with_relations(reads, mission_id)
     return SuccessResponse(data=mission)
 
 
+@router.get("/{mission_id}/related-notes", response_model=SuccessListResponse[RelatedNoteRead])
+async def get_related_notes(
+    mission_id: UUID,
+    limit: int = Query(5, ge=1, le=50),
+    session: AsyncSession = Depends(get_read_session),
+    mission_service: MissionService = Depends(),
+) -> Response:
+    """Notes of the same user most related to this mission's title and body, best first"""
+    notes = await mission_service.get_related_notes(session, mission_id, limit)
+    return trusted_list_response(RelatedNoteRead, notes)
+
+
 @router.put("/{mission_id}", response_model=SuccessResponse[MissionRead])
 async def update_mission(
     mission_id: UUID,
@@ -202,23 +314,30 @@ async def complete_mission(
 @router.post("/{mission_id}/break-down", response_model=SuccessListResponse[MissionRead])
 async def break_down_mission(
     mission_id: UUID,
-    subtask_titles: list[str],
+    subtask_titles: list[str] = Body(..., max_length=100),
     session: AsyncSession = Depends(get_session),
     mission_service: MissionService = Depends(),
-) -> SuccessListResponse[MissionRead]:
+) -> Response:
     """Break down a heavy mission into smaller subtasks"""
     subtasks = await mission_service.break_down_mission(session, mission_id, subtask_titles)
-    return SuccessListResponse(data=subtasks)
+    return trusted_list_response(MissionRead, subtasks)
 
 
 @router.get("/user/{user_id}/ai-context", response_model=SuccessResponse[dict])
 async def get_context_for_ai(
     user_id: UUID,
-    session: AsyncSession = Depends(get_session),
+    recent_limit: int | None = Query(None, ge=0, le=MAX_PAGE_SIZE, description="Most recent missions to return"),
+    overdue_limit: int | None = Query(None, ge=0, le=MAX_PAGE_SIZE, description="Oldest overdue missions to return"),
+    today_limit: int | None = Query(None, ge=0, le=MAX_PAGE_SIZE, description="Missions due today to return"),
+    session: AsyncSession = Depends(get_read_session),
     mission_service: MissionService = Depends(),
 ) -> SuccessResponse[dict]:
-    """Get context for AI agent - recent missions, overdue, etc."""
-    context = await mission_service.get_context_for_ai(session, user_id)
+    """
+    Get context for AI agent - recent missions, overdue, etc. in one query.
+    The *_count totals and total_pending are exact whatever the section limits.
+    """
+    limits = {"recent": recent_limit, "overdue": overdue_limit, "today": today_limit}
+    context = await mission_service.get_context_for_ai(session, user_id, limits)
     return SuccessResponse(data=context)
 
 
@@ -243,10 +362,6 @@ async def update_mission_body(
     mission_id = UUID(request.mission_id)
     # Create MissionUpdate without mission_id, excluding unset fields (None values)
     update_dict = {k: v for k, v in request.model_dump(exclude={'mission_id'}).items() if v is not None}
-    
-    # Convert timezone-aware datetimes to naive datetimes
-    update_dict = convert_timezone_aware_to_naive(update_dict)
-    
     update_data = MissionUpdate(**update_dict)
     mission = await mission_service.update_mission(session, mission_id, update_data)
     return SuccessResponse(data=mission)
@@ -269,8 +384,8 @@ async def break_down_mission_body(
     request: BreakDownMissionRequest,
     session: AsyncSession = Depends(get_session),
     mission_service: MissionService = Depends(),
-) -> SuccessListResponse[MissionRead]:
+) -> Response:
     """Break down a heavy mission - Vapi apiRequest compatible"""
     mission_id = UUID(request.mission_id)
     subtasks = await mission_service.break_down_mission(session, mission_id, request.subtask_titles)
-    return SuccessListResponse(data=subtasks)
+    return trusted_list_response(MissionRead, subtasks)
@@ -1,14 +1,78 @@
+from datetime import date
+from typing import AsyncIterator
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
-
-from app.models.neuri.schema import RewardRead, DashboardStats
-from app.repositories.base import AsyncSession, get_session
-from app.response_models import SuccessResponse
+from fastapi import APIRouter, Depends, Query, status, Response
+from fastapi.responses import StreamingResponse
+
+from app.api.routing import SessionReleasingRoute
+from app.models.neuri.schema import LeaderboardEntry, PointsHistoryEntry, RewardRead, DashboardStats
+from app.repositories.base import (
+    AsyncSession,
+    PageParams,
+    get_page_params,
+    get_read_session,
+    get_session,
+    managed_read_session,
+)
+from app.repositories.reward import LeaderboardMetric
+from app.repositories.reward_ledger import HistoryPeriod
+from app.response_models import SuccessResponse, SuccessListResponse, ndjson_response, trusted_list_response
 from app.services.reward import RewardService
 from app.models.neuri.request import UpdateUserStreakRequest, AddMissionPointsRequest
 
-router = APIRouter(prefix="/rewards", tags=["Rewards"])
+router = APIRouter(prefix="/rewards", tags=["Rewards"], route_class=SessionReleasingRoute)
+
+
+@router.get("/stream", response_class=StreamingResponse)
+async def stream_rewards(
+    reward_service: RewardService = Depends(),
+) -> StreamingResponse:
+    """Stream all rewards as NDJSON"""
+
+    # The stream outlives the request dependencies, so it owns its session
+    async def rows() -> AsyncIterator[RewardRead]:
+        async with managed_read_session() as session:
+            async for reward in reward_service.stream_rewards(session):
+                yield reward
+
+    return ndjson_response(rows())
+
+
+@router.get("/leaderboard/top", response_model=SuccessListResponse[LeaderboardEntry])
+async def get_top_users(
+    by: LeaderboardMetric = "points",
+    limit: int = Query(10, ge=1, le=100),
+    session: AsyncSession = Depends(get_read_session),
+    reward_service: RewardService = Depends(),
+) -> Response:
+    """Top users by points or streak, always up to date"""
+    entries = await reward_service.get_top_users(session, by, limit)
+    return trusted_list_response(LeaderboardEntry, entries)
+
+
+@router.get("/leaderboard", response_model=SuccessListResponse[LeaderboardEntry])
+async def get_leaderboard(
+    by: LeaderboardMetric = "points",
+    page: PageParams | None = Depends(get_page_params),
+    session: AsyncSession = Depends(get_read_session),
+    reward_service: RewardService = Depends(),
+) -> Response:
+    """Full ranking by points or streak, paginated, as of the last leaderboard refresh"""
+    entries = await reward_service.get_leaderboard(session, by, page or PageParams())
+    return trusted_list_response(LeaderboardEntry, entries.items, entries.meta())
+
+
+@router.get("/user/{user_id}/rank", response_model=SuccessResponse[LeaderboardEntry])
+async def get_user_rank(
+    user_id: UUID,
+    by: LeaderboardMetric = "points",
+    session: AsyncSession = Depends(get_read_session),
+    reward_service: RewardService = Depends(),
+) -> SuccessResponse[LeaderboardEntry]:
+    """User's rank by points or streak, as of the last leaderboard refresh"""
+    entry = await reward_service.get_user_rank(session, user_id, by)
+    return SuccessResponse(data=entry)
 
 
 @router.get("/user/{user_id}", response_model=SuccessResponse[RewardRead])
@@ -43,10 +107,24 @@ async def update_user_streak(
     reward_service: RewardService = Depends(),
 ) -> SuccessResponse[RewardRead]:
     """Update user's streak"""
-    reward = await reward_service.update_user_streak(session, user_id, streak_change)
+    reward = await reward_service.update_streak(session, user_id, streak_change)
     return SuccessResponse(data=reward)
 
 
+@router.get("/user/{user_id}/points-history", response_model=SuccessListResponse[PointsHistoryEntry])
+async def get_points_history(
+    user_id: UUID,
+    period: HistoryPeriod = "day",
+    since: date | None = None,
+    until: date | None = None,
+    session: AsyncSession = Depends(get_read_session),
+    reward_service: RewardService = Depends(),
+) -> Response:
+    """Points and completed tasks per day or week, oldest first. Defaults to the last 30 days or 12 weeks."""
+    history = await reward_service.get_points_history(session, user_id, period, since, until)
+    return trusted_list_response(PointsHistoryEntry, history)
+
+
 @router.get("/user/{user_id}/dashboard-stats", response_model=SuccessResponse[DashboardStats])
 async def get_dashboard_stats(
     user_id: UUID,
@@ -70,7 +148,7 @@ async def update_user_streak_body(
 ) -> SuccessResponse[RewardRead]:
     """Update user's streak - Vapi apiRequest compatible"""
     user_uuid = UUID(HARDCODED_USER_ID)
-    reward = await reward_service.update_user_streak(session, user_uuid, request.streak_change)
+    reward = await reward_service.update_streak(session, user_uuid, request.streak_change)
     return SuccessResponse(data=reward)
 
 
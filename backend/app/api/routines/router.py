@@ -1,14 +1,25 @@
+from typing import AsyncIterator
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status, Response
+from fastapi.responses import StreamingResponse
 
+from app.api.routing import SessionReleasingRoute
 from app.models.neuri.schema import RoutineCreate, RoutineRead, RoutineUpdate, RoutineCreateWithSchedule, RoutineTaskGenerationResponse
-from app.repositories.base import AsyncSession, get_session
-from app.response_models import SuccessResponse, SuccessListResponse
+from app.repositories.base import (
+    MAX_PAGE_SIZE,
+    AsyncSession,
+    PageParams,
+    get_page_params,
+    get_read_session,
+    get_session,
+    managed_read_session,
+)
+from app.response_models import SuccessResponse, SuccessListResponse, ndjson_response, trusted_list_response
 from app.services.routine import RoutineService
 from app.models.neuri.request import GenerateRoutineTasksRequest, CreateRoutineRequest
 
-router = APIRouter(prefix="/routines", tags=["Routines"])
+router = APIRouter(prefix="/routines", tags=["Routines"], route_class=SessionReleasingRoute)
 
 
 @router.post("/", response_model=SuccessResponse[RoutineRead])
@@ -55,42 +66,71 @@ async def create_routine_with_schedule(
 @router.get("/user/{user_id}", response_model=SuccessListResponse[RoutineRead])
 async def list_user_routines(
     user_id: UUID,
-    session: AsyncSession = Depends(get_session),
+    page: PageParams | None = Depends(get_page_params),
+    session: AsyncSession = Depends(get_read_session),
     routine_service: RoutineService = Depends(),
-) -> SuccessListResponse[RoutineRead]:
+) -> Response:
     """List routines for a user"""
-    routines = await routine_service.list_user_routines(session, user_id)
-    return SuccessListResponse(data=routines)
+    routines = await routine_service.list_user_routines(session, user_id, page)
+    return trusted_list_response(RoutineRead, routines.items, routines.meta())
+
+
+@router.get("/user/{user_id}/stream", response_class=StreamingResponse)
+async def stream_user_routines(
+    user_id: UUID,
+    routine_service: RoutineService = Depends(),
+) -> StreamingResponse:
+    """Stream routines for a user as NDJSON"""
+
+    # The stream outlives the request dependencies, so it owns its session
+    async def rows() -> AsyncIterator[RoutineRead]:
+        async with managed_read_session() as session:
+            async for routine in routine_service.stream_user_routines(session, user_id):
+                yield routine
+
+    return ndjson_response(rows())
 
 
 @router.get("/user/{user_id}/category/{category_id}", response_model=SuccessListResponse[RoutineRead])
 async def list_category_routines(
     user_id: UUID,
     category_id: UUID,
-    session: AsyncSession = Depends(get_session),
+    page: PageParams | None = Depends(get_page_params),
+    session: AsyncSession = Depends(get_read_session),
     routine_service: RoutineService = Depends(),
-) -> SuccessListResponse[RoutineRead]:
+) -> Response:
     """List routines in a category"""
-    routines = await routine_service.list_category_routines(session, user_id, category_id)
-    return SuccessListResponse(data=routines)
+    routines = await routine_service.list_category_routines(session, user_id, category_id, page)
+    return trusted_list_response(RoutineRead, routines.items, routines.meta())
 
 
 @router.get("/user/{user_id}/day/{day_of_week}", response_model=SuccessListResponse[RoutineRead])
 async def get_routines_for_day(
     user_id: UUID,
     day_of_week: str,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     routine_service: RoutineService = Depends(),
-) -> SuccessListResponse[RoutineRead]:
+) -> Response:
     """Get routines scheduled for a specific day of the week"""
     routines = await routine_service.get_routines_for_day(session, user_id, day_of_week)
-    return SuccessListResponse(data=routines)
+    return trusted_list_response(RoutineRead, routines)
+
+
+@router.get("/batch", response_model=SuccessListResponse[RoutineRead])
+async def get_routines_batch(
+    ids: list[UUID] = Query(..., max_length=MAX_PAGE_SIZE, description="One ids= parameter per id"),
+    session: AsyncSession = Depends(get_read_session),
+    routine_service: RoutineService = Depends(),
+) -> Response:
+    """Get several routines by ID in one query, in the order requested. Unknown ids are skipped."""
+    routines = await routine_service.get_routines(session, ids)
+    return trusted_list_response(RoutineRead, routines)
 
 
 @router.get("/{routine_id}", response_model=SuccessResponse[RoutineRead])
 async def get_routine(
     routine_id: UUID,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     routine_service: RoutineService = Depends(),
 ) -> SuccessResponse[RoutineRead]:
     """Get routine by ID"""
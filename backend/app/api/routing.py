@@ -0,0 +1,37 @@
+import functools
+import inspect
+from typing import Any, Callable, Coroutine
+
+from fastapi.routing import APIRoute
+
+from app.repositories.base import AsyncSession, release_session
+
+Endpoint = Callable[..., Coroutine[Any, Any, Any]]  # type: ignore[explicit-any]
+
+
+def _releasing_sessions(endpoint: Endpoint) -> Endpoint:
+    @functools.wraps(endpoint)
+    async def wrapper(*args: object, **kwargs: object) -> object:
+        result = await endpoint(*args, **kwargs)
+        for value in kwargs.values():
+            if isinstance(value, AsyncSession):
+                await release_session(value)
+        return result
+
+    return wrapper
+
+
+class SessionReleasingRoute(APIRoute):
+    """
+    Route that commits and closes the endpoint's db sessions as soon as the endpoint returns.
+
+    Yield dependencies such as `get_session` only run their cleanup after the response has been validated and
+    serialized, so the pooled connection would stay checked out for that CPU work. Releasing the session here
+    returns the connection first. If the endpoint raises, cleanup is left to the dependency, which rolls back.
+    Attributes stay loaded after the commit (`expire_on_commit=False`), so the response can still be built from them.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:  # type: ignore[explicit-any]
+        if inspect.iscoroutinefunction(endpoint):
+            endpoint = _releasing_sessions(endpoint)
+        super().__init__(path, endpoint, **kwargs)
@@ -1,14 +1,24 @@
+from typing import AsyncIterator
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
-
-from app.models.neuri.schema import UserCreate, UserRead, UserUpdate, UserProfileSetup
-from app.repositories.base import AsyncSession, get_session
-from app.response_models import SuccessResponse, SuccessListResponse
+from fastapi import APIRouter, Depends, status, Response
+from fastapi.responses import StreamingResponse
+
+from app.api.routing import SessionReleasingRoute
+from app.models.neuri.schema import UserCreate, UserDashboardRead, UserRead, UserUpdate, UserProfileSetup
+from app.repositories.base import (
+    AsyncSession,
+    ReadFanOut,
+    get_read_fan_out,
+    get_read_session,
+    get_session,
+    managed_read_session,
+)
+from app.response_models import SuccessResponse, SuccessListResponse, ndjson_response, trusted_list_response
 from app.services.user import UserService
 from app.models.neuri.request import UpdateUserRequest
 
-router = APIRouter(prefix="/users", tags=["Users"])
+router = APIRouter(prefix="/users", tags=["Users"], route_class=SessionReleasingRoute)
 
 
 @router.post("/", response_model=SuccessResponse[UserRead])
@@ -24,12 +34,28 @@ async def create_user(
 
 @router.get("/", response_model=SuccessListResponse[UserRead])
 async def list_users(
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     user_service: UserService = Depends(),
-) -> SuccessListResponse[UserRead]:
+) -> Response:
     """List all users"""
     users = await user_service.list_users(session)
-    return SuccessListResponse(data=users)
+    return trusted_list_response(UserRead, users)
+
+
+# Put /stream BEFORE /{user_id} so FastAPI doesn't try to parse "stream" as a UUID
+@router.get("/stream", response_class=StreamingResponse)
+async def stream_users(
+    user_service: UserService = Depends(),
+) -> StreamingResponse:
+    """Stream all users as NDJSON"""
+
+    # The stream outlives the request dependencies, so it owns its session
+    async def rows() -> AsyncIterator[UserRead]:
+        async with managed_read_session() as session:
+            async for user in user_service.stream_users(session):
+                yield user
+
+    return ndjson_response(rows())
 
 
 # Put /body BEFORE /{user_id} so FastAPI doesn't try to parse "body" as a UUID
@@ -51,7 +77,7 @@ async def update_user_body(
 @router.get("/{user_id}", response_model=SuccessResponse[UserRead])
 async def get_user(
     user_id: UUID,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     user_service: UserService = Depends(),
 ) -> SuccessResponse[UserRead]:
     """Get user by ID"""
@@ -59,6 +85,17 @@ async def get_user(
     return SuccessResponse(data=user)
 
 
+@router.get("/{user_id}/dashboard", response_model=SuccessResponse[UserDashboardRead])
+async def get_user_dashboard(
+    user_id: UUID,
+    reads: ReadFanOut = Depends(get_read_fan_out),
+    user_service: UserService = Depends(),
+) -> SuccessResponse[UserDashboardRead]:
+    """User dashboard: profile, reward and mission, category and routine counts"""
+    dashboard = await user_service.get_dashboard(reads, user_id)
+    return SuccessResponse(data=dashboard)
+
+
 @router.put("/{user_id}", response_model=SuccessResponse[UserRead])
 async def update_user(
     user_id: UUID,
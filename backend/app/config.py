@@ -30,6 +30,57 @@ class Config(BaseSettings):
     POSTGRES_DB: str = "myapp"
     JWT_SECRET_KEY: Annotated[str, AfterValidator(is_not_empty)] = ""
 
+    # Number of compiled SQL strings SQLAlchemy keeps per engine (query_cache_size)
+    SQLALCHEMY_QUERY_CACHE_SIZE: int = 500
+    # Number of prepared statements asyncpg keeps per connection, 0 disables the cache
+    ASYNCPG_PREPARED_STATEMENT_CACHE_SIZE: int = 100
+
+    # Connection pool, per worker process. When DB_MAX_CONNECTIONS is set it is split evenly across
+    # WEB_CONCURRENCY workers (the same variable uvicorn reads for --workers) and caps pool size + overflow.
+    WEB_CONCURRENCY: int = 1
+    DB_MAX_CONNECTIONS: int | None = None
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0  # seconds to wait for a connection before giving up
+    DB_POOL_RECYCLE: int = 1800  # seconds before a connection is replaced, -1 disables
+    DB_POOL_PRE_PING: bool = True
+    # Connections one request may hold at once for concurrent reads (see ReadFanOut), keep well under the pool size
+    DB_FAN_OUT_CONNECTIONS: int = 3
+
+    # Optional read replica (same credentials as the primary). Read-only routes use it unless the
+    # client wrote within the last REPLICA_READ_YOUR_WRITES_SECONDS, to cover replication lag.
+    POSTGRES_REPLICA_SERVER: str | None = None
+    POSTGRES_REPLICA_PORT: int | None = None
+    REPLICA_READ_YOUR_WRITES_SECONDS: float = 5.0
+
+    # Per-request SQL statement count and timing, reported as Server-Timing headers and log fields.
+    # With DB_N_PLUS_ONE_THRESHOLD set, a warning is logged when one statement runs that many times in a request.
+    DB_QUERY_STATS_ENABLED: bool = True
+    DB_N_PLUS_ONE_THRESHOLD: int | None = None
+
+    # Reward ledger events are written off the request path, in batches of up to REWARD_LEDGER_BATCH_SIZE at least
+    # every REWARD_LEDGER_FLUSH_SECONDS. Past REWARD_LEDGER_MAX_PENDING unwritten events the oldest are dropped.
+    # A batch that fails REWARD_LEDGER_MAX_RETRIES flushes in a row is written event by event, dropping rejected events.
+    REWARD_LEDGER_FLUSH_SECONDS: float = 1.0
+    REWARD_LEDGER_BATCH_SIZE: int = 500
+    REWARD_LEDGER_MAX_PENDING: int = 50_000
+    REWARD_LEDGER_MAX_RETRIES: int = 3
+
+    # Interval between refreshes of the ranked leaderboard snapshot behind the full leaderboard and "my rank"
+    LEADERBOARD_REFRESH_SECONDS: float = 300.0
+
+    # In-process TF-IDF indexes of users' notes behind "related notes", built on first use. Each worker keeps up to
+    # NOTE_INDEX_MAX_USERS users (least recently used evicted) and rebuilds an index after NOTE_INDEX_TTL_SECONDS,
+    # which also picks up notes edited through other workers.
+    NOTE_INDEX_MAX_USERS: int = 500
+    NOTE_INDEX_TTL_SECONDS: float = 600.0
+
+    # In-process prefix indexes of users' mission and category titles behind typeahead, built on first use. Each
+    # worker drops users idle for TYPEAHEAD_IDLE_SECONDS, evicts the least recently used past TYPEAHEAD_MAX_ENTRIES
+    # entries in total (a title takes up to 6) and rebuilds an index after TYPEAHEAD_TTL_SECONDS.
+    TYPEAHEAD_MAX_ENTRIES: int = 1_000_000
+    TYPEAHEAD_IDLE_SECONDS: float = 900.0
+    TYPEAHEAD_TTL_SECONDS: float = 600.0
 
     templates_path: Path = Path(__file__).parent.parent / "templates"
     assets_path: Path = Path(__file__).parent.parent / "assets"
@@ -37,6 +88,22 @@ class Config(BaseSettings):
     environment: EnvironmentType = EnvironmentType.PRODUCTION
     release: str = "default"
 
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def db_pool_size_per_worker(self) -> int:
+        if self.DB_MAX_CONNECTIONS is None:
+            return self.DB_POOL_SIZE
+        per_worker = max(1, self.DB_MAX_CONNECTIONS // max(1, self.WEB_CONCURRENCY))
+        return min(self.DB_POOL_SIZE, per_worker)
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def db_max_overflow_per_worker(self) -> int:
+        if self.DB_MAX_CONNECTIONS is None:
+            return self.DB_MAX_OVERFLOW
+        per_worker = max(1, self.DB_MAX_CONNECTIONS // max(1, self.WEB_CONCURRENCY))
+        return min(self.DB_MAX_OVERFLOW, per_worker - self.db_pool_size_per_worker)
+
     @computed_field  # type: ignore[prop-decorator]
     @property
     def SQLALCHEMY_DATABASE_URI(self) -> PostgresDsn:
@@ -49,5 +116,19 @@ class Config(BaseSettings):
             path=self.POSTGRES_DB,
         )
 
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def SQLALCHEMY_REPLICA_DATABASE_URI(self) -> PostgresDsn | None:
+        if self.POSTGRES_REPLICA_SERVER is None:
+            return None
+        return PostgresDsn.build(
+            scheme="postgresql+asyncpg",
+            username=self.POSTGRES_USER,
+            password=self.POSTGRES_PASSWORD,
+            host=self.POSTGRES_REPLICA_SERVER,
+            port=self.POSTGRES_REPLICA_PORT or self.POSTGRES_PORT,
+            path=self.POSTGRES_DB,
+        )
+
 
 config = Config()
@@ -1,5 +1,6 @@
+import asyncio
 import logging
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 from pathlib import Path
 from typing import AsyncGenerator, Awaitable, Callable
 
@@ -17,6 +18,10 @@ from app.config import config
 from app.fastapi_app import App
 from app.response_models import SuccessResponse
 from app.repositories.base import engine
+from app.repositories.pool import PoolStats, pool_stats
+from app.repositories.query_stats import track_queries
+from app.repositories.reward import refresh_leaderboard_periodically
+from app.repositories.reward_ledger import reward_ledger
 from app.sentry import setup_sentry
 
 
@@ -41,7 +46,9 @@ async def run_migrations() -> None:
     logger.info(f"Running migrations from '{loc}'")
     alembic_cfg.set_main_option("script_location", str(loc))
     alembic_cfg.config_file_name = None  # to prevent alembic from overriding the logs
-    async with engine.begin() as conn:
+    # A plain connection, not engine.begin(): env.py runs each revision in its own transaction, and revisions that
+    # build indexes concurrently step out of it (autocommit_block), which an outer transaction would prevent
+    async with engine.connect() as conn:
         await conn.run_sync(run_upgrade, alembic_cfg)
 
 
@@ -52,8 +59,18 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # TODO: put this in the docker image, if we run multiple workers this will unncessarily run migrations many times
     if config.environment == "development":
         await run_migrations()
+
+    ledger_writer = asyncio.create_task(reward_ledger.run())
+    leaderboard_refresher = asyncio.create_task(refresh_leaderboard_periodically(config.LEADERBOARD_REFRESH_SECONDS))
     yield
 
+    # On shutdown, write what is still buffered
+    for task in (ledger_writer, leaderboard_refresher):
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    await reward_ledger.flush()
+
 
 app = App(lifespan=lifespan)  # type: ignore
 app.add_middleware(GZipMiddleware, minimum_size=1000, compresslevel=6)
@@ -69,10 +86,50 @@ async def delete_auth_cookie_on_exception(
     return response
 
 
+if config.DB_QUERY_STATS_ENABLED:
+
+    @app.middleware("http")
+    async def record_query_stats(request: Request, call_next: Callable[[Request], Awaitable[Response]]) -> Response:
+        """Report the SQL statements each request ran, as Server-Timing headers and log fields"""
+        with track_queries() as stats:
+            response = await call_next(request)
+
+        # Streaming bodies run after this point, only the statements before the first byte are counted
+        response.headers.append("Server-Timing", stats.server_timing())
+        fields = {"method": request.method, "path": request.url.path, "status": response.status_code}
+        logger.info(
+            "%s %s: %d statements, %.1f ms in db",
+            request.method,
+            request.url.path,
+            stats.count,
+            stats.total * 1000,
+            extra={**fields, **stats.log_fields()},
+        )
+
+        threshold = config.DB_N_PLUS_ONE_THRESHOLD
+        if threshold is not None:
+            for statement, count in stats.repeated(threshold):
+                logger.warning(
+                    "Possible N+1 in %s %s: statement ran %d times: %s",
+                    request.method,
+                    request.url.path,
+                    count,
+                    statement,
+                    extra={**fields, "db_repeated_statement": statement, "db_repeat_count": count},
+                )
+        return response
+
+
 @app.get("/healthcheck", response_model_exclude_none=True)
 async def healthcheck() -> SuccessResponse[None]:
     return SuccessResponse()
 
+
+@app.get("/healthcheck/db-pool")
+async def db_pool_stats() -> SuccessResponse[PoolStats]:
+    """Connection pool saturation for this worker process"""
+    return SuccessResponse(data=pool_stats(engine))
+
 # templates = Jinja2Templates(directory=config.templates_path)
 app.mount("/assets", StaticFiles(directory=config.assets_path), name="static")
 
@@ -1,5 +1,16 @@
 from .base import DBModel
-from .neuri.model import User, Category, Routine, Mission, Reward, MissionType
+from .neuri.model import (
+    User,
+    Category,
+    Routine,
+    Mission,
+    Reward,
+    MissionType,
+    RewardEvent,
+    RewardDailyRollup,
+    RewardWeeklyRollup,
+    RewardReason,
+)
 
 __all__ = [
     "DBModel",
@@ -9,4 +20,8 @@ __all__ = [
     "Mission",
     "Reward",
     "MissionType",
+    "RewardEvent",
+    "RewardDailyRollup",
+    "RewardWeeklyRollup",
+    "RewardReason",
 ]
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+from datetime import date, datetime
 from typing import TYPE_CHECKING
 from uuid import UUID
 import enum
 
-from sqlalchemy import Index, ForeignKey, String, Text, Integer, Boolean, DateTime, Enum, UniqueConstraint, Float
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import Computed, Index, ForeignKey, String, Text, Integer, Boolean, Date, DateTime, Enum, UniqueConstraint, Float, text
+from sqlalchemy import Uuid as DB_UUID
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import DBModel, UUIDMixin, TimestampMixin
@@ -22,6 +24,14 @@ class MissionType(enum.Enum):
     REMINDER = "reminder"
 
 
+class RewardReason(enum.Enum):
+    """Why a user's reward counters changed"""
+    MISSION_CREATED = "mission_created"
+    MISSION_COMPLETED = "mission_completed"
+    MISSION_POINTS = "mission_points"
+    ADJUSTMENT = "adjustment"
+
+
 class User(DBModel, UUIDMixin, TimestampMixin, kw_only=True):
     """User model for Neuri system"""
 
@@ -31,6 +41,8 @@ class User(DBModel, UUIDMixin, TimestampMixin, kw_only=True):
     name: Mapped[str | None] = mapped_column(String(255), nullable=True)
     pace: Mapped[str | None] = mapped_column(String(50), nullable=True)  # "relaxed", "focused"
     preferred_work_time: Mapped[str | None] = mapped_column(String(50), nullable=True)  # "evening", "morning"
+    # IANA name, defines the user's calendar days (e.g. which missions are due today)
+    timezone: Mapped[str] = mapped_column(String(64), nullable=False, default="UTC", server_default="UTC")
     
     # Relationships
     reward: Mapped["Reward"] = relationship(back_populates="user", cascade="all, delete-orphan", uselist=False)
@@ -96,9 +108,8 @@ class Mission(DBModel, UUIDMixin, TimestampMixin, kw_only=True):
     type: Mapped[MissionType] = mapped_column(Enum(MissionType), nullable=False)
     
     # Foreign keys
-    user_id: Mapped[UUID] = mapped_column(
-        ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
-    )
+    # Indexed by the composite (user_id, ...) indexes below
+    user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     category_id: Mapped[UUID | None] = mapped_column(
         ForeignKey("categories.id", ondelete="SET NULL"), nullable=True, index=True
     )
@@ -116,9 +127,9 @@ class Mission(DBModel, UUIDMixin, TimestampMixin, kw_only=True):
     # Fields for different mission types
     body: Mapped[str | None] = mapped_column(Text, nullable=True)  # For 'note' type
     
-    # Dual deadline system
-    true_deadline: Mapped[DateTime | None] = mapped_column(DateTime, nullable=True)  # External/real-world due date
-    personal_deadline: Mapped[DateTime | None] = mapped_column(DateTime, nullable=True)  # Motivational/self-imposed checkpoint
+    # Dual deadline system, absolute instants (timestamptz)
+    true_deadline: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)  # External/real-world due date
+    personal_deadline: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)  # Motivational/self-imposed checkpoint
     
     # Recurrence
     recurrence_rule: Mapped[str | None] = mapped_column(String(100), nullable=True)  # e.g., "DAILY", "WEEKLY"
@@ -128,6 +139,21 @@ class Mission(DBModel, UUIDMixin, TimestampMixin, kw_only=True):
     # AI Context (1-10 scale)
     heaviness: Mapped[int | None] = mapped_column(Integer, nullable=True, default=5)
     priority: Mapped[int | None] = mapped_column(Integer, nullable=True, default=5)
+
+    # Full-text search document, title weighted above body. Maintained by Postgres and never loaded by default
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(body, '')), 'B')",
+            persisted=True,
+        ),
+        deferred=True,
+        repr=False,
+        compare=False,
+    )
+    # Don't RETURN the (unloaded) search vector from every mission INSERT and UPDATE
+    __mapper_args__ = {"eager_defaults": False}
     
     # Relationships
     user: Mapped["User"] = relationship(back_populates="missions")
@@ -137,20 +163,70 @@ class Mission(DBModel, UUIDMixin, TimestampMixin, kw_only=True):
     sub_tasks: Mapped[list["Mission"]] = relationship(
         "Mission",
         back_populates="parent_project",
-        remote_side="Mission.id",
         cascade="all, delete-orphan",
-        single_parent=True
     )
     parent_project: Mapped["Mission | None"] = relationship(
         "Mission",
         back_populates="sub_tasks",
+        remote_side="Mission.id",
         foreign_keys=[parent_project_id]
     )
     
     # Relationship to parent Routine
     parent_routine: Mapped["Routine | None"] = relationship(back_populates="generated_missions")
 
-    __table_args__ = (Index("ix_missions_created_at", "created_at"),)
+    __table_args__ = (
+        Index("ix_missions_created_at", "created_at"),
+        # One index per MissionRepository access pattern. Lists are keyset-paginated on (created_at, id), so the
+        # list indexes end with those columns and a page is read straight off the index without sorting.
+        Index("ix_missions_user_id_created_at", "user_id", "created_at", "id"),
+        Index("ix_missions_user_id_category_id_created_at", "user_id", "category_id", "created_at", "id"),
+        Index("ix_missions_user_id_type_created_at", "user_id", "type", "created_at", "id"),
+        # Partial indexes only hold the rows their query can return. The predicates must match the repository
+        # conditions literally (see HIGH_PRIORITY_THRESHOLD), otherwise the planner won't use them.
+        Index(
+            "ix_missions_user_id_created_at_pending",
+            "user_id",
+            "created_at",
+            "id",
+            postgresql_where=text("NOT is_complete"),
+        ),
+        Index(
+            "ix_missions_user_id_created_at_high_priority",
+            "user_id",
+            "created_at",
+            "id",
+            postgresql_where=text("NOT is_complete AND priority >= 7"),
+        ),
+        Index(
+            "ix_missions_user_id_created_at_heavy",
+            "user_id",
+            "created_at",
+            "id",
+            postgresql_where=text("NOT is_complete AND heaviness >= 7"),
+        ),
+        Index(
+            "ix_missions_user_id_true_deadline_pending",
+            "user_id",
+            "true_deadline",
+            postgresql_where=text("NOT is_complete AND true_deadline IS NOT NULL"),
+        ),
+        Index(
+            "ix_missions_user_id_personal_deadline",
+            "user_id",
+            "personal_deadline",
+            postgresql_where=text("personal_deadline IS NOT NULL"),
+        ),
+        # Search (see MissionRepository.search), scoped to one user through btree_gin
+        Index("ix_missions_user_id_search_vector", "user_id", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_missions_user_id_title_trgm",
+            "user_id",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+    )
 
 
 class Reward(DBModel, UUIDMixin, TimestampMixin, kw_only=True):
@@ -173,4 +249,50 @@ class Reward(DBModel, UUIDMixin, TimestampMixin, kw_only=True):
     # Relationships
     user: Mapped["User"] = relationship(back_populates="reward")
 
-    __table_args__ = (Index("ix_rewards_created_at", "created_at"),)
+    __table_args__ = (
+        Index("ix_rewards_created_at", "created_at"),
+        # Leaderboard top-N: ORDER BY points DESC, user_id LIMIT n reads just n index entries
+        Index("ix_rewards_points_desc_user_id", points.desc(), "user_id"),
+        Index("ix_rewards_streak_desc_user_id", streak.desc(), "user_id"),
+    )
+
+
+class RewardEvent(DBModel, UUIDMixin, kw_only=True):
+    """Append-only ledger of reward counter changes, rows are never updated or deleted"""
+
+    __tablename__ = "reward_events"
+
+    user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    reason: Mapped[RewardReason] = mapped_column(Enum(RewardReason), nullable=False)
+    points: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    streak: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    tasks_done: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    # No foreign key: the event stays in the ledger when its mission is deleted
+    mission_id: Mapped[UUID | None] = mapped_column(DB_UUID, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now, nullable=False)
+
+    __table_args__ = (Index("ix_reward_events_user_id_created_at", "user_id", "created_at"),)
+
+
+class RewardDailyRollup(DBModel, kw_only=True):
+    """Reward events summed per user and day, maintained as ledger batches are written"""
+
+    __tablename__ = "reward_daily_rollups"
+
+    user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    points: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    tasks_done: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    events: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+
+class RewardWeeklyRollup(DBModel, kw_only=True):
+    """Reward events summed per user and week (starting on Monday), maintained as ledger batches are written"""
+
+    __tablename__ = "reward_weekly_rollups"
+
+    user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    week_start: Mapped[date] = mapped_column(Date, primary_key=True)
+    points: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    tasks_done: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    events: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from app.models.neuri.schema import MissionUpdate
 
 
@@ -8,7 +8,8 @@ class CompleteMissionRequest(BaseModel):
 
 class BreakDownMissionRequest(BaseModel):
     mission_id: str
-    subtask_titles: list[str]
+    # All subtasks go out in one INSERT, which bounds the bind parameters per statement
+    subtask_titles: list[str] = Field(..., max_length=100)
 
 
 class UpdateMissionRequest(MissionUpdate):
@@ -38,6 +39,7 @@ class UpdateUserRequest(BaseModel):
     name: str | None = None
     pace: str | None = None
     preferred_work_time: str | None = None
+    timezone: str | None = None
 
 
 class CreateRoutineRequest(BaseModel):
@@ -1,16 +1,35 @@
 import logging
-from datetime import datetime
-from typing import Annotated
+from datetime import date, datetime, timezone
+from typing import Annotated, Literal
 from typing_extensions import TypedDict
 from uuid import UUID
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-from pydantic import BaseModel, ConfigDict, Field, AliasChoices
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field, AliasChoices
 
-from app.models.neuri.model import MissionType
+from app.models.neuri.model import MissionType, RewardReason
 
 logger = logging.getLogger(__name__)
 
 
+def _check_time_zone(name: str) -> str:
+    try:
+        ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown time zone {name!r}, expected an IANA name such as 'Europe/Paris'")
+    return name
+
+
+def _assume_utc(value: datetime) -> datetime:
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+# IANA time zone name, used to compute a user's calendar days
+TimeZoneName = Annotated[str, Field(max_length=64), AfterValidator(_check_time_zone)]
+# Deadlines are stored as timestamptz, a datetime without an offset is taken as UTC
+Deadline = Annotated[datetime, AfterValidator(_assume_utc)]
+
+
 # Schedule Schemas
 class ScheduleItem(TypedDict):
     day: str
@@ -23,6 +42,7 @@ class UserBase(BaseModel):
     name: str | None = Field(None, max_length=255)
     pace: str | None = Field(None, max_length=50)  # "relaxed", "focused"
     preferred_work_time: str | None = Field(None, max_length=50)  # "evening", "morning"
+    timezone: TimeZoneName = "UTC"
 
 
 class UserCreate(UserBase): ...
@@ -33,6 +53,7 @@ class UserUpdate(BaseModel):
     name: str | None = Field(None, max_length=255)
     pace: str | None = Field(None, max_length=50)
     preferred_work_time: str | None = Field(None, max_length=50)
+    timezone: TimeZoneName | None = None
     model_config = ConfigDict(from_attributes=True, extra="ignore")
 
 
@@ -116,8 +137,8 @@ class MissionBase(BaseModel):
     )
     parent_routine_id: UUID | None = None
     body: str | None = None
-    true_deadline: datetime | None = None
-    personal_deadline: datetime | None = None
+    true_deadline: Deadline | None = None
+    personal_deadline: Deadline | None = None
     recurrence_rule: str | None = Field(None, max_length=100)
     is_complete: bool = False
     heaviness: int | None = Field(None, ge=1, le=10)
@@ -134,8 +155,8 @@ class MissionUpdate(BaseModel):
     parent_project_id: UUID | None = None
     parent_routine_id: UUID | None = None
     body: str | None = None
-    true_deadline: datetime | None = None
-    personal_deadline: datetime | None = None
+    true_deadline: Deadline | None = None
+    personal_deadline: Deadline | None = None
     recurrence_rule: str | None = Field(None, max_length=100)
     is_complete: bool | None = None
     heaviness: int | None = Field(None, ge=1, le=10)
@@ -150,12 +171,24 @@ class MissionRead(MissionBase):
     updated_at: datetime
 
 
+class RelatedNoteRead(MissionRead):
+    """A note with its similarity (TF-IDF cosine, 0 to 1) to the mission it was found for"""
+    score: float
+
+
+class TypeaheadSuggestion(BaseModel):
+    """A mission or category whose title has a word starting with the typed prefix"""
+    kind: Literal["mission", "category"]
+    id: UUID
+    title: str
+
+
 class MissionWithRelationsRead(MissionRead):
-    """Mission with related entities"""
+    """Mission with related entities, and its sub-tasks with theirs down to any depth"""
     category: CategoryRead | None = None
     parent_project: MissionRead | None = None
     parent_routine: RoutineRead | None = None
-    sub_tasks: list[MissionRead] = []
+    sub_tasks: list["MissionWithRelationsRead"] = []
 
 
 # Reward Schemas
@@ -193,11 +226,38 @@ class DashboardStats(BaseModel):
     milestones_unlocked: str | None
 
 
+class RewardEventCreate(BaseModel):
+    user_id: UUID
+    reason: RewardReason
+    points: int = 0
+    streak: int = 0
+    tasks_done: int = 0
+    mission_id: UUID | None = None
+    created_at: datetime = Field(default_factory=datetime.now)
+
+
+class LeaderboardEntry(BaseModel):
+    """A user's standing, `rank` is by the requested metric (ties share a rank)"""
+    rank: int
+    user_id: UUID
+    points: int
+    streak: int
+
+
+class PointsHistoryEntry(BaseModel):
+    """Reward events summed over one day or week"""
+    model_config = ConfigDict(from_attributes=True)
+    period_start: date
+    points: int
+    tasks_done: int
+    events: int
+
+
 # Dashboard/Summary Schemas
 class UserDashboardRead(BaseModel):
     """User dashboard with summary data"""
     user: UserRead
-    reward: RewardRead
+    reward: RewardRead | None
     total_missions: int
     completed_missions: int
     pending_missions: int
@@ -1,4 +1,4 @@
-from .base import BaseRepository, AsyncSession, get_session
+from .base import BaseRepository, AsyncSession, get_read_session, get_session
 from .user import UserRepository
 from .category import CategoryRepository
 from .routine import RoutineRepository
@@ -9,6 +9,7 @@ __all__ = [
     "BaseRepository",
     "AsyncSession",
     "get_session",
+    "get_read_session",
     "UserRepository",
     "CategoryRepository",
     "RoutineRepository",
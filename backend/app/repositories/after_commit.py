@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from typing import Callable, Generic, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, SessionTransaction
+
+Item = TypeVar("Item")
+
+
+class AfterCommit(Generic[Item]):
+    """
+    Items recorded during a session's transaction (in Session.info under `key`), handed to `apply` once the
+    transaction commits and dropped if it rolls back. For side effects that must only follow committed writes.
+    """
+
+    def __init__(self, key: str, apply: Callable[[list[Item]], None]) -> None:
+        self._key = key
+        self._apply = apply
+        event.listen(Session, "after_commit", self._after_commit)
+        event.listen(Session, "after_transaction_end", self._after_transaction_end)
+
+    def record(self, session: AsyncSession, *items: Item) -> None:
+        session.info.setdefault(self._key, []).extend(items)
+
+    def _after_commit(self, session: Session) -> None:
+        items = session.info.pop(self._key, None)
+        if items:
+            self._apply(items)
+
+    def _after_transaction_end(self, session: Session, transaction: SessionTransaction) -> None:
+        # Rolled back or closed without committing
+        if transaction.parent is None:
+            session.info.pop(self._key, None)
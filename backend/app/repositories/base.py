@@ -1,29 +1,143 @@
+import asyncio
+import base64
+import binascii
+import enum
+import json
+import time
 from abc import ABC, abstractmethod
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator, Generic, Iterable, Protocol, Sequence, Type, TypeVar
+from dataclasses import dataclass
+from functools import cache
+from datetime import datetime
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Generic,
+    Iterable,
+    Mapping,
+    Protocol,
+    Sequence,
+    Type,
+    TypeVar,
+    overload,
+)
 from uuid import UUID
 
-from asyncpg import NotNullViolationError, UniqueViolationError  # type: ignore[import-untyped]
+from asyncpg import (  # type: ignore[import-untyped]
+    IntegrityConstraintViolationError,
+    NotNullViolationError,
+    UniqueViolationError,
+)
+from fastapi import Query, Request, Response
 from pydantic import BaseModel
-from sqlalchemy import Delete, Select, Update, delete, insert, select, update  # , text
+from sqlalchemy import (
+    Column,
+    Delete,
+    Select,
+    Update,
+    any_,
+    bindparam,
+    column,
+    delete,
+    event,
+    func,
+    insert,
+    inspect,
+    select,
+    table,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy import Enum as DB_Enum
+from sqlalchemy import JSON
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import Insert as PgInsert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError, MultipleResultsFound, NoResultFound
+from sqlalchemy.orm import ORMExecuteState, Session, UOWTransaction, load_only
+from sqlalchemy.orm.util import identity_key
+from sqlalchemy.sql.elements import ClauseElement
 from sqlalchemy.ext.asyncio import AsyncSession as _AsyncSession
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 
 from app.config import config
+from app.errors import ValidationError
 
 # Load all sqlalchemy models
 from app.models import *  # noqa: F401, F403, W0401
 from app.models.base import DBModel
+from app.repositories.loader import BatchLoader
+from app.repositories.pool import InstrumentedAsyncPool
+from app.repositories.query_stats import instrument_engine
 
 # from aralects.utils.utils import get_sqlite_dsn_async
 
-engine = create_async_engine(str(config.SQLALCHEMY_DATABASE_URI))  # , echo=True)
+
+
+def _create_engine(url: str) -> AsyncEngine:
+    new_engine = create_async_engine(
+        url,
+        poolclass=InstrumentedAsyncPool,
+        pool_size=config.db_pool_size_per_worker,
+        max_overflow=config.db_max_overflow_per_worker,
+        pool_timeout=config.DB_POOL_TIMEOUT,
+        pool_recycle=config.DB_POOL_RECYCLE,
+        pool_pre_ping=config.DB_POOL_PRE_PING,
+        query_cache_size=config.SQLALCHEMY_QUERY_CACHE_SIZE,
+        connect_args={"prepared_statement_cache_size": config.ASYNCPG_PREPARED_STATEMENT_CACHE_SIZE},
+    )  # , echo=True)
+    if config.DB_QUERY_STATS_ENABLED:
+        instrument_engine(new_engine)
+    return new_engine
+
+
+engine = _create_engine(str(config.SQLALCHEMY_DATABASE_URI))
 
 # We set expire_on_commit to False so that subsequent access to objects that came from a session do not
 # need to emit new SQL queries to refresh the objects if the transaction has been committed already
 SessionCreator = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False, autocommit=False)
 
+
+class ReadOnlySession(Session):
+    """Session for read-only routes: ORM inserts, updates and deletes raise instead of running"""
+
+
+@event.listens_for(ReadOnlySession, "do_orm_execute")
+def _reject_write_statements(state: ORMExecuteState) -> None:
+    if state.is_insert or state.is_update or state.is_delete:
+        raise ValueError("Attempting a write in a read-only session")
+
+
+@event.listens_for(ReadOnlySession, "before_flush")
+def _reject_flush(session: Session, flush_context: UOWTransaction, instances: object) -> None:
+    if session.new or session.dirty or session.deleted:
+        raise ValueError("Attempting a write in a read-only session")
+
+
+def _read_only_sessions(bind: AsyncEngine) -> async_sessionmaker[_AsyncSession]:
+    return async_sessionmaker(bind=bind, sync_session_class=ReadOnlySession, autoflush=False, expire_on_commit=False)
+
+
+# Read-only routes run without a transaction: autocommit skips the BEGIN and COMMIT round-trips,
+# each statement sees its own snapshot. Writes are rejected by `ReadOnlySession`.
+ReadSessionCreator = _read_only_sessions(engine.execution_options(isolation_level="AUTOCOMMIT"))
+# Server-side cursors need a transaction, so streamed reads use a READ ONLY one instead
+StreamSessionCreator = _read_only_sessions(engine.execution_options(postgresql_readonly=True))
+
+# Optional read replica, only used through `get_read_session`
+replica_engine: AsyncEngine | None = None
+ReplicaSessionCreator: async_sessionmaker[_AsyncSession] | None = None
+if config.SQLALCHEMY_REPLICA_DATABASE_URI is not None:
+    replica_engine = _create_engine(str(config.SQLALCHEMY_REPLICA_DATABASE_URI))
+    ReplicaSessionCreator = _read_only_sessions(replica_engine.execution_options(isolation_level="AUTOCOMMIT"))
+
+# Cookie holding the time of the client's last write, so its reads stay on the primary for a short while
+LAST_WRITE_COOKIE = "db_last_write"
+
 AsyncSession = _AsyncSession
 
 
@@ -33,8 +147,13 @@ async def get_session_no_commit() -> AsyncGenerator[AsyncSession, None]:
     yield session
 
 
-async def get_session() -> AsyncGenerator[AsyncSession, None]:
+async def get_session(response: Response) -> AsyncGenerator[AsyncSession, None]:
     """FastAPI dependency to get a db session"""
+    if ReplicaSessionCreator is not None:
+        # Any route using the primary session may write, pin this client's reads to the primary for a while
+        response.set_cookie(
+            LAST_WRITE_COOKIE, str(time.time()), max_age=int(config.REPLICA_READ_YOUR_WRITES_SECONDS) + 1, httponly=True
+        )
     session = SessionCreator()
 
     try:
@@ -50,6 +169,129 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
         await session.close()
 
 
+def _wrote_recently(request: Request) -> bool:
+    last_write = request.cookies.get(LAST_WRITE_COOKIE)
+    if last_write is None:
+        return False
+    try:
+        return time.time() - float(last_write) < config.REPLICA_READ_YOUR_WRITES_SECONDS
+    except ValueError:
+        return False
+
+
+async def get_read_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    FastAPI dependency to get a read-only db session (see `ReadOnlySession`), with no transaction to commit.
+    Uses the read replica when one is configured, unless this client wrote recently (read-your-writes).
+    """
+    if ReplicaSessionCreator is not None and not _wrote_recently(request):
+        session = ReplicaSessionCreator()
+    else:
+        session = ReadSessionCreator()
+
+    try:
+        yield session
+    finally:
+        await session.close()
+
+
+Result1 = TypeVar("Result1")
+Result2 = TypeVar("Result2")
+Result3 = TypeVar("Result3")
+Result4 = TypeVar("Result4")
+Result5 = TypeVar("Result5")
+Read = Callable[[AsyncSession], Awaitable[Result1]]
+
+
+class ReadFanOut:
+    """
+    Runs independent reads concurrently, each on its own read-only session and therefore its own pooled connection.
+    One instance per request (see `get_read_fan_out`): at most `budget` of its reads hold a connection at a time,
+    the others wait for a slot, so one request can't drain the pool.
+    """
+
+    def __init__(self, sessions: async_sessionmaker[_AsyncSession], budget: int) -> None:
+        self._sessions = sessions
+        self._slots = asyncio.Semaphore(budget)
+
+    async def run(self, read: Read[Result1]) -> Result1:
+        """Run one read on a session of its own, within the budget"""
+        async with self._slots:
+            async with self._sessions() as session:
+                return await read(session)
+
+    @overload
+    async def gather(self, read1: Read[Result1], read2: Read[Result2], /) -> tuple[Result1, Result2]: ...
+
+    @overload
+    async def gather(
+        self, read1: Read[Result1], read2: Read[Result2], read3: Read[Result3], /
+    ) -> tuple[Result1, Result2, Result3]: ...
+
+    @overload
+    async def gather(
+        self, read1: Read[Result1], read2: Read[Result2], read3: Read[Result3], read4: Read[Result4], /
+    ) -> tuple[Result1, Result2, Result3, Result4]: ...
+
+    @overload
+    async def gather(
+        self,
+        read1: Read[Result1],
+        read2: Read[Result2],
+        read3: Read[Result3],
+        read4: Read[Result4],
+        read5: Read[Result5],
+        /,
+    ) -> tuple[Result1, Result2, Result3, Result4, Result5]: ...
+
+    async def gather(self, *reads: Read[Any]) -> tuple[Any, ...]:  # type: ignore[explicit-any]
+        """
+        Run `reads` concurrently and return their results in order.
+        If one fails (or the caller is cancelled) the others are cancelled, and their connections are back in the
+        pool before the error propagates.
+        """
+        tasks = [asyncio.ensure_future(self.run(read)) for read in reads]
+        try:
+            return tuple(await asyncio.gather(*tasks))
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+
+def get_read_fan_out(request: Request) -> ReadFanOut:
+    """
+    FastAPI dependency running concurrent reads for composite payloads (see `ReadFanOut`), on the same database
+    `get_read_session` would use. Cached per request, so every use in a request shares one connection budget.
+    """
+    if ReplicaSessionCreator is not None and not _wrote_recently(request):
+        return ReadFanOut(ReplicaSessionCreator, config.DB_FAN_OUT_CONNECTIONS)
+    return ReadFanOut(ReadSessionCreator, config.DB_FAN_OUT_CONNECTIONS)
+
+
+async def release_session(session: AsyncSession) -> None:
+    """
+    Commit `session` and close it, returning its connection to the pool.
+    A released session is empty, so the commit and close done later by its dependency are no-ops.
+    """
+    await session.commit()
+    await session.close()
+
+
+@asynccontextmanager
+async def managed_read_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Read-only session in a READ ONLY transaction, for streamed reads that outlive the request dependencies.
+    Nothing is committed, the transaction is rolled back on close.
+    """
+    session = StreamSessionCreator()
+    try:
+        yield session
+    finally:
+        await session.close()
+
+
 @asynccontextmanager
 async def managed_session() -> AsyncGenerator[AsyncSession, None]:
     """
@@ -116,6 +358,12 @@ class NotUniqueError(Exception):
 
 # Generic types per repository
 Model = TypeVar("Model", bound=DBModel)
+# Values for named bind parameters of pre-built statements
+Params = Mapping[str, object]
+# A plain column row keyed by column name, see `list_page_rows`
+Row = dict[str, object]
+Item = TypeVar("Item")
+MappedItem = TypeVar("MappedItem")
 TCreate = TypeVar("TCreate", bound=BaseModel, contravariant=True)
 TUpdate = TypeVar("TUpdate", bound=BaseModel, contravariant=True)
 
@@ -124,21 +372,141 @@ ModelSchema = TypeVar("ModelSchema", bound=BaseModel)
 Data = TypeVar("Data", bound=BaseModel)
 
 
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# Rows fetched per round-trip from the server-side cursor when streaming
+STREAM_CHUNK_SIZE = 500
+
+# Postgres rejects statements with more than 32767 bind parameters
+MAX_BIND_PARAMS = 32767
+BULK_CHUNK_SIZE = 1000
+# Batches at least this large are loaded with COPY instead of INSERT ... VALUES
+COPY_THRESHOLD = 10_000
+
+
+@dataclass
+class PageParams:
+    """Keyset pagination request: page size plus the opaque cursor returned by the previous page"""
+
+    limit: int = DEFAULT_PAGE_SIZE
+    cursor: str | None = None
+
+
+@dataclass
+class Page(Generic[Item]):
+    """One page of results. `limit` is None when the query was not paginated."""
+
+    items: Sequence[Item]
+    next_cursor: str | None = None
+    limit: int | None = None
+
+    def map(self, fn: Callable[[Item], MappedItem]) -> "Page[MappedItem]":
+        return Page(items=[fn(item) for item in self.items], next_cursor=self.next_cursor, limit=self.limit)
+
+    def map_items(self, fn: Callable[[Sequence[Item]], Sequence[MappedItem]]) -> "Page[MappedItem]":
+        """Like `map` but converts the whole page in one call, e.g. with a TypeAdapter over a list"""
+        return Page(items=fn(self.items), next_cursor=self.next_cursor, limit=self.limit)
+
+    def meta(self) -> dict[str, int | str | bool] | None:
+        if self.limit is None:
+            return None
+        meta: dict[str, int | str | bool] = {"limit": self.limit, "has_more": self.next_cursor is not None}
+        if self.next_cursor is not None:
+            meta["next_cursor"] = self.next_cursor
+        return meta
+
+
+def get_page_params(
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(None),
+) -> PageParams | None:
+    """FastAPI dependency: pagination is opt-in, requests without limit/cursor get the full list"""
+    if limit is None and cursor is None:
+        return None
+    return PageParams(limit=limit or DEFAULT_PAGE_SIZE, cursor=cursor)
+
+
+def encode_cursor(sort_value: datetime | int | float | str, record_id: UUID) -> str:
+    value = sort_value.isoformat() if isinstance(sort_value, datetime) else sort_value
+    raw = json.dumps([value, str(record_id)], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, python_type: type) -> tuple[datetime | int | float | str, UUID]:
+    """
+    Decode a cursor produced by `encode_cursor`.
+    :raises: ValidationError if the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        value, record_id = json.loads(raw)
+        if python_type is datetime:
+            value = datetime.fromisoformat(value)
+        elif not isinstance(value, python_type):
+            raise TypeError(f"Expected {python_type.__name__} in cursor")
+        return value, UUID(record_id)
+    except (binascii.Error, ValueError, TypeError) as e:
+        raise ValidationError("Invalid pagination cursor") from e
+
+
+@cache
+def _by_uuids_statement(model: Type[DBModel]) -> Select[tuple[DBModel]]:
+    """`id = ANY(:ids)` keeps one statement shape (and one prepared statement) for any number of ids"""
+    id_column = getattr(model, "id")
+    return select(model).where(id_column == any_(bindparam("ids", type_=ARRAY(id_column.type))))
+
+
+@cache
+def loaded_columns(model: Type[DBModel]) -> tuple[Column[Any], ...]:  # type: ignore[explicit-any]
+    """Table columns of `model` in table order, minus deferred ones (e.g. search vectors) that full reads skip"""
+    deferred = {prop.key for prop in inspect(model).column_attrs if prop.deferred}
+    return tuple(col for col in model.__table__.columns if col.key not in deferred)
+
+
 class RepositoryProtocol(Protocol[Model, TCreate, TUpdate]):
     @property
     def model(self) -> Type[Model]: ...
 
     # Low level ops
-    async def get(self, session: AsyncSession, query: Select[tuple[Model]]) -> Model: ...
+    async def get(self, session: AsyncSession, query: Select[tuple[Model]], params: Params | None) -> Model: ...
 
     async def first(self, session: AsyncSession, query: Select[tuple[Model]]) -> Model: ...
 
-    async def list(self, session: AsyncSession, query: Select[tuple[Model]]) -> Sequence[Model]: ...
+    async def count(  # type: ignore[explicit-any]
+        self, session: AsyncSession, query: Select[Any], params: Params | None
+    ) -> int: ...
+
+    async def list(
+        self, session: AsyncSession, query: Select[tuple[Model]], params: Params | None
+    ) -> Sequence[Model]: ...
 
     async def get_unique(self, session: AsyncSession, query: Select[tuple[Model]]) -> Model: ...
 
     async def list_unique(self, session: AsyncSession, query: Select[tuple[Model]]) -> Sequence[Model]: ...
 
+    async def list_page(
+        self,
+        session: AsyncSession,
+        query: Select[tuple[Model]],
+        page: PageParams | None,
+        params: Params | None,
+        columns: Sequence[str] | None,
+    ) -> Page[Model]: ...
+
+    async def list_page_rows(
+        self,
+        session: AsyncSession,
+        query: Select[tuple[Model]],
+        page: PageParams | None,
+        params: Params | None,
+        columns: Sequence[str] | None,
+    ) -> Page[Row]: ...
+
+    def stream(
+        self, session: AsyncSession, query: Select[tuple[Model]], params: Params | None, chunk_size: int
+    ) -> AsyncIterator[Model]: ...
+
     async def update_one(self, session: AsyncSession, query: Update) -> Model: ...
 
     async def update_many(self, session: AsyncSession, query: Update) -> Sequence[Model]: ...
@@ -150,14 +518,47 @@ class RepositoryProtocol(Protocol[Model, TCreate, TUpdate]):
 
     async def create_many(self, session: AsyncSession, data: Iterable[TCreate]) -> Sequence[Model]: ...
 
+    async def bulk_insert(
+        self,
+        session: AsyncSession,
+        data: Iterable[TCreate],
+        conflict_columns: Sequence[str] | None,
+        update_columns: Sequence[str] | None,
+    ) -> int: ...
+
     async def get_by_id(self, session: AsyncSession, record_id: UUID) -> Model: ...
 
+    async def get_many_by_uuid(self, session: AsyncSession, record_ids: Sequence[UUID]) -> Sequence[Model]: ...
+
     async def update_by_id(self, session: AsyncSession, record_id: UUID, data: TUpdate) -> Model: ...
 
     async def delete_by_id(self, session: AsyncSession, record_id: UUID) -> None: ...
 
 
+def _copyable(rows: Sequence[dict[str, Any]]) -> bool:  # type: ignore[explicit-any]
+    """Whether COPY can load `rows`: SQL expressions (e.g. SQL column defaults) only work in INSERT statements"""
+    return not any(isinstance(value, ClauseElement) for row in rows for value in row.values())
+
+
+def _copy_encoder(col: Column[Any]) -> Callable[[Any], Any] | None:  # type: ignore[explicit-any]
+    """How a column's Python values are passed to asyncpg's binary COPY, None when they go as they are"""
+    if isinstance(col.type, DB_Enum):
+        # SQLAlchemy stores enums by member name
+        return lambda value: value.name if isinstance(value, enum.Enum) else value
+    if isinstance(col.type, JSON):
+        # asyncpg's json and jsonb codecs take the encoded text. Like INSERT, None is JSON null unless none_as_null
+        if col.type.none_as_null:
+            return lambda value: None if value is None else json.dumps(value)
+        return json.dumps
+    return None
+
+
 class BaseRepository(ABC, Generic[Model, TCreate, TUpdate]):
+    # Named column sets for `fields=` projections, None means every column
+    field_sets: dict[str, tuple[str, ...] | None] = {"full": None}
+    # Columns always loaded by a projection (identity and pagination key)
+    required_fields: tuple[str, ...] = ("id", "created_at")
+
     # This override is needed because of https://github.com/python/typing/issues/644
     # seems like the issue is not fixed yet, added a comment there
     def __init__(self) -> None: ...
@@ -167,12 +568,40 @@ class BaseRepository(ABC, Generic[Model, TCreate, TUpdate]):
     def model(self) -> Type[Model]:
         raise NotImplementedError
 
-    async def get(self, session: AsyncSession, query: Select[tuple[Model]]) -> Model:
+    def resolve_fields(self, fields: str | None) -> tuple[str, ...] | None:
+        """
+        Turn a `fields=` selector into the columns to load: either a named set from `field_sets`
+        or a comma-separated list of column names. Returns None when every column should be loaded.
+        :raises: ValidationError if a column does not exist
+        """
+        if fields is None:
+            return None
+        if fields in self.field_sets:
+            return self.field_sets[fields]
+
+        requested = [name.strip() for name in fields.split(",") if name.strip()]
+        known = [col.key for col in loaded_columns(self.model)]
+        unknown = [name for name in requested if name not in known]
+        if unknown:
+            raise ValidationError(f"Unknown fields: {', '.join(unknown)}")
+        return tuple(dict.fromkeys([*self.required_fields, *requested]))
+
+    def project(self, query: Select[tuple[Model]], columns: Sequence[str] | None) -> Select[tuple[Model]]:
+        """
+        Load only `columns`. Other columns are never fetched and raise on access instead of lazy loading,
+        so callers must only read the projected attributes.
+        """
+        if columns is None:
+            return query
+        return query.options(load_only(*[getattr(self.model, name) for name in columns], raiseload=True))
+
+    async def get(self, session: AsyncSession, query: Select[tuple[Model]], params: Params | None = None) -> Model:
         """
         Execute a query and return exactly one scalar result or raises an exception.
+        `params` supplies values for named bind parameters of a pre-built query.
         :raises: NotFoundError if no result is found
         """
-        result = await session.execute(query)
+        result = await session.execute(query, params)
         try:
             return result.scalar_one()
         except NoResultFound:
@@ -180,6 +609,13 @@ class BaseRepository(ABC, Generic[Model, TCreate, TUpdate]):
         except MultipleResultsFound:
             raise NotUniqueError(f"{self.model.__name__.replace('Model', '')} not unique")
 
+    async def count(  # type: ignore[explicit-any]
+        self, session: AsyncSession, query: Select[Any], params: Params | None = None
+    ) -> int:
+        """Number of rows `query` returns, counted in the database"""
+        stmt = select(func.count()).select_from(query.order_by(None).subquery())
+        return (await session.execute(stmt, params)).scalar_one()
+
     async def first(self, session: AsyncSession, query: Select[tuple[Model]]) -> Model:
         """
         Execute a query and return the first scalar result or raises NotFoundError.
@@ -206,11 +642,14 @@ class BaseRepository(ABC, Generic[Model, TCreate, TUpdate]):
             raise NotFoundError(f"{self.model.__name__.replace('Model', '')} not found")
         return instance[0]
 
-    async def list(self, session: AsyncSession, query: Select[tuple[Model]]) -> Sequence[Model]:
+    async def list(
+        self, session: AsyncSession, query: Select[tuple[Model]], params: Params | None = None
+    ) -> Sequence[Model]:
         """
         Execute a query and return all scalar results.
+        `params` supplies values for named bind parameters of a pre-built query.
         """
-        results = await session.execute(query)
+        results = await session.execute(query, params)
         return results.scalars().all()
 
     async def list_unique(self, session: AsyncSession, query: Select[tuple[Model]]) -> Sequence[Model]:
@@ -220,6 +659,95 @@ class BaseRepository(ABC, Generic[Model, TCreate, TUpdate]):
         results = await session.execute(query)
         return results.scalars().unique().all()
 
+    async def list_page(
+        self,
+        session: AsyncSession,
+        query: Select[tuple[Model]],
+        page: PageParams | None,
+        params: Params | None = None,
+        columns: Sequence[str] | None = None,
+        sort_key: str = "created_at",
+    ) -> Page[Model]:
+        """
+        Execute a query using keyset pagination on (sort_key, id).
+        The sort key must be a non-nullable column. Any existing ORDER BY on the query is replaced.
+        Without page params the full result set is returned as a single page.
+        `columns` restricts the loaded columns, see `project`.
+        :raises: ValidationError if the cursor is malformed
+        """
+        query = self.project(query, columns)
+        if page is None:
+            return Page(items=await self.list(session, query, params))
+
+        items = await self.list(session, self._keyset(query, page, sort_key), params)
+        return self._page(items, page, lambda item: (getattr(item, sort_key), getattr(item, "id")))
+
+    async def list_page_rows(
+        self,
+        session: AsyncSession,
+        query: Select[tuple[Model]],
+        page: PageParams | None,
+        params: Params | None = None,
+        columns: Sequence[str] | None = None,
+        sort_key: str = "created_at",
+    ) -> Page[Row]:
+        """
+        Same as `list_page` but selects plain column rows, returned as dicts keyed by column name.
+        This skips identity-map bookkeeping and instrumented attribute access, for read-only lists that are
+        converted straight into response schemas. `columns` must include `id` and the sort key when paginating.
+        :raises: ValidationError if the cursor is malformed
+        """
+        table = self.model.__table__
+        selected = loaded_columns(self.model) if columns is None else [table.c[name] for name in columns]
+        query = query.with_only_columns(*selected)
+        if page is not None:
+            query = self._keyset(query, page, sort_key)
+
+        result = await session.execute(query, params)
+        # Plain dicts rather than RowMapping: pydantic validates dicts natively but reads other mappings key by key
+        keys = list(result.keys())
+        rows = [dict(zip(keys, row)) for row in result.all()]
+        if page is None:
+            return Page(items=rows)
+        return self._page(rows, page, lambda row: (row[sort_key], row["id"]))
+
+    def _keyset(self, query: Select[Any], page: PageParams, sort_key: str) -> Select[Any]:  # type: ignore[explicit-any]
+        sort_column = getattr(self.model, sort_key)
+        id_column = getattr(self.model, "id")
+        if page.cursor is not None:
+            sort_value, record_id = decode_cursor(page.cursor, sort_column.type.python_type)
+            query = query.where(tuple_(sort_column, id_column) > tuple_(sort_value, record_id))
+
+        # Fetch one extra row to know whether another page exists
+        return query.order_by(None).order_by(sort_column, id_column).limit(page.limit + 1)
+
+    @staticmethod
+    def _page(
+        items: Sequence[Item], page: PageParams, key: Callable[[Item], tuple[datetime | int | float | str, UUID]]
+    ) -> Page[Item]:
+        next_cursor = None
+        if len(items) > page.limit:
+            items = items[: page.limit]
+            next_cursor = encode_cursor(*key(items[-1]))
+        return Page(items=items, next_cursor=next_cursor, limit=page.limit)
+
+    async def stream(
+        self,
+        session: AsyncSession,
+        query: Select[tuple[Model]],
+        params: Params | None = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> AsyncIterator[Model]:
+        """
+        Execute a query on a server-side cursor and yield scalar results as they arrive.
+        Only `chunk_size` rows are buffered at a time, so memory stays flat regardless of result size.
+        The session must stay open until the iterator is exhausted.
+        """
+        result = await session.stream_scalars(query.execution_options(yield_per=chunk_size), params)
+        async for partition in result.partitions():
+            for instance in partition:
+                yield instance
+
     async def create(self, session: AsyncSession, data: TCreate, flush: bool = True) -> Model:
         """
         Create a new instance of the model and save it to the database.
@@ -231,29 +759,158 @@ class BaseRepository(ABC, Generic[Model, TCreate, TUpdate]):
                 await session.flush()
             return result.scalar_one()
         except IntegrityError as e:
-            cause = e.orig.__getattribute__("__cause__")
-            # If cause is None, just default to constraint violation error
-            if cause is None:
-                raise ConstraintViolationError(e)
-
-            if isinstance(cause, NotNullViolationError):
-                # Can't type this well as asyncpg error attributes are set dynamically by a metaclass
-                raise ConstraintViolationError(cause.__getattribute__("message"))
-            elif isinstance(cause, UniqueViolationError):
-                raise NotUniqueError(message=cause.__getattribute__("message"), model_name=self.model.__name__)
-            else:
-                raise ConstraintViolationError(cause.__getattribute__("message"))
+            raise self._integrity_error(e)
 
     async def create_many(self, session: AsyncSession, data: Iterable[TCreate]) -> Sequence[Model]:
         """
         Create new instances of the model and save them to the database.
+        Large batches are split into several INSERT ... RETURNING statements to stay under the bind parameter limit.
         """
         instances = [item.model_dump() for item in data]
-        results = await session.scalars(insert(self.model).returning(self.model).values(instances))
+        if not instances:
+            return []
+
+        created: list[Model] = []
+        for chunk in self._chunks(instances, BULK_CHUNK_SIZE):
+            results = await session.scalars(insert(self.model).returning(self.model).values(chunk))
+            created.extend(results.all())
 
         # Flush commands to DB (within transaction) so we can refresh instance from DB
         await session.flush()
-        return results.all()
+        return created
+
+    async def bulk_insert(
+        self,
+        session: AsyncSession,
+        data: Iterable[TCreate],
+        conflict_columns: Sequence[str] | None = None,
+        update_columns: Sequence[str] | None = None,
+        chunk_size: int = BULK_CHUNK_SIZE,
+        copy_threshold: int = COPY_THRESHOLD,
+    ) -> int:
+        """
+        Write many rows without returning them and return the number of rows inserted or updated.
+        With `conflict_columns` (which must match a unique index) this becomes an upsert: rows that conflict
+        overwrite `update_columns`, or are skipped when no update columns are given.
+        Batches of at least `copy_threshold` rows are loaded with COPY, through a staging table when upserting, unless
+        they hold SQL expressions (SQL column defaults), which only INSERT can evaluate.
+        :raises: ConstraintViolationError if an integrity constraint is violated
+        :raises: NotUniqueError on a unique violation outside the conflict target
+        """
+        rows = [self._with_column_defaults(item.model_dump()) for item in data]
+        if not rows:
+            return 0
+
+        try:
+            if len(rows) >= copy_threshold and _copyable(rows):
+                return await self._copy_rows(session, rows, conflict_columns, update_columns)
+
+            written = 0
+            for chunk in self._chunks(rows, chunk_size):
+                query = self._upsert_query(pg_insert(self.model).values(chunk), conflict_columns, update_columns)
+                result = await session.execute(query)
+                written += result.rowcount
+            return written
+        except IntegrityError as e:
+            raise self._integrity_error(e)
+
+    def _chunks(  # type: ignore[explicit-any]
+        self, rows: Sequence[dict[str, Any]], chunk_size: int
+    ) -> Iterable[Sequence[dict[str, Any]]]:
+        """Split rows so that no statement exceeds the bind parameter limit"""
+        columns = max(len(rows[0]), 1)
+        size = max(1, min(chunk_size, MAX_BIND_PARAMS // columns))
+        for start in range(0, len(rows), size):
+            yield rows[start : start + size]
+
+    def _with_column_defaults(self, row: dict[str, Any]) -> dict[str, Any]:  # type: ignore[explicit-any]
+        """
+        Fill in Python-side column defaults (ids, timestamps, ...) so every row has the same keys.
+        SQL expression defaults are filled in as the expression, sequences are left to the database.
+        """
+        for col in self.model.__table__.columns:
+            if col.key in row or col.default is None or col.default.is_sequence:
+                continue
+            default = col.default
+            row[col.key] = default.arg(None) if default.is_callable else default.arg  # type: ignore[attr-defined]
+        return row
+
+    def _upsert_query(
+        self, query: PgInsert, conflict_columns: Sequence[str] | None, update_columns: Sequence[str] | None
+    ) -> PgInsert:
+        if not conflict_columns:
+            return query
+        if not update_columns:
+            return query.on_conflict_do_nothing(index_elements=list(conflict_columns))
+        return query.on_conflict_do_update(
+            index_elements=list(conflict_columns),
+            set_={name: query.excluded[name] for name in update_columns},
+        )
+
+    async def _copy_rows(  # type: ignore[explicit-any]
+        self,
+        session: AsyncSession,
+        rows: Sequence[dict[str, Any]],
+        conflict_columns: Sequence[str] | None,
+        update_columns: Sequence[str] | None,
+    ) -> int:
+        """Load rows with asyncpg's binary COPY on the session's connection (and therefore its transaction)"""
+        table_name = self.model.__tablename__
+        columns = list(rows[0].keys())
+        encoders = [_copy_encoder(self.model.__table__.columns[name]) for name in columns]
+        records = [
+            tuple(value if encode is None else encode(value) for encode, value in zip(encoders, row.values()))
+            for row in rows
+        ]
+
+        connection = await session.connection()
+        raw_connection = await connection.get_raw_connection()
+        driver_connection = raw_connection.driver_connection
+
+        if not conflict_columns:
+            try:
+                status = await driver_connection.copy_records_to_table(table_name, records=records, columns=columns)
+            except IntegrityConstraintViolationError as e:
+                # COPY goes around SQLAlchemy, so its errors arrive as raw asyncpg exceptions
+                raise self._driver_integrity_error(e)
+            return int(status.split()[-1])
+
+        # COPY can't resolve conflicts, so load into a staging table and upsert from there
+        staging_name = f"_staging_{table_name}"
+        await session.execute(
+            text(f'CREATE TEMP TABLE "{staging_name}" (LIKE "{table_name}" INCLUDING DEFAULTS) ON COMMIT DROP')
+        )
+        try:
+            await driver_connection.copy_records_to_table(staging_name, records=records, columns=columns)
+        except IntegrityConstraintViolationError as e:
+            raise self._driver_integrity_error(e)
+        staging = table(staging_name, *[column(name) for name in columns])
+        query = self._upsert_query(
+            pg_insert(self.model).from_select(columns, select(staging)), conflict_columns, update_columns
+        )
+        result = await session.execute(query)
+        # Dropped only on success: after an error the transaction is aborted and the table goes with its rollback,
+        # ON COMMIT DROP covers the rest. Dropping here lets the same transaction stage another batch.
+        await session.execute(text(f'DROP TABLE "{staging_name}"'))
+        return result.rowcount
+
+    def _integrity_error(self, e: IntegrityError) -> Exception:
+        """Translate a driver integrity error into one of the repository exceptions"""
+        cause = e.orig.__getattribute__("__cause__")
+        # If cause is None, just default to constraint violation error
+        if cause is None:
+            return ConstraintViolationError(e)
+        return self._driver_integrity_error(cause)
+
+    def _driver_integrity_error(self, cause: IntegrityConstraintViolationError) -> Exception:
+        """Translate an asyncpg integrity error into one of the repository exceptions"""
+        if isinstance(cause, NotNullViolationError):
+            # Can't type this well as asyncpg error attributes are set dynamically by a metaclass
+            return ConstraintViolationError(cause.__getattribute__("message"))
+        elif isinstance(cause, UniqueViolationError):
+            return NotUniqueError(message=cause.__getattribute__("message"), model_name=self.model.__name__)
+        else:
+            return ConstraintViolationError(cause.__getattribute__("message"))
 
     def _check_query_for_where(self, query: Update | Delete) -> None:
         """Make sure update query has filters to protect against accidental global updates"""
@@ -273,16 +930,7 @@ class BaseRepository(ABC, Generic[Model, TCreate, TUpdate]):
         try:
             results = await session.scalars(query)
         except IntegrityError as e:
-            cause = e.orig.__getattribute__("__cause__")
-
-            if cause is None:
-                raise ConstraintViolationError(e)
-            elif isinstance(cause, NotNullViolationError):
-                raise ConstraintViolationError(cause.__getattribute__("message"))
-            elif isinstance(cause, UniqueViolationError):
-                raise NotUniqueError(message=cause.__getattribute__("message"), model_name=self.model.__name__)
-            else:
-                raise ConstraintViolationError(cause.__getattribute__("message"))
+            raise self._integrity_error(e)
 
         # Flush changes to DB (within transaction)
         await session.flush()
@@ -302,15 +950,7 @@ class BaseRepository(ABC, Generic[Model, TCreate, TUpdate]):
         try:
             result = await session.scalars(query)
         except IntegrityError as e:
-            cause = e.orig.__getattribute__("__cause__")
-            if cause is None:
-                raise ConstraintViolationError(e)
-            elif isinstance(cause, NotNullViolationError):
-                raise ConstraintViolationError(cause.__getattribute__("message"))
-            elif isinstance(cause, UniqueViolationError):
-                raise NotUniqueError(message=cause.__getattribute__("message"), model_name=self.model.__name__)
-            else:
-                raise ConstraintViolationError(cause.__getattribute__("message"))
+            raise self._integrity_error(e)
 
         instance = result.one_or_none()
         if instance is None:
@@ -334,13 +974,48 @@ class BaseRepository(ABC, Generic[Model, TCreate, TUpdate]):
         # Flush changes to DB (within transaction)
         await session.flush()
 
+    def loader(self, session: AsyncSession) -> BatchLoader[UUID, Model]:
+        """
+        The session's by-id loader for this model. Lookups made concurrently are sent as one
+        `id = ANY(:ids)` query, and rows already in the session identity map are not fetched again.
+        """
+        key = ("loader", self.model)
+        loader = session.info.get(key)
+        if loader is None:
+            loader = session.info[key] = BatchLoader(lambda ids: self._fetch_by_uuids(session, ids))
+        return loader
+
+    async def _fetch_by_uuids(self, session: AsyncSession, record_ids: Sequence[UUID]) -> dict[UUID, Model]:
+        found: dict[UUID, Model] = {}
+        missing = []
+        for record_id in record_ids:
+            instance = session.identity_map.get(identity_key(self.model, record_id))
+            if instance is None:
+                missing.append(record_id)
+            else:
+                found[record_id] = instance
+
+        if missing:
+            for instance in await self.list(session, _by_uuids_statement(self.model), {"ids": missing}):
+                found[getattr(instance, "id")] = instance
+        return found
+
     async def get_by_uuid(self, session: AsyncSession, record_id: UUID) -> Model:
         """
-        Fetch a record by id.
+        Fetch a record by id, through the session's batch loader (see `loader`).
         :raises: NotFoundError if record not found
         """
-        query = select(self.model).filter_by(id=record_id)
-        return await self.get(session, query)
+        instance = await self.loader(session).load(record_id)
+        if instance is None:
+            raise NotFoundError(f"{self.model.__name__.replace('Model', '')} not found")
+        return instance
+
+    async def get_many_by_uuid(self, session: AsyncSession, record_ids: Sequence[UUID]) -> Sequence[Model]:
+        """
+        Fetch records by id in one query, in the order requested. Unknown ids and repeats are skipped.
+        """
+        instances = await self.loader(session).load_many(list(dict.fromkeys(record_ids)))
+        return [instance for instance in instances if instance is not None]
 
     async def update_by_uuid(self, session: AsyncSession, record_id: UUID, data: TUpdate) -> Model:
         """
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-from typing import Sequence
 from uuid import UUID
 
 from sqlalchemy import select
@@ -8,7 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.neuri.model import Category
 from app.models.neuri.schema import CategoryCreate, CategoryUpdate
-from app.repositories.base import BaseRepository
+from app.repositories.base import BaseRepository, Page, PageParams
 
 
 class CategoryRepository(BaseRepository[Category, CategoryCreate, CategoryUpdate]):
@@ -16,13 +15,18 @@ class CategoryRepository(BaseRepository[Category, CategoryCreate, CategoryUpdate
     def model(self) -> type[Category]:
         return Category
 
-    async def list_by_user(self, session: AsyncSession, user_id: UUID) -> Sequence[Category]:
+    async def list_by_user(
+        self, session: AsyncSession, user_id: UUID, page: PageParams | None = None
+    ) -> Page[Category]:
         stmt = select(Category).where(Category.user_id == user_id)
-        return await self.list(session, stmt)
+        return await self.list_page(session, stmt, page)
+
+    async def count_by_user(self, session: AsyncSession, user_id: UUID) -> int:
+        stmt = select(Category).where(Category.user_id == user_id)
+        return await self.count(session, stmt)
 
     async def get_category_by_id(self, session: AsyncSession, category_id: UUID) -> Category:
-        stmt = select(Category).filter_by(id=category_id)
-        return await self.get(session, stmt)
+        return await self.get_by_uuid(session, category_id)
 
     async def get_by_name_and_user(self, session: AsyncSession, name: str, user_id: UUID) -> Category | None:
         stmt = select(Category).where(Category.name == name, Category.user_id == user_id)
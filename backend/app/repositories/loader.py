@@ -0,0 +1,56 @@
+import asyncio
+from typing import Awaitable, Callable, Generic, Hashable, Mapping, Sequence, TypeVar
+
+Key = TypeVar("Key", bound=Hashable)
+Value = TypeVar("Value")
+
+
+class BatchLoader(Generic[Key, Value]):
+    """
+    Coalesces `load` calls made in the same event loop iteration into a single `fetch` call.
+    Concurrent loads of the same key share one lookup. Nothing is cached once a batch resolves;
+    repeat lookups across batches are expected to be served by the session identity map inside `fetch`.
+    """
+
+    def __init__(self, fetch: Callable[[Sequence[Key]], Awaitable[Mapping[Key, Value]]]) -> None:
+        self._fetch = fetch
+        self._pending: dict[Key, asyncio.Future[Value | None]] = {}
+        # Strong references to running batches, so they are not garbage collected mid-flight
+        self._batches: set[asyncio.Task[None]] = set()
+
+    async def load(self, key: Key) -> Value | None:
+        """Return the value for `key`, or None if `fetch` did not return it"""
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            if not self._pending:
+                loop.call_soon(self._dispatch)
+            future = self._pending[key] = loop.create_future()
+        return await future
+
+    async def load_many(self, keys: Sequence[Key]) -> list[Value | None]:
+        """Load all `keys` in one batch, results in the same order"""
+        return list(await asyncio.gather(*[self.load(key) for key in keys]))
+
+    def _dispatch(self) -> None:
+        batch, self._pending = self._pending, {}
+        task = asyncio.ensure_future(self._run(batch))
+        self._batches.add(task)
+        task.add_done_callback(self._batches.discard)
+
+    async def _run(self, batch: dict[Key, asyncio.Future[Value | None]]) -> None:
+        try:
+            found = await self._fetch(list(batch))
+        except asyncio.CancelledError:
+            for future in batch.values():
+                future.cancel()
+            raise
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for key, future in batch.items():
+            if not future.done():
+                future.set_result(found.get(key))
@@ -1,111 +1,481 @@
 from __future__ import annotations
 
-from typing import Sequence
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Mapping, Sequence
 from uuid import UUID
 
-from sqlalchemy import select, func
+from sqlalchemy import (
+    CTE,
+    ColumnElement,
+    DateTime,
+    Integer,
+    Select,
+    String,
+    and_,
+    bindparam,
+    insert,
+    literal,
+    literal_column,
+    or_,
+    select,
+    func,
+    true,
+    union_all,
+    update,
+)
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
-from app.models.neuri.model import Mission, MissionType
-from app.models.neuri.schema import MissionCreate, MissionUpdate
-from app.repositories.base import BaseRepository
+from app.models.neuri.model import Mission, MissionType, RewardReason, User
+from app.models.neuri.schema import MissionCreate, MissionUpdate, RewardEventCreate
+from app.repositories.base import (
+    BaseRepository,
+    NotFoundError,
+    Page,
+    PageParams,
+    Row,
+    decode_cursor,
+    loaded_columns,
+)
+from app.repositories.reward import increment_counters_query
+from app.repositories.reward_ledger import record_reward_events
+
+# The hot per-user queries have a fixed shape, so they are built once with named bind parameters
+# instead of constructing a new select() on every call. Values are passed at execution time.
+_NOW = bindparam("now", type_=DateTime(timezone=True))
+# "Today" is the user's calendar day: midnight to midnight in their time zone, converted back to instants.
+# A half-open range on personal_deadline rather than date(personal_deadline) = today, so it is an index range scan
+# (ix_missions_user_id_personal_deadline). Adding the day in local time keeps DST days at 23 or 25 hours.
+_USER_TIME_ZONE = select(User.timezone).where(User.id == bindparam("user_id")).scalar_subquery()
+_LOCAL_DAY_START = func.date_trunc(literal_column("'day'"), func.timezone(_USER_TIME_ZONE, _NOW), type_=DateTime())
+_IS_PENDING = Mission.is_complete == False
+_IS_DUE_TODAY = and_(
+    Mission.personal_deadline >= func.timezone(_USER_TIME_ZONE, _LOCAL_DAY_START),
+    Mission.personal_deadline < func.timezone(_USER_TIME_ZONE, _LOCAL_DAY_START + literal_column("interval '1 day'")),
+)
+_IS_OVERDUE = and_(_IS_PENDING, Mission.true_deadline < _NOW)
+_IS_RECENT = Mission.created_at >= bindparam("cutoff")
+
+# Inlined instead of bound: the partial indexes on missions repeat these thresholds in their predicates, and the
+# planner can only prove a query matches them against a constant, not against a parameter of a generic plan
+HIGH_PRIORITY_THRESHOLD = literal_column("7", Integer)
+HEAVY_THRESHOLD = literal_column("7", Integer)
+
+_BY_USER = select(Mission).where(Mission.user_id == bindparam("user_id"))
+_PENDING_BY_USER = _BY_USER.where(_IS_PENDING)
+
+BY_USER_STMT = _BY_USER
+STREAM_BY_USER_STMT = _BY_USER.order_by(Mission.created_at, Mission.id)
+BY_CATEGORY_STMT = _BY_USER.where(Mission.category_id == bindparam("category_id"))
+BY_TYPE_STMT = _BY_USER.where(Mission.type == bindparam("mission_type"))
+SUB_TASKS_STMT = _BY_USER.where(Mission.parent_project_id == bindparam("parent_project_id"))
+BY_ROUTINE_STMT = _BY_USER.where(Mission.parent_routine_id == bindparam("routine_id"))
+COMPLETED_STMT = _BY_USER.where(Mission.is_complete == True)
+PENDING_STMT = _PENDING_BY_USER
+TODAY_STMT = _BY_USER.where(_IS_DUE_TODAY)
+OVERDUE_STMT = _BY_USER.where(_IS_OVERDUE)
+HIGH_PRIORITY_STMT = _PENDING_BY_USER.where(Mission.priority >= HIGH_PRIORITY_THRESHOLD)
+HEAVY_STMT = _PENDING_BY_USER.where(Mission.heaviness >= HEAVY_THRESHOLD)
+RECENT_STMT = _BY_USER.where(_IS_RECENT)
+
+# Search matches any word of the term in the title or body (full text, through the search_vector GIN index), or the
+# term fuzzily in the title (pg_trgm word similarity, through the trigram index), so "dentst" still finds "Dentist".
+# Results are ranked by text rank plus title similarity. `words` is the term's words joined with | (any word matches).
+_SEARCH_WORDS = re.compile(r"[^\W_]+")
+_SEARCH_QUERY = func.to_tsquery(literal_column("'english'::regconfig"), bindparam("words", type_=String))
+_SEARCH_TERM = bindparam("term", type_=String)
+_SEARCH_SCORE = func.ts_rank_cd(Mission.search_vector, _SEARCH_QUERY) + func.word_similarity(
+    _SEARCH_TERM, Mission.title
+)
+SEARCH_STMT = _BY_USER.where(
+    or_(Mission.search_vector.op("@@")(_SEARCH_QUERY), _SEARCH_TERM.op("<%")(Mission.title))
+)
+
+# A mission and every mission below it through parent_project_id, any depth, in one round-trip. UNION (not UNION ALL)
+# stops at ids already found, so a parent_project_id cycle can't recurse forever. Category and routine are then
+# loaded with one IN query each. Parents inside the tree are linked by assemble_tree, the root's parent is its own
+# query (PARENT_PROJECT_STMT) so it can run alongside.
+_TREE = select(Mission.id).where(Mission.id == bindparam("mission_id")).cte("tree", recursive=True)
+_TREE_CHILD = aliased(Mission, name="child")
+_TREE = _TREE.union(select(_TREE_CHILD.id).where(_TREE_CHILD.parent_project_id == _TREE.c.id))
+TREE_STMT = (
+    select(Mission)
+    .join(_TREE, Mission.id == _TREE.c.id)
+    .order_by(Mission.created_at, Mission.id)
+    .options(selectinload(Mission.category), selectinload(Mission.parent_routine))
+)
+PARENT_PROJECT_STMT = select(Mission).where(
+    Mission.id == select(Mission.parent_project_id).where(Mission.id == bindparam("mission_id")).scalar_subquery()
+)
+
+
+def _context_section(  # type: ignore[explicit-any]
+    stmt: Select[tuple[Mission]], name: str, *order_by: ColumnElement[Any]
+) -> Select[Any]:
+    # A NULL limit means no limit in Postgres
+    return (
+        stmt.with_only_columns(literal_column(f"'{name}'").label("section"), *loaded_columns(Mission))
+        .order_by(*order_by)
+        .limit(bindparam(f"{name}_limit", type_=Integer))
+    )
+
+
+AI_CONTEXT_SECTIONS = ("recent", "overdue", "today")
+# The AI context in one round-trip: per-user counts, LEFT JOINed to the (optionally limited) mission sections so the
+# counts row comes back even when every section is empty. A mission can appear in more than one section.
+_CONTEXT_COUNTS = (
+    select(
+        func.count().filter(_IS_PENDING).label("total_pending"),
+        func.count().filter(_IS_RECENT).label("recent_count"),
+        func.count().filter(_IS_OVERDUE).label("overdue_count"),
+        func.count().filter(_IS_DUE_TODAY).label("today_count"),
+    )
+    .where(Mission.user_id == bindparam("user_id"))
+    .subquery("counts")
+)
+_CONTEXT_SECTIONS = union_all(
+    _context_section(RECENT_STMT, "recent", Mission.created_at.desc(), Mission.id),
+    _context_section(OVERDUE_STMT, "overdue", Mission.true_deadline, Mission.id),
+    _context_section(TODAY_STMT, "today", Mission.personal_deadline, Mission.id),
+).subquery("sections")
+AI_CONTEXT_STMT = select(_CONTEXT_COUNTS, _CONTEXT_SECTIONS).select_from(
+    _CONTEXT_COUNTS.outerjoin(_CONTEXT_SECTIONS, true())
+)
+_CONTEXT_COUNT_KEYS = tuple(_CONTEXT_COUNTS.c.keys())
+
+STATUS_COUNTS_STMT = select(
+    func.count().label("total"),
+    func.count().filter(Mission.is_complete == True).label("completed"),
+    func.count().filter(_IS_PENDING).label("pending"),
+).where(Mission.user_id == bindparam("user_id"))
+
+
+@dataclass
+class MissionContext:
+    """Per-user mission counts plus the missions of each AI context section, as column rows"""
+
+    counts: dict[str, int]
+    sections: dict[str, list[Row]]
+
+
+def assemble_tree(missions: Sequence[Mission], mission_id: UUID, parent_project: Mission | None) -> Mission:
+    """
+    Link the rows of TREE_STMT into the tree under `mission_id`: sub_tasks (oldest first) and parent_project are
+    populated on every mission, so serializing the tree needs no lazy loads.
+    :raises: NotFoundError if the mission is not among `missions`
+    """
+    by_id = {mission.id: mission for mission in missions}
+    root = by_id.get(mission_id)
+    if root is None:
+        raise NotFoundError("Mission not found")
+
+    sub_tasks: dict[UUID, list[Mission]] = {mission.id: [] for mission in missions}
+    for mission in missions:
+        if mission is not root and mission.parent_project_id in sub_tasks:
+            sub_tasks[mission.parent_project_id].append(mission)
+    for mission in missions:
+        set_committed_value(mission, "sub_tasks", sub_tasks[mission.id])
+        parent = parent_project if mission is root else by_id.get(mission.parent_project_id)
+        set_committed_value(mission, "parent_project", parent)
+    return root
 
 
 class MissionRepository(BaseRepository[Mission, MissionCreate, MissionUpdate]):
+    # Paged list queries return plain column rows (see list_page_rows): they are read-only and go straight to
+    # MissionRead, so ORM instances would only add overhead.
+    # Everything MissionRead requires, so any projection still serializes
+    required_fields = ("id", "title", "type", "user_id", "created_at", "updated_at")
+    field_sets = {
+        "full": None,
+        # List views: everything except the unbounded note body
+        "summary": (
+            *required_fields,
+            "category_id",
+            "parent_project_id",
+            "parent_routine_id",
+            "true_deadline",
+            "personal_deadline",
+            "recurrence_rule",
+            "is_complete",
+            "heaviness",
+            "priority",
+        ),
+    }
+
     @property
     def model(self) -> type[Mission]:
         return Mission
 
-    async def list_by_user(self, session: AsyncSession, user_id: UUID) -> Sequence[Mission]:
-        stmt = select(Mission).where(Mission.user_id == user_id)
-        return await self.list(session, stmt)
+    async def list_by_user(
+        self, session: AsyncSession, user_id: UUID, page: PageParams | None = None, columns: Sequence[str] | None = None
+    ) -> Page[Row]:
+        return await self.list_page_rows(session, BY_USER_STMT, page, {"user_id": user_id}, columns)
+
+    def stream_by_user(self, session: AsyncSession, user_id: UUID) -> AsyncIterator[Mission]:
+        return self.stream(session, STREAM_BY_USER_STMT, {"user_id": user_id})
+
+    async def list_by_category(
+        self,
+        session: AsyncSession,
+        user_id: UUID,
+        category_id: UUID,
+        page: PageParams | None = None,
+        columns: Sequence[str] | None = None,
+    ) -> Page[Row]:
+        return await self.list_page_rows(
+            session, BY_CATEGORY_STMT, page, {"user_id": user_id, "category_id": category_id}, columns
+        )
+
+    async def list_by_type(
+        self,
+        session: AsyncSession,
+        user_id: UUID,
+        mission_type: MissionType,
+        page: PageParams | None = None,
+        columns: Sequence[str] | None = None,
+    ) -> Page[Row]:
+        return await self.list_page_rows(
+            session, BY_TYPE_STMT, page, {"user_id": user_id, "mission_type": mission_type}, columns
+        )
+
+    async def list_by_user_and_type(
+        self, session: AsyncSession, user_id: UUID, mission_type: MissionType
+    ) -> Sequence[Mission]:
+        return await self.list(session, BY_TYPE_STMT, {"user_id": user_id, "mission_type": mission_type})
 
-    async def list_by_category(self, session: AsyncSession, user_id: UUID, category_id: UUID) -> Sequence[Mission]:
-        stmt = select(Mission).where(Mission.user_id == user_id, Mission.category_id == category_id)
-        return await self.list(session, stmt)
+    async def create_with_points(self, session: AsyncSession, data: MissionCreate, points: int) -> Mission:
+        """
+        Insert a mission and add `points` to its owner's reward in one statement, creating the reward if needed.
+        :raises: ConstraintViolationError if an integrity constraint is violated
+        """
+        created = (
+            insert(Mission)
+            .values(self._with_column_defaults(data.model_dump()))
+            .returning(*loaded_columns(Mission))
+            .cte("created")
+        )
+        increments = select(created.c.user_id, literal(points).label("points"))
+        mission = await self._write_with_reward(session, created, increments)
+        record_reward_events(
+            session,
+            RewardEventCreate(
+                user_id=mission.user_id, reason=RewardReason.MISSION_CREATED, points=points, mission_id=mission.id
+            ),
+        )
+        return mission
+
+    async def create_many_with_points(
+        self, session: AsyncSession, data: Sequence[MissionCreate], points: int
+    ) -> Sequence[Mission]:
+        """
+        Insert missions with one multi-row INSERT and add `points` per mission to their owners' rewards, in one
+        statement. Returns the missions in the order of `data`.
+        :raises: ConstraintViolationError if an integrity constraint is violated
+        """
+        if not data:
+            return []
+        rows = [self._with_column_defaults(item.model_dump()) for item in data]
+        created = insert(Mission).values(rows).returning(*loaded_columns(Mission)).cte("created")
+        increments = select(created.c.user_id, (func.count() * points).label("points")).group_by(created.c.user_id)
+        try:
+            missions = (await session.scalars(self._with_reward(created, increments))).all()
+        except IntegrityError as e:
+            raise self._integrity_error(e)
+
+        # RETURNING order isn't guaranteed, the ids were generated here
+        by_id = {mission.id: mission for mission in missions}
+        missions = [by_id[row["id"]] for row in rows]
+        record_reward_events(
+            session,
+            *[
+                RewardEventCreate(
+                    user_id=mission.user_id, reason=RewardReason.MISSION_CREATED, points=points, mission_id=mission.id
+                )
+                for mission in missions
+            ],
+        )
+        return missions
+
+    async def complete_with_reward(self, session: AsyncSession, mission_id: UUID) -> Mission:
+        """
+        Mark a mission complete and count it in its owner's reward in one statement.
+        :raises: NotFoundError if the mission does not exist
+        """
+        completed = (
+            update(Mission)
+            .where(Mission.id == mission_id)
+            .values(is_complete=True, updated_at=datetime.now())
+            .returning(*loaded_columns(Mission))
+            .cte("completed")
+        )
+        increments = select(completed.c.user_id, literal(1).label("total_tasks_done"))
+        mission = await self._write_with_reward(session, completed, increments)
+        record_reward_events(
+            session,
+            RewardEventCreate(
+                user_id=mission.user_id, reason=RewardReason.MISSION_COMPLETED, tasks_done=1, mission_id=mission.id
+            ),
+        )
+        return mission
 
-    async def list_by_type(self, session: AsyncSession, user_id: UUID, mission_type: MissionType) -> Sequence[Mission]:
-        stmt = select(Mission).where(Mission.user_id == user_id, Mission.type == mission_type)
-        return await self.list(session, stmt)
+    async def _write_with_reward(  # type: ignore[explicit-any]
+        self, session: AsyncSession, written: CTE, increments: Select[Any]
+    ) -> Mission:
+        try:
+            mission = (await session.scalars(self._with_reward(written, increments))).one_or_none()
+        except IntegrityError as e:
+            raise self._integrity_error(e)
+        if mission is None:
+            raise NotFoundError("Mission not found")
+        return mission
 
-    async def list_by_user_and_type(self, session: AsyncSession, user_id: UUID, mission_type: MissionType) -> Sequence[Mission]:
-        stmt = select(Mission).where(Mission.user_id == user_id, Mission.type == mission_type)
-        return await self.list(session, stmt)
+    @staticmethod
+    def _with_reward(written: CTE, increments: Select[Any]) -> Select[tuple[Mission]]:  # type: ignore[explicit-any]
+        # Data-modifying CTEs all run, referenced or not, so the reward upsert rides along with the mission write
+        return (
+            select(aliased(Mission, written))
+            .add_cte(increment_counters_query(increments).cte("reward"))
+            .execution_options(populate_existing=True)
+        )
 
     async def get_mission_by_id(self, session: AsyncSession, mission_id: UUID) -> Mission:
-        stmt = select(Mission).filter_by(id=mission_id)
-        return await self.get(session, stmt)
+        return await self.get_by_uuid(session, mission_id)
 
-    async def list_sub_tasks(self, session: AsyncSession, user_id: UUID, parent_project_id: UUID) -> Sequence[Mission]:
-        stmt = select(Mission).where(Mission.user_id == user_id, Mission.parent_project_id == parent_project_id)
-        return await self.list(session, stmt)
+    async def list_tree(self, session: AsyncSession, mission_id: UUID) -> Sequence[Mission]:
+        """A mission and every mission below it, with their category and routine loaded (see assemble_tree)"""
+        return await self.list(session, TREE_STMT, {"mission_id": mission_id})
 
-    async def list_generated_by_routine(self, session: AsyncSession, user_id: UUID, routine_id: UUID) -> Sequence[Mission]:
-        stmt = select(Mission).where(Mission.user_id == user_id, Mission.parent_routine_id == routine_id)
-        return await self.list(session, stmt)
+    async def get_parent_project(self, session: AsyncSession, mission_id: UUID) -> Mission | None:
+        """The project a mission is a sub-task of, None when it has none or doesn't exist"""
+        result = await session.execute(PARENT_PROJECT_STMT, {"mission_id": mission_id})
+        return result.scalar_one_or_none()
+
+    async def list_sub_tasks(
+        self,
+        session: AsyncSession,
+        user_id: UUID,
+        parent_project_id: UUID,
+        page: PageParams | None = None,
+        columns: Sequence[str] | None = None,
+    ) -> Page[Row]:
+        params = {"user_id": user_id, "parent_project_id": parent_project_id}
+        return await self.list_page_rows(session, SUB_TASKS_STMT, page, params, columns)
+
+    async def list_generated_by_routine(
+        self,
+        session: AsyncSession,
+        user_id: UUID,
+        routine_id: UUID,
+        page: PageParams | None = None,
+        columns: Sequence[str] | None = None,
+    ) -> Page[Row]:
+        return await self.list_page_rows(
+            session, BY_ROUTINE_STMT, page, {"user_id": user_id, "routine_id": routine_id}, columns
+        )
 
     async def list_completed_by_user(self, session: AsyncSession, user_id: UUID) -> Sequence[Mission]:
-        stmt = select(Mission).where(Mission.user_id == user_id, Mission.is_complete == True)
-        return await self.list(session, stmt)
+        return await self.list(session, COMPLETED_STMT, {"user_id": user_id})
 
     async def list_pending_by_user(self, session: AsyncSession, user_id: UUID) -> Sequence[Mission]:
-        stmt = select(Mission).where(Mission.user_id == user_id, Mission.is_complete == False)
-        return await self.list(session, stmt)
-
-    async def get_today_missions(self, session: AsyncSession, user_id: UUID) -> Sequence[Mission]:
-        """Get missions due today (based on personal_deadline)"""
-        from datetime import datetime, date
-        today = date.today()
-        stmt = select(Mission).where(
-            Mission.user_id == user_id,
-            Mission.personal_deadline.isnot(None),
-            func.date(Mission.personal_deadline) == today
-        )
-        return await self.list(session, stmt)
+        return await self.list(session, PENDING_STMT, {"user_id": user_id})
+
+    async def get_today_missions(
+        self, session: AsyncSession, user_id: UUID, page: PageParams | None = None, columns: Sequence[str] | None = None
+    ) -> Page[Row]:
+        """Get missions due today in the user's time zone (based on personal_deadline)"""
+        params = {"user_id": user_id, "now": datetime.now(timezone.utc)}
+        return await self.list_page_rows(session, TODAY_STMT, page, params, columns)
 
-    async def get_overdue_missions(self, session: AsyncSession, user_id: UUID) -> Sequence[Mission]:
+    async def get_overdue_missions(
+        self, session: AsyncSession, user_id: UUID, page: PageParams | None = None, columns: Sequence[str] | None = None
+    ) -> Page[Row]:
         """Get overdue missions (based on true_deadline)"""
-        from datetime import datetime
-        now = datetime.now()
-        stmt = select(Mission).where(
-            Mission.user_id == user_id,
-            Mission.true_deadline < now,
-            Mission.is_complete == False
-        )
-        return await self.list(session, stmt)
+        params = {"user_id": user_id, "now": datetime.now(timezone.utc)}
+        return await self.list_page_rows(session, OVERDUE_STMT, page, params, columns)
 
-    async def get_high_priority_missions(self, session: AsyncSession, user_id: UUID) -> Sequence[Mission]:
+    async def get_high_priority_missions(
+        self, session: AsyncSession, user_id: UUID, page: PageParams | None = None, columns: Sequence[str] | None = None
+    ) -> Page[Row]:
         """Get high priority missions (priority >= 7)"""
-        stmt = select(Mission).where(
-            Mission.user_id == user_id,
-            Mission.priority >= 7,
-            Mission.is_complete == False
-        )
-        return await self.list(session, stmt)
+        return await self.list_page_rows(session, HIGH_PRIORITY_STMT, page, {"user_id": user_id}, columns)
 
-    async def get_heavy_missions(self, session: AsyncSession, user_id: UUID) -> Sequence[Mission]:
+    async def get_heavy_missions(
+        self, session: AsyncSession, user_id: UUID, page: PageParams | None = None, columns: Sequence[str] | None = None
+    ) -> Page[Row]:
         """Get heavy missions (heaviness >= 7)"""
-        stmt = select(Mission).where(
-            Mission.user_id == user_id,
-            Mission.heaviness >= 7,
-            Mission.is_complete == False
-        )
-        return await self.list(session, stmt)
+        return await self.list_page_rows(session, HEAVY_STMT, page, {"user_id": user_id}, columns)
 
-    async def search_missions_by_title(self, session: AsyncSession, user_id: UUID, search_term: str) -> Sequence[Mission]:
-        """Search missions by title"""
-        stmt = select(Mission).where(
-            Mission.user_id == user_id,
-            Mission.title.ilike(f"%{search_term}%")
-        )
-        return await self.list(session, stmt)
+    async def search(
+        self,
+        session: AsyncSession,
+        user_id: UUID,
+        search_term: str,
+        page: PageParams,
+        columns: Sequence[str] | None = None,
+    ) -> Page[Row]:
+        """
+        Missions matching `search_term` (see SEARCH_STMT), best match first, keyset-paginated on (score, id).
+        :raises: ValidationError if the cursor is malformed
+        """
+        words = _SEARCH_WORDS.findall(search_term.lower())
+        if not words:
+            return Page(items=[], limit=page.limit)
+
+        table = Mission.__table__
+        selected = loaded_columns(Mission) if columns is None else [table.c[name] for name in columns]
+        query = SEARCH_STMT.with_only_columns(*selected, _SEARCH_SCORE.label("score"))
+        if page.cursor is not None:
+            score, record_id = decode_cursor(page.cursor, float)
+            query = query.where(or_(_SEARCH_SCORE < score, and_(_SEARCH_SCORE == score, Mission.id > record_id)))
+        query = query.order_by(_SEARCH_SCORE.desc(), Mission.id).limit(page.limit + 1)
+
+        params = {"user_id": user_id, "term": search_term, "words": " | ".join(words)}
+        result = await session.execute(query, params)
+        keys = list(result.keys())
+        rows = [dict(zip(keys, row)) for row in result.all()]
+        found = self._page(rows, page, lambda row: (row["score"], row["id"]))
+        for row in found.items:
+            del row["score"]
+        return found
 
     async def get_recent_missions(self, session: AsyncSession, user_id: UUID, days: int = 7) -> Sequence[Mission]:
         """Get missions created in the last N days"""
-        from datetime import datetime, timedelta
         cutoff = datetime.now() - timedelta(days=days)
-        stmt = select(Mission).where(
-            Mission.user_id == user_id,
-            Mission.created_at >= cutoff
-        )
-        return await self.list(session, stmt)
+        return await self.list(session, RECENT_STMT, {"user_id": user_id, "cutoff": cutoff})
+
+    async def count_by_status(self, session: AsyncSession, user_id: UUID) -> dict[str, int]:
+        """Total, completed and pending mission counts of a user, in one query"""
+        result = await session.execute(STATUS_COUNTS_STMT, {"user_id": user_id})
+        return dict(result.mappings().one())
+
+    async def get_ai_context(
+        self, session: AsyncSession, user_id: UUID, days: int = 7, limits: Mapping[str, int | None] | None = None
+    ) -> MissionContext:
+        """
+        Counts and the recent (created in the last `days` days), overdue and due-today missions, in one query.
+        `limits` caps the missions returned per section (see AI_CONTEXT_SECTIONS), counts are never limited.
+        """
+        limits = limits or {}
+        params = {
+            "user_id": user_id,
+            "cutoff": datetime.now() - timedelta(days=days),
+            "now": datetime.now(timezone.utc),
+            **{f"{name}_limit": limits.get(name) for name in AI_CONTEXT_SECTIONS},
+        }
+        result = await session.execute(AI_CONTEXT_STMT, params)
+        keys = list(result.keys())
+        rows = [dict(zip(keys, row)) for row in result.all()]
+
+        counts = {key: int(rows[0][key]) for key in _CONTEXT_COUNT_KEYS}
+        sections: dict[str, list[Row]] = {name: [] for name in AI_CONTEXT_SECTIONS}
+        for row in rows:
+            section = row.pop("section")
+            for key in _CONTEXT_COUNT_KEYS:
+                del row[key]
+            if section is not None:
+                sections[section].append(row)
+        return MissionContext(counts=counts, sections=sections)
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from uuid import UUID
+
+import numpy as np
+import numpy.typing as npt
+from sqlalchemy import bindparam, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import config
+from app.models import Mission, MissionType
+from app.repositories.after_commit import AfterCommit
+from app.repositories.user_index import UserIndexCache
+
+NOTES_STMT = select(Mission.id, Mission.title, Mission.body).where(
+    Mission.user_id == bindparam("user_id"), Mission.type == MissionType.NOTE
+)
+
+_WORDS = re.compile(r"[^\W\d_]{2,}")
+_STOP_WORDS = frozenset(
+    """
+    a about after again all also am an and any are as at be been before being but by can could did do does doing
+    down for from had has have having he her here hers him his how i if in into is it its just me more most my no
+    nor not now of off on once only or other our ours out over own same she should so some such than that the their
+    theirs them then there these they this those through to too under until up very was we were what when where
+    which while who whom why will with would you your yours
+    """.split()
+)
+
+
+@dataclass(frozen=True)
+class NoteChange:
+    """A note of `user_id` was written (`text` is its title and body) or, with `text` None, deleted"""
+
+    user_id: UUID | None
+    note_id: UUID
+    text: str | None = None
+
+
+def note_text(title: str, body: str | None) -> str:
+    return f"{title}\n{body}" if body else title
+
+
+def written_note(note: Mission) -> NoteChange:
+    return NoteChange(note.user_id, note.id, note_text(note.title, note.body))
+
+
+def _term_counts(text: str) -> Counter[str]:
+    return Counter(word for word in _WORDS.findall(text.lower()) if word not in _STOP_WORDS)
+
+
+@dataclass
+class _Matrix:
+    """All note vectors of an index as one CSR matrix, rows in `note_ids` order"""
+
+    note_ids: list[UUID]
+    indptr: npt.NDArray[np.int64]
+    indices: npt.NDArray[np.int32]
+    weights: npt.NDArray[np.float32]
+    norms: npt.NDArray[np.float32]
+    idf: npt.NDArray[np.float32]
+
+
+class NoteIndex:
+    """
+    TF-IDF vectors (sublinear term frequency, smoothed idf) of one user's notes, for cosine similarity ranking.
+    Notes are added, replaced and removed one at a time; the CSR matrix used for ranking is rebuilt from the
+    per-note sparse vectors on the next query after a change.
+    """
+
+    def __init__(self) -> None:
+        self._vocabulary: dict[str, int] = {}
+        self._document_frequency = np.zeros(256, dtype=np.int32)
+        # Per note: sorted term ids and their log-scaled term frequencies
+        self._notes: dict[UUID, tuple[npt.NDArray[np.int32], npt.NDArray[np.float32]]] = {}
+        self._matrix: _Matrix | None = None
+
+    def __len__(self) -> int:
+        return len(self._notes)
+
+    def put(self, note_id: UUID, text: str) -> None:
+        """Add or replace a note"""
+        self.discard(note_id)
+        counts = _term_counts(text)
+        if not counts:
+            return
+        for term in counts:
+            if term not in self._vocabulary:
+                self._vocabulary[term] = len(self._vocabulary)
+        if len(self._vocabulary) > len(self._document_frequency):
+            grown = np.zeros(2 * len(self._vocabulary), dtype=np.int32)
+            grown[: len(self._document_frequency)] = self._document_frequency
+            self._document_frequency = grown
+
+        term_ids, frequencies = self._vector(counts)
+        self._document_frequency[term_ids] += 1
+        self._notes[note_id] = (term_ids, frequencies)
+        self._matrix = None
+
+    def discard(self, note_id: UUID) -> None:
+        entry = self._notes.pop(note_id, None)
+        if entry is not None:
+            self._document_frequency[entry[0]] -= 1
+            self._matrix = None
+
+    def related(self, text: str, limit: int, exclude: UUID | None = None) -> list[tuple[UUID, float]]:
+        """Up to `limit` notes most similar to `text`, with their cosine similarity, best first"""
+        counts = _term_counts(text)
+        counts = Counter({term: count for term, count in counts.items() if term in self._vocabulary})
+        if not counts or not self._notes:
+            return []
+
+        matrix = self._compiled()
+        term_ids, frequencies = self._vector(counts)
+        query = np.zeros(len(self._vocabulary), dtype=np.float32)
+        query[term_ids] = frequencies * matrix.idf[term_ids]
+        query_norm = float(np.linalg.norm(query))
+
+        # Sparse matrix-vector product: each note's dot product with the query, summed per CSR row
+        dots = np.add.reduceat(matrix.weights * query[matrix.indices], matrix.indptr[:-1])
+        scores = dots / (matrix.norms * query_norm)
+        if exclude is not None and exclude in self._notes:
+            scores[matrix.note_ids.index(exclude)] = 0.0
+
+        count = min(limit, int(np.count_nonzero(scores > 0)))
+        if count == 0:
+            return []
+        top = np.argpartition(-scores, count - 1)[:count]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(matrix.note_ids[i], float(scores[i])) for i in top]
+
+    def _vector(self, counts: Counter[str]) -> tuple[npt.NDArray[np.int32], npt.NDArray[np.float32]]:
+        pairs = sorted((self._vocabulary[term], 1.0 + math.log(count)) for term, count in counts.items())
+        return np.array([p[0] for p in pairs], dtype=np.int32), np.array([p[1] for p in pairs], dtype=np.float32)
+
+    def _compiled(self) -> _Matrix:
+        if self._matrix is not None:
+            return self._matrix
+
+        note_ids = list(self._notes)
+        vectors = list(self._notes.values())
+        lengths = np.array([len(term_ids) for term_ids, _ in vectors], dtype=np.int64)
+        indptr = np.zeros(len(vectors) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=indptr[1:])
+        indices = np.concatenate([term_ids for term_ids, _ in vectors])
+        frequencies = np.concatenate([frequencies for _, frequencies in vectors])
+
+        document_frequency = self._document_frequency[: len(self._vocabulary)]
+        idf = (np.log((1 + len(note_ids)) / (1 + document_frequency)) + 1).astype(np.float32)
+        weights = frequencies * idf[indices]
+        # Notes without terms are never stored, so every row is non-empty and reduceat sums exactly its own entries
+        norms = np.sqrt(np.add.reduceat(weights * weights, indptr[:-1]))
+        self._matrix = _Matrix(note_ids, indptr, indices, weights, norms, idf)
+        return self._matrix
+
+
+class NoteIndexCache(UserIndexCache[NoteIndex, NoteChange]):
+    """
+    Per-user NoteIndex objects of this worker (see UserIndexCache), kept up to date with the changes recorded
+    by `record_note_changes`. The least recently used index is evicted past `max_users`.
+    """
+
+    def __init__(self, max_users: int, ttl_seconds: float) -> None:
+        super().__init__(ttl_seconds)
+        self._max_users = max_users
+
+    async def _load(self, session: AsyncSession, user_id: UUID) -> NoteIndex:
+        index = NoteIndex()
+        result = await session.execute(NOTES_STMT, {"user_id": user_id})
+        for note_id, title, body in result:
+            index.put(note_id, note_text(title, body))
+        return index
+
+    def _apply_change(self, index: NoteIndex, change: NoteChange) -> None:
+        if change.text is None:
+            index.discard(change.note_id)
+        else:
+            index.put(change.note_id, change.text)
+
+    def _evict(self) -> None:
+        while len(self._entries) > self._max_users:
+            self._entries.popitem(last=False)
+
+
+note_indexes = NoteIndexCache(max_users=config.NOTE_INDEX_MAX_USERS, ttl_seconds=config.NOTE_INDEX_TTL_SECONDS)
+_note_changes = AfterCommit[NoteChange]("note_changes", note_indexes.apply)
+
+
+def record_note_changes(session: AsyncSession, *changes: NoteChange) -> None:
+    """Apply `changes` to the cached note indexes once `session` commits, they are dropped if it rolls back"""
+    _note_changes.record(session, *changes)
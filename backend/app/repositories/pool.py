@@ -0,0 +1,84 @@
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from pydantic import BaseModel
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
+
+
+@dataclass
+class PoolCounters:
+    """Cumulative checkout counters since the pool was created"""
+
+    checkouts: int = 0
+    overflow_checkouts: int = 0
+    timeouts: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that records how long each checkout waited for a connection.
+    There is no pool event that fires before a checkout starts waiting, so this wraps `_do_get`.
+    """
+
+    counters: PoolCounters
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:  # type: ignore[explicit-any]
+        super().__init__(*args, **kwargs)
+        self.counters = PoolCounters()
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        start = time.perf_counter()
+        try:
+            entry = super()._do_get()
+        except PoolTimeoutError:
+            self.counters.timeouts += 1
+            raise
+
+        wait = time.perf_counter() - start
+        self.counters.checkouts += 1
+        self.counters.total_wait += wait
+        self.counters.max_wait = max(self.counters.max_wait, wait)
+        if self.overflow() > 0:
+            self.counters.overflow_checkouts += 1
+        return entry
+
+
+class PoolStats(BaseModel):
+    """Point-in-time pool occupancy plus cumulative checkout counters for one worker process"""
+
+    pool_size: int
+    max_overflow: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    checkouts: int
+    overflow_checkouts: int
+    timeouts: int
+    avg_wait_ms: float
+    max_wait_ms: float
+
+
+def pool_stats(engine: AsyncEngine) -> PoolStats:
+    pool = engine.pool
+    if not isinstance(pool, InstrumentedAsyncPool):
+        raise TypeError("Engine was not created with InstrumentedAsyncPool")
+
+    counters = pool.counters
+    return PoolStats(
+        pool_size=pool.size(),
+        max_overflow=pool._max_overflow,
+        checked_out=pool.checkedout(),
+        checked_in=pool.checkedin(),
+        # overflow() counts down from -pool_size while the pool is still filling
+        overflow=max(0, pool.overflow()),
+        checkouts=counters.checkouts,
+        overflow_checkouts=counters.overflow_checkouts,
+        timeouts=counters.timeouts,
+        avg_wait_ms=counters.total_wait / counters.checkouts * 1000 if counters.checkouts else 0.0,
+        max_wait_ms=counters.max_wait * 1000,
+    )
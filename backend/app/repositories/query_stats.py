@@ -0,0 +1,104 @@
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, ExecutionContext
+from sqlalchemy.engine.interfaces import DBAPICursor
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# Key in Connection.info holding the start time of the statement running on that connection.
+# A connection runs one statement at a time, and a failed statement's value is overwritten by the next one.
+_START_TIME = "query_stats_start"
+
+
+@dataclass
+class QueryStats:
+    """SQL statements executed while handling one request. Durations are in seconds."""
+
+    count: int = 0
+    total: float = 0.0
+    slowest: float = 0.0
+    slowest_statement: str | None = None
+    # Executions per SQL string; bound values are sent separately, so this is the statement shape
+    shapes: Counter[str] = field(default_factory=Counter)
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.total += duration
+        self.shapes[statement] += 1
+        if duration > self.slowest:
+            self.slowest = duration
+            self.slowest_statement = statement
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statement shapes executed at least `threshold` times, most frequent first"""
+        return [(statement, n) for statement, n in self.shapes.most_common() if n >= threshold]
+
+    def server_timing(self) -> str:
+        return (
+            f'db;dur={self.total * 1000:.1f};desc="{self.count} statements", '
+            f"db-slowest;dur={self.slowest * 1000:.1f}"
+        )
+
+    def log_fields(self) -> dict[str, int | float | str | None]:
+        return {
+            "db_statements": self.count,
+            "db_time_ms": round(self.total * 1000, 1),
+            "db_slowest_ms": round(self.slowest * 1000, 1),
+            "db_slowest_statement": self.slowest_statement,
+        }
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """
+    Record every statement executed in this context (and tasks started from it) into a fresh QueryStats.
+    Statements outside of `track_queries` are not recorded.
+    """
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Hook the cursor execute events of `engine` so statements run inside `track_queries` are timed"""
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _before_cursor_execute(
+    conn: Connection,
+    cursor: DBAPICursor,
+    statement: str,
+    parameters: object,
+    context: ExecutionContext | None,
+    executemany: bool,
+) -> None:
+    if _current.get() is not None:
+        conn.info[_START_TIME] = time.perf_counter()
+
+
+def _after_cursor_execute(
+    conn: Connection,
+    cursor: DBAPICursor,
+    statement: str,
+    parameters: object,
+    context: ExecutionContext | None,
+    executemany: bool,
+) -> None:
+    stats = _current.get()
+    start = conn.info.pop(_START_TIME, None)
+    if stats is None or start is None:
+        return
+    stats.record(statement, time.perf_counter() - start)
+
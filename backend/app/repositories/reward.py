@@ -1,14 +1,89 @@
 from __future__ import annotations
 
-from typing import Sequence
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, AsyncIterator, Literal, Sequence, cast
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import DateTime, Integer, Select, bindparam, column, func, literal, select, table, text, tuple_
+from sqlalchemy import Uuid as DB_UUID
+from sqlalchemy.dialects.postgresql import Insert as PgInsert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.neuri.model import Reward
-from app.models.neuri.schema import RewardCreate, RewardUpdate
-from app.repositories.base import BaseRepository
+from app.models.neuri.model import Reward, RewardReason
+from app.models.neuri.schema import RewardCreate, RewardEventCreate, RewardUpdate
+from app.repositories.base import (
+    BaseRepository,
+    NotFoundError,
+    Page,
+    PageParams,
+    Params,
+    Row,
+    decode_cursor,
+    managed_session,
+)
+from app.repositories.reward_ledger import record_reward_events
+
+logger = logging.getLogger(__name__)
+
+COUNTERS = ("points", "streak", "total_tasks_done")
+
+LeaderboardMetric = Literal["points", "streak"]
+
+# Materialized view ranking every reward (see the add_reward_leaderboard migration), refreshed by
+# refresh_leaderboard_periodically. Not part of the ORM metadata, so create_all and autogenerate leave it alone.
+LEADERBOARD = table(
+    "reward_leaderboard",
+    column("user_id", DB_UUID),
+    column("points", Integer),
+    column("streak", Integer),
+    column("points_rank", Integer),
+    column("streak_rank", Integer),
+)
+# Any constant works, it only has to be the same in every worker
+_LEADERBOARD_REFRESH_LOCK = 0x6C656164
+
+
+def mission_points(mission_type: str, is_subtask: bool = False) -> int:
+    """Points earned for creating a mission, based on its type and size"""
+    if is_subtask:
+        return 1  # Small task (sub-task) = +1 point
+    elif mission_type == "task":
+        return 3  # Regular task = +3 points
+    elif mission_type == "project":
+        return 5  # Big task (parent task) = +5 points
+    elif mission_type == "reminder":
+        return 2  # Reminder = +2 points
+    elif mission_type == "note":
+        return 1  # Note = +1 point
+    else:
+        return 1  # Default
+
+
+def increment_counters_query(increments: Select[Any]) -> PgInsert:  # type: ignore[explicit-any]
+    """
+    INSERT ... ON CONFLICT (user_id) DO UPDATE adding to reward counters, to embed in a larger statement as a CTE.
+    `increments` selects `user_id` and one labelled column per counter to add to (see COUNTERS), at most one row
+    per user. Users without a reward row get one, starting from the increments.
+    """
+    names = increments.selected_columns.keys()
+    now = literal(datetime.now(), DateTime)
+    source = increments.add_columns(
+        *[literal(0).label(name) for name in COUNTERS if name not in names],
+        func.gen_random_uuid().label("id"),
+        now.label("created_at"),
+        now.label("updated_at"),
+    )
+    query = pg_insert(Reward).from_select(source.selected_columns.keys(), source)
+    return query.on_conflict_do_update(
+        index_elements=[Reward.user_id],
+        set_={
+            **{name: getattr(Reward, name) + getattr(query.excluded, name) for name in COUNTERS if name in names},
+            "updated_at": query.excluded.updated_at,
+        },
+    )
 
 
 class RewardRepository(BaseRepository[Reward, RewardCreate, RewardUpdate]):
@@ -22,62 +97,144 @@ class RewardRepository(BaseRepository[Reward, RewardCreate, RewardUpdate]):
         return result.scalar_one_or_none()
 
     async def get_reward_by_id(self, session: AsyncSession, reward_id: UUID) -> Reward:
-        stmt = select(Reward).filter_by(id=reward_id)
-        return await self.get(session, stmt)
+        return await self.get_by_uuid(session, reward_id)
 
     async def list_rewards(self, session: AsyncSession) -> Sequence[Reward]:
         stmt = select(Reward)
         return await self.list(session, stmt)
 
-    async def update_points(self, session: AsyncSession, user_id: UUID, points_change: int) -> Reward:
-        """Add or subtract points from user's reward"""
+    def stream_rewards(self, session: AsyncSession) -> AsyncIterator[Reward]:
+        stmt = select(Reward).order_by(Reward.created_at, Reward.id)
+        return self.stream(session, stmt)
+
+    async def list_top(self, session: AsyncSession, metric: LeaderboardMetric, limit: int) -> list[Row]:
+        """
+        The `limit` best users by `metric`, live. Walks the descending index and stops after `limit` rows.
+        Ranking only the top rows is still exact: every row scoring higher is among them.
+        """
+        score = getattr(Reward, metric)
+        top = (
+            select(Reward.user_id, Reward.points, Reward.streak)
+            .order_by(score.desc(), Reward.user_id)
+            .limit(bindparam("limit"))
+            .subquery()
+        )
+        rank = func.rank().over(order_by=top.c[metric].desc()).label("rank")
+        stmt = select(top, rank).order_by(rank, top.c.user_id)
+        return await self._rows(session, stmt, {"limit": limit})
+
+    async def list_leaderboard(self, session: AsyncSession, metric: LeaderboardMetric, page: PageParams) -> Page[Row]:
+        """
+        One page of the full ranking, from the leaderboard snapshot, paginated on (rank, user_id).
+        :raises: ValidationError if the cursor is malformed
+        """
+        rank = LEADERBOARD.c[f"{metric}_rank"]
+        stmt = select(LEADERBOARD.c.user_id, LEADERBOARD.c.points, LEADERBOARD.c.streak, rank.label("rank"))
+        if page.cursor is not None:
+            after_rank, after_user_id = decode_cursor(page.cursor, int)
+            stmt = stmt.where(tuple_(rank, LEADERBOARD.c.user_id) > tuple_(after_rank, after_user_id))
+        stmt = stmt.order_by(rank, LEADERBOARD.c.user_id).limit(page.limit + 1)
+        rows = await self._rows(session, stmt)
+        return self._page(rows, page, lambda row: (cast(int, row["rank"]), cast(UUID, row["user_id"])))
+
+    async def get_rank(self, session: AsyncSession, user_id: UUID, metric: LeaderboardMetric) -> Row:
+        """
+        The user's position in the leaderboard snapshot, a single lookup on its unique user_id index.
+        :raises: NotFoundError if the user was not ranked yet (no reward at the last refresh)
+        """
+        rank = LEADERBOARD.c[f"{metric}_rank"]
+        stmt = select(LEADERBOARD.c.user_id, LEADERBOARD.c.points, LEADERBOARD.c.streak, rank.label("rank")).where(
+            LEADERBOARD.c.user_id == user_id
+        )
+        rows = await self._rows(session, stmt)
+        if not rows:
+            raise NotFoundError("User is not ranked yet")
+        return rows[0]
+
+    async def refresh_leaderboard(self, session: AsyncSession) -> bool:
+        """
+        Recompute the leaderboard snapshot without blocking its readers.
+        Returns False without refreshing when another worker is already doing it.
+        """
+        locked = await session.scalar(select(func.pg_try_advisory_xact_lock(_LEADERBOARD_REFRESH_LOCK)))
+        if not locked:
+            return False
+        await session.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY reward_leaderboard"))
+        return True
+
+    @staticmethod
+    async def _rows(  # type: ignore[explicit-any]
+        session: AsyncSession, stmt: Select[Any], params: Params | None = None
+    ) -> list[Row]:
+        result = await session.execute(stmt, params)
+        keys = list(result.keys())
+        return [dict(zip(keys, row)) for row in result.all()]
+
+    async def increment(
+        self,
+        session: AsyncSession,
+        user_id: UUID,
+        points: int = 0,
+        streak: int = 0,
+        total_tasks_done: int = 0,
+        reason: RewardReason = RewardReason.ADJUSTMENT,
+    ) -> Reward:
+        """
+        Add to a user's reward counters and return the updated reward, creating it if the user has none.
+        Runs as a single INSERT ... ON CONFLICT (user_id) DO UPDATE ... RETURNING, so concurrent increments are
+        never lost and concurrent first writes don't race on the unique user_id index.
+        Non-zero changes are recorded in the reward ledger under `reason` once the session commits.
+        """
+        increments = select(
+            literal(user_id, DB_UUID).label("user_id"),
+            literal(points).label("points"),
+            literal(streak).label("streak"),
+            literal(total_tasks_done).label("total_tasks_done"),
+        )
+        query = increment_counters_query(increments).returning(Reward).execution_options(populate_existing=True)
+        reward = (await session.scalars(query)).one()
+        if points or streak or total_tasks_done:
+            record_reward_events(
+                session,
+                RewardEventCreate(
+                    user_id=user_id, reason=reason, points=points, streak=streak, tasks_done=total_tasks_done
+                ),
+            )
+        return reward
+
+    async def get_or_create_by_user(self, session: AsyncSession, user_id: UUID) -> Reward:
+        """Get the user's reward, creating an empty one on first use"""
         reward = await self.get_by_user(session, user_id)
-        if not reward:
-            raise ValueError(f"No reward found for user {user_id}")
-        
-        reward.points += points_change
+        if reward is None:
+            # Adding nothing provisions the row, and returns the concurrently created one if it lost the race
+            reward = await self.increment(session, user_id)
         return reward
 
+    async def update_points(self, session: AsyncSession, user_id: UUID, points_change: int) -> Reward:
+        """Add or subtract points from user's reward"""
+        return await self.increment(session, user_id, points=points_change)
+
     async def update_streak(self, session: AsyncSession, user_id: UUID, streak_change: int) -> Reward:
         """Update user's streak"""
-        reward = await self.get_by_user(session, user_id)
-        if not reward:
-            raise ValueError(f"No reward found for user {user_id}")
-        
-        reward.streak += streak_change
-        return reward
+        return await self.increment(session, user_id, streak=streak_change)
 
     async def increment_tasks_done(self, session: AsyncSession, user_id: UUID) -> Reward:
         """Increment total tasks done counter"""
-        reward = await self.get_by_user(session, user_id)
-        if not reward:
-            raise ValueError(f"No reward found for user {user_id}")
-        
-        reward.total_tasks_done += 1
-        return reward
+        return await self.increment(session, user_id, total_tasks_done=1, reason=RewardReason.MISSION_COMPLETED)
 
     async def add_points_for_mission(self, session: AsyncSession, user_id: UUID, mission_type: str, is_subtask: bool = False) -> Reward:
         """Add points based on mission type and size"""
-        reward = await self.get_by_user(session, user_id)
-        
-        # Create reward if it doesn't exist
-        if not reward:
-            reward_data = RewardCreate(user_id=user_id)
-            reward = await self.create(session, reward_data)
-        
-        # Point system based on business logic
-        if is_subtask:
-            points = 1  # Small task (sub-task) = +1 point
-        elif mission_type == "task":
-            points = 3  # Regular task = +3 points
-        elif mission_type == "project":
-            points = 5  # Big task (parent task) = +5 points
-        elif mission_type == "reminder":
-            points = 2  # Reminder = +2 points
-        elif mission_type == "note":
-            points = 1  # Note = +1 point
-        else:
-            points = 1  # Default
-        
-        reward.points += points
-        return reward
+        points = mission_points(mission_type, is_subtask)
+        return await self.increment(session, user_id, points=points, reason=RewardReason.MISSION_POINTS)
+
+
+async def refresh_leaderboard_periodically(interval: float) -> None:
+    """Refresh the leaderboard snapshot every `interval` seconds until cancelled. Started with the app."""
+    repo = RewardRepository()
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with managed_session() as session:
+                await repo.refresh_leaderboard(session)
+        except Exception:
+            logger.exception("Failed to refresh the reward leaderboard")
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from datetime import date, timedelta
+from typing import Literal, Sequence
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import Insert as PgInsert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import config
+from app.models.neuri.model import RewardDailyRollup, RewardEvent, RewardWeeklyRollup
+from app.models.neuri.schema import RewardEventCreate
+from app.repositories.after_commit import AfterCommit
+from app.repositories.base import (
+    BaseRepository,
+    ConstraintViolationError,
+    NotUniqueError,
+    Row,
+    managed_session,
+)
+
+logger = logging.getLogger(__name__)
+
+HistoryPeriod = Literal["day", "week"]
+
+_TOTALS = ("points", "tasks_done", "events")
+# Errors for which the database will never accept the event, e.g. its user was deleted before the flush
+_REJECTED = (IntegrityError, DataError, ConstraintViolationError, NotUniqueError)
+
+
+def week_start(day: date) -> date:
+    """The Monday starting the week of `day`"""
+    return day - timedelta(days=day.weekday())
+
+
+class RewardLedgerRepository(BaseRepository[RewardEvent, RewardEventCreate, RewardEventCreate]):
+    @property
+    def model(self) -> type[RewardEvent]:
+        return RewardEvent
+
+    async def append(self, session: AsyncSession, events: Sequence[RewardEventCreate]) -> None:
+        """Insert `events` into the ledger and add them to the daily and weekly rollups, in the same transaction"""
+        await self.bulk_insert(session, events)
+
+        daily: dict[tuple[UUID, date], list[int]] = {}
+        weekly: dict[tuple[UUID, date], list[int]] = {}
+        for reward_event in events:
+            day = reward_event.created_at.date()
+            for rollup, start in ((daily, day), (weekly, week_start(day))):
+                totals = rollup.setdefault((reward_event.user_id, start), [0, 0, 0])
+                totals[0] += reward_event.points
+                totals[1] += reward_event.tasks_done
+                totals[2] += 1
+
+        await session.execute(_rollup_upsert(RewardDailyRollup, "day", daily))
+        await session.execute(_rollup_upsert(RewardWeeklyRollup, "week_start", weekly))
+
+    async def list_rollups(
+        self, session: AsyncSession, user_id: UUID, period: HistoryPeriod, since: date, until: date
+    ) -> list[Row]:
+        """Rollup rows of one user with a period starting between `since` and `until` (inclusive), oldest first"""
+        model = RewardDailyRollup if period == "day" else RewardWeeklyRollup
+        start = RewardDailyRollup.day if period == "day" else RewardWeeklyRollup.week_start
+        stmt = (
+            select(start.label("period_start"), model.points, model.tasks_done, model.events)
+            .where(model.user_id == user_id, start >= since, start <= until)
+            .order_by(start)
+        )
+        result = await session.execute(stmt)
+        keys = list(result.keys())
+        return [dict(zip(keys, row)) for row in result.all()]
+
+
+def _rollup_upsert(
+    model: type[RewardDailyRollup] | type[RewardWeeklyRollup], period: str, totals: dict[tuple[UUID, date], list[int]]
+) -> PgInsert:
+    # Sorted so concurrent writers lock rollup rows in the same order and can't deadlock
+    rows = [
+        {"user_id": user_id, period: start, **dict(zip(_TOTALS, values))}
+        for (user_id, start), values in sorted(totals.items())
+    ]
+    query = pg_insert(model).values(rows)
+    return query.on_conflict_do_update(
+        index_elements=["user_id", period],
+        set_={name: getattr(model, name) + getattr(query.excluded, name) for name in _TOTALS},
+    )
+
+
+class RewardLedger:
+    """
+    Buffers reward events from committed transactions and appends them to the ledger in batches, so requests
+    don't wait on the ledger and rollup writes. Started with the app (see `run`).
+    Events still buffered when the process dies are lost, the counters on Reward remain the source of truth.
+    """
+
+    def __init__(self, batch_size: int, flush_seconds: float, max_pending: int, max_retries: int) -> None:
+        self._batch_size = batch_size
+        self._flush_seconds = flush_seconds
+        self._max_pending = max_pending
+        self._max_retries = max_retries
+        # Consecutive failed writes of the batch at the front of the buffer
+        self._failures = 0
+        self._events: deque[RewardEventCreate] = deque()
+        self._batch_ready = asyncio.Event()
+        self._repo = RewardLedgerRepository()
+
+    def add(self, events: Sequence[RewardEventCreate]) -> None:
+        self._events.extend(events)
+        overflow = len(self._events) - self._max_pending
+        if overflow > 0:
+            logger.warning("Reward ledger is %d events behind, dropping the oldest %d", len(self._events), overflow)
+            for _ in range(overflow):
+                self._events.popleft()
+        if len(self._events) >= self._batch_size:
+            self._batch_ready.set()
+
+    async def flush(self) -> None:
+        """
+        Write every buffered event, one transaction per batch. A failed batch is kept for the next flush. Once it
+        has failed `max_retries` times its events are written one by one, and those the database rejects are dropped
+        so they can't hold up the events behind them.
+        """
+        while self._events:
+            batch = [self._events.popleft() for _ in range(min(self._batch_size, len(self._events)))]
+            try:
+                if self._failures < self._max_retries:
+                    async with managed_session() as session:
+                        await self._repo.append(session, batch)
+                else:
+                    await self._write_one_by_one(batch)
+            except Exception:
+                self._failures += 1
+                logger.exception("Failed to write %d reward events, retrying on the next flush", len(batch))
+                self._events.extendleft(reversed(batch))
+                return
+            except asyncio.CancelledError:
+                # Keep it for the final flush on shutdown
+                self._events.extendleft(reversed(batch))
+                raise
+            self._failures = 0
+
+    async def _write_one_by_one(self, batch: list[RewardEventCreate]) -> None:
+        """
+        Write each event in its own transaction and drop the ones the database rejects. Any other error (the
+        database being unavailable, say) propagates with the unwritten events left at the front of `batch`.
+        """
+        while batch:
+            try:
+                async with managed_session() as session:
+                    await self._repo.append(session, batch[:1])
+            except _REJECTED:
+                logger.exception("Dropping reward event rejected by the database: %r", batch[0])
+            del batch[0]
+
+    async def run(self) -> None:
+        """Flush when a batch is full or every `flush_seconds`, until cancelled"""
+        while True:
+            try:
+                await asyncio.wait_for(self._batch_ready.wait(), self._flush_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._batch_ready.clear()
+            await self.flush()
+
+
+reward_ledger = RewardLedger(
+    batch_size=config.REWARD_LEDGER_BATCH_SIZE,
+    flush_seconds=config.REWARD_LEDGER_FLUSH_SECONDS,
+    max_pending=config.REWARD_LEDGER_MAX_PENDING,
+    max_retries=config.REWARD_LEDGER_MAX_RETRIES,
+)
+
+
+_reward_events = AfterCommit[RewardEventCreate]("reward_events", reward_ledger.add)
+
+
+def record_reward_events(session: AsyncSession, *events: RewardEventCreate) -> None:
+    """Queue `events` for the ledger once `session` commits, they are dropped if it rolls back"""
+    _reward_events.record(session, *events)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Sequence
+from typing import AsyncIterator
 from uuid import UUID
 from datetime import datetime, timedelta
 import json
@@ -10,7 +10,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.neuri.model import Routine
 from app.models.neuri.schema import RoutineCreate, RoutineUpdate, GeneratedTask
-from app.repositories.base import BaseRepository
+from app.repositories.base import BaseRepository, Page, PageParams
 
 
 class RoutineRepository(BaseRepository[Routine, RoutineCreate, RoutineUpdate]):
@@ -18,17 +18,26 @@ class RoutineRepository(BaseRepository[Routine, RoutineCreate, RoutineUpdate]):
     def model(self) -> type[Routine]:
         return Routine
 
-    async def list_by_user(self, session: AsyncSession, user_id: UUID) -> Sequence[Routine]:
+    async def list_by_user(self, session: AsyncSession, user_id: UUID, page: PageParams | None = None) -> Page[Routine]:
         stmt = select(Routine).where(Routine.user_id == user_id)
-        return await self.list(session, stmt)
+        return await self.list_page(session, stmt, page)
 
-    async def list_by_category(self, session: AsyncSession, user_id: UUID, category_id: UUID) -> Sequence[Routine]:
+    def stream_by_user(self, session: AsyncSession, user_id: UUID) -> AsyncIterator[Routine]:
+        stmt = select(Routine).where(Routine.user_id == user_id).order_by(Routine.created_at, Routine.id)
+        return self.stream(session, stmt)
+
+    async def list_by_category(
+        self, session: AsyncSession, user_id: UUID, category_id: UUID, page: PageParams | None = None
+    ) -> Page[Routine]:
         stmt = select(Routine).where(Routine.user_id == user_id, Routine.category_id == category_id)
-        return await self.list(session, stmt)
+        return await self.list_page(session, stmt, page)
+
+    async def count_by_user(self, session: AsyncSession, user_id: UUID) -> int:
+        stmt = select(Routine).where(Routine.user_id == user_id)
+        return await self.count(session, stmt)
 
     async def get_routine_by_id(self, session: AsyncSession, routine_id: UUID) -> Routine:
-        stmt = select(Routine).filter_by(id=routine_id)
-        return await self.get(session, stmt)
+        return await self.get_by_uuid(session, routine_id)
 
     async def get_by_title_and_user(self, session: AsyncSession, title: str, user_id: UUID) -> Routine | None:
         stmt = select(Routine).where(Routine.title == title, Routine.user_id == user_id)
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import time
+from bisect import bisect_left, insort
+from dataclasses import dataclass, field
+from typing import Literal
+from uuid import UUID
+
+from sqlalchemy import bindparam, literal_column, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import config
+from app.models import Category, Mission
+from app.repositories.after_commit import AfterCommit
+from app.repositories.user_index import UserIndexCache
+
+TitleKind = Literal["mission", "category"]
+
+# Keys start at each of the first words of a title and are cut to a fixed length, so a long title costs a bounded
+# number of bounded entries. Prefixes are cut the same way.
+_MAX_WORD_STARTS = 6
+_KEY_LENGTH = 48
+
+TITLES_STMT = union_all(
+    select(literal_column("'mission'").label("kind"), Mission.id, Mission.title).where(
+        Mission.user_id == bindparam("user_id")
+    ),
+    select(literal_column("'category'"), Category.id, Category.name).where(Category.user_id == bindparam("user_id")),
+)
+
+
+@dataclass(frozen=True)
+class TitleChange:
+    """A mission or category of `user_id` was saved with `title` or, with `title` None, deleted"""
+
+    user_id: UUID | None
+    kind: TitleKind
+    item_id: UUID
+    title: str | None = None
+
+
+def normalize(text: str) -> str:
+    """Case-folded, with runs of whitespace collapsed to one space"""
+    return " ".join(text.casefold().split())
+
+
+def _keys(title: str) -> set[str]:
+    words = normalize(title).split(" ")
+    return {" ".join(words[i:])[:_KEY_LENGTH] for i in range(min(len(words), _MAX_WORD_STARTS))}
+
+
+@dataclass
+class TitleIndex:
+    """
+    Sorted (key, kind, id) entries of one user's mission and category titles, for prefix lookups with bisect.
+    Every word of a title starts a key (the rest of the title from that word), so "dent" suggests "Call the dentist".
+    """
+
+    _entries: list[tuple[str, TitleKind, UUID]] = field(default_factory=list)
+    _titles: dict[tuple[TitleKind, UUID], str] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def put(self, kind: TitleKind, item_id: UUID, title: str) -> None:
+        """Add or replace a title"""
+        self.discard(kind, item_id)
+        self._titles[(kind, item_id)] = title
+        for key in _keys(title):
+            insort(self._entries, (key, kind, item_id))
+
+    def discard(self, kind: TitleKind, item_id: UUID) -> None:
+        title = self._titles.pop((kind, item_id), None)
+        if title is None:
+            return
+        for key in _keys(title):
+            entry = (key, kind, item_id)
+            i = bisect_left(self._entries, entry)
+            if i < len(self._entries) and self._entries[i] == entry:
+                del self._entries[i]
+
+    def suggest(self, prefix: str, limit: int) -> list[tuple[TitleKind, UUID, str]]:
+        """Up to `limit` titles with a word starting with `prefix`, in key order"""
+        prefix = normalize(prefix)[:_KEY_LENGTH]
+        if not prefix:
+            return []
+
+        found: dict[tuple[TitleKind, UUID], str] = {}
+        for i in range(bisect_left(self._entries, (prefix,)), len(self._entries)):
+            key, kind, item_id = self._entries[i]
+            if not key.startswith(prefix):
+                break
+            found.setdefault((kind, item_id), self._titles[(kind, item_id)])
+            if len(found) == limit:
+                break
+        return [(kind, item_id, title) for (kind, item_id), title in found.items()]
+
+
+class TitleIndexCache(UserIndexCache[TitleIndex, TitleChange]):
+    """
+    Per-user TitleIndex objects of this worker (see UserIndexCache), kept up to date with the changes recorded
+    by `record_title_changes`. Indexes unused for `idle_seconds` are dropped, and past `max_entries` entries in total
+    the least recently used go first.
+    """
+
+    def __init__(self, max_entries: int, idle_seconds: float, ttl_seconds: float) -> None:
+        super().__init__(ttl_seconds)
+        self._max_entries = max_entries
+        self._idle_seconds = idle_seconds
+
+    async def _load(self, session: AsyncSession, user_id: UUID) -> TitleIndex:
+        index = TitleIndex()
+        result = await session.execute(TITLES_STMT, {"user_id": user_id})
+        for kind, item_id, title in result:
+            index.put(kind, item_id, title)
+        return index
+
+    def _apply_change(self, index: TitleIndex, change: TitleChange) -> None:
+        if change.title is None:
+            index.discard(change.kind, change.item_id)
+        else:
+            index.put(change.kind, change.item_id, change.title)
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        while self._entries:
+            user_id, entry = next(iter(self._entries.items()))
+            if now - entry.last_used <= self._idle_seconds:
+                break
+            del self._entries[user_id]
+
+        total = sum(len(entry.index) for entry in self._entries.values())
+        # The most recently used index stays even when it alone is over the cap
+        while total > self._max_entries and len(self._entries) > 1:
+            _, entry = self._entries.popitem(last=False)
+            total -= len(entry.index)
+
+
+title_indexes = TitleIndexCache(
+    max_entries=config.TYPEAHEAD_MAX_ENTRIES,
+    idle_seconds=config.TYPEAHEAD_IDLE_SECONDS,
+    ttl_seconds=config.TYPEAHEAD_TTL_SECONDS,
+)
+_title_changes = AfterCommit[TitleChange]("title_changes", title_indexes.apply)
+
+
+def record_title_changes(session: AsyncSession, *changes: TitleChange) -> None:
+    """Apply `changes` to the cached title indexes once `session` commits, they are dropped if it rolls back"""
+    _title_changes.record(session, *changes)
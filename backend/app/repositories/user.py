@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Sequence
+from typing import AsyncIterator, Sequence
 from uuid import UUID
 
 from sqlalchemy import select
@@ -24,6 +24,9 @@ class UserRepository(BaseRepository[User, UserCreate, UserUpdate]):
         stmt = select(User)
         return await self.list(session, stmt)
 
+    def stream_users(self, session: AsyncSession) -> AsyncIterator[User]:
+        stmt = select(User).order_by(User.created_at, User.id)
+        return self.stream(session, stmt)
+
     async def get_user_by_id(self, session: AsyncSession, user_id: UUID) -> User:
-        stmt = select(User).filter_by(id=user_id)
-        return await self.get(session, stmt)
+        return await self.get_by_uuid(session, user_id)
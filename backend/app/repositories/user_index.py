@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Generic, Protocol, Sequence, TypeVar
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class UserChange(Protocol):
+    """A change to one user's data, or to an unknown user's when `user_id` is None"""
+
+    @property
+    def user_id(self) -> UUID | None: ...
+
+
+Index = TypeVar("Index")
+Change = TypeVar("Change", bound=UserChange)
+
+
+@dataclass
+class IndexEntry(Generic[Index]):
+    index: Index
+    built_at: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class _BuildLock:
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    # Coroutines holding or waiting for the lock, it is dropped once none are left
+    users: int = 0
+
+
+class UserIndexCache(ABC, Generic[Index, Change]):
+    """
+    Per-user in-memory indexes of this worker. An index is built with `_load` on first use (one build per user at
+    a time) and kept up to date with `apply`, which subclasses feed the changes of committed transactions.
+    An index is rebuilt once older than `ttl_seconds`, which also picks up changes made through other workers.
+    Subclasses bound memory in `_evict`, called after every `get`.
+    """
+
+    def __init__(self, ttl_seconds: float) -> None:
+        self._ttl_seconds = ttl_seconds
+        # Least recently used first
+        self._entries: OrderedDict[UUID, IndexEntry[Index]] = OrderedDict()
+        self._locks: dict[UUID, _BuildLock] = {}
+        # Changes that arrive while an index is being built, replayed once it is
+        self._building: dict[UUID, list[Change]] = {}
+
+    @abstractmethod
+    async def _load(self, session: AsyncSession, user_id: UUID) -> Index:
+        """Build a user's index from the database"""
+
+    @abstractmethod
+    def _apply_change(self, index: Index, change: Change) -> None: ...
+
+    def _evict(self) -> None:
+        """Drop entries to stay within the cache's limits, the most recently used entry is last"""
+
+    async def get(self, session: AsyncSession, user_id: UUID) -> Index:
+        entry = self._cached(user_id)
+        if entry is None:
+            build_lock = self._locks.setdefault(user_id, _BuildLock())
+            build_lock.users += 1
+            try:
+                async with build_lock.lock:
+                    entry = self._cached(user_id)
+                    if entry is None:
+                        entry = await self._build(session, user_id)
+            finally:
+                build_lock.users -= 1
+                if build_lock.users == 0:
+                    del self._locks[user_id]
+
+        entry.last_used = time.monotonic()
+        self._evict()
+        return entry.index
+
+    def apply(self, changes: Sequence[Change]) -> None:
+        for change in changes:
+            # A delete doesn't always know the owner, it then goes to every index
+            if change.user_id is None:
+                indexes = [entry.index for entry in self._entries.values()]
+                pending = list(self._building.values())
+            else:
+                entry = self._entries.get(change.user_id)
+                indexes = [entry.index] if entry is not None else []
+                pending = [self._building[change.user_id]] if change.user_id in self._building else []
+            for index in indexes:
+                self._apply_change(index, change)
+            for queue in pending:
+                queue.append(change)
+
+    def _cached(self, user_id: UUID) -> IndexEntry[Index] | None:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        if time.monotonic() - entry.built_at > self._ttl_seconds:
+            del self._entries[user_id]
+            return None
+        self._entries.move_to_end(user_id)
+        return entry
+
+    async def _build(self, session: AsyncSession, user_id: UUID) -> IndexEntry[Index]:
+        self._building[user_id] = []
+        try:
+            entry = IndexEntry(await self._load(session, user_id))
+            for change in self._building[user_id]:
+                self._apply_change(entry.index, change)
+        finally:
+            del self._building[user_id]
+
+        self._entries[user_id] = entry
+        return entry
@@ -1,8 +1,14 @@
-from typing import Generic, Sequence, TypeVar
+from typing import AsyncIterable, AsyncIterator, Generic, Sequence, TypeVar
 
+from fastapi import Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 T = TypeVar("T")
+Schema = TypeVar("Schema", bound=BaseModel)
+
+JSON_MEDIA_TYPE = "application/json"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
 
 
 class SuccessResponse(BaseModel, Generic[T]):
@@ -12,3 +18,34 @@ class SuccessResponse(BaseModel, Generic[T]):
 class SuccessListResponse(BaseModel, Generic[T]):
     data: list[T] | Sequence[T] | None = None
     meta: dict[str, int | str | bool] | None = None
+
+
+def ndjson_response(rows: AsyncIterable[BaseModel], lines_per_chunk: int = 100) -> StreamingResponse:
+    """Serialize rows as newline-delimited JSON, writing `lines_per_chunk` rows per body chunk"""
+
+    async def body() -> AsyncIterator[bytes]:
+        buffer: list[bytes] = []
+        async for row in rows:
+            buffer.append(row.model_dump_json().encode())
+            if len(buffer) >= lines_per_chunk:
+                yield b"\n".join(buffer) + b"\n"
+                buffer.clear()
+        if buffer:
+            yield b"\n".join(buffer) + b"\n"
+
+    return StreamingResponse(body(), media_type=NDJSON_MEDIA_TYPE)
+
+
+def trusted_list_response(
+    item_type: type[Schema],
+    items: Sequence[Schema],
+    meta: dict[str, int | str | bool] | None = None,
+    exclude_unset: bool = False,
+) -> Response:
+    """
+    Serialize already-built items straight to JSON.
+    Returning a Response skips FastAPI's response_model handling, which would dump and re-validate every item;
+    keep response_model on the route so the OpenAPI schema is unchanged.
+    """
+    payload = SuccessListResponse[item_type].model_construct(data=items, meta=meta)  # type: ignore[valid-type]
+    return Response(content=payload.model_dump_json(exclude_unset=exclude_unset), media_type=JSON_MEDIA_TYPE)
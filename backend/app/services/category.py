@@ -6,8 +6,9 @@ from uuid import UUID
 from fastapi import Depends
 
 from app.models.neuri.schema import CategoryCreate, CategoryRead, CategoryUpdate
-from app.repositories.base import AsyncSession
+from app.repositories.base import AsyncSession, Page, PageParams
 from app.repositories.category import CategoryRepository
+from app.repositories.title_index import TitleChange, record_title_changes
 
 
 class CategoryService:
@@ -20,6 +21,7 @@ class CategoryService:
         """Create a new category"""
         data = CategoryCreate(name=name, user_id=user_id)
         category = await self.category_repo.create(session, data)
+        record_title_changes(session, TitleChange(category.user_id, "category", category.id, category.name))
         return CategoryRead.model_validate(category)
 
     async def get_category(self, session: AsyncSession, category_id: UUID) -> CategoryRead:
@@ -27,19 +29,27 @@ class CategoryService:
         category = await self.category_repo.get_category_by_id(session, category_id)
         return CategoryRead.model_validate(category)
 
-    async def list_user_categories(self, session: AsyncSession, user_id: UUID) -> Sequence[CategoryRead]:
-        """List categories for a user"""
-        categories = await self.category_repo.list_by_user(session, user_id)
+    async def get_categories(self, session: AsyncSession, category_ids: Sequence[UUID]) -> Sequence[CategoryRead]:
+        """Get several categories by ID in one query"""
+        categories = await self.category_repo.get_many_by_uuid(session, category_ids)
         return [CategoryRead.model_validate(category) for category in categories]
 
+    async def list_user_categories(self, session: AsyncSession, user_id: UUID, page: PageParams | None = None) -> Page[CategoryRead]:
+        """List categories for a user"""
+        categories = await self.category_repo.list_by_user(session, user_id, page)
+        return categories.map(CategoryRead.model_validate)
+
     async def update_category(self, session: AsyncSession, category_id: UUID, data: CategoryUpdate) -> CategoryRead:
         """Update category"""
         category = await self.category_repo.update_by_uuid(session, category_id, data)
+        if data.name is not None:
+            record_title_changes(session, TitleChange(category.user_id, "category", category.id, category.name))
         return CategoryRead.model_validate(category)
 
     async def delete_category(self, session: AsyncSession, category_id: UUID) -> None:
         """Delete category"""
         await self.category_repo.delete_by_uuid(session, category_id)
+        record_title_changes(session, TitleChange(None, "category", category_id))
 
     async def get_or_create_category(self, session: AsyncSession, user_id: UUID, name: str) -> CategoryRead:
         """Get existing category or create new one"""
@@ -1,16 +1,31 @@
 from __future__ import annotations
 
-from typing import Sequence
+from typing import AsyncIterator, Mapping, Sequence
 from uuid import UUID
 from datetime import datetime
 
 from fastapi import Depends
+from pydantic import TypeAdapter
 
 from app.models.neuri.model import MissionType
-from app.models.neuri.schema import MissionCreate, MissionRead, MissionUpdate, MissionWithRelationsRead
-from app.repositories.base import AsyncSession
-from app.repositories.mission import MissionRepository
-from app.repositories.reward import RewardRepository
+from app.models.neuri.schema import (
+    MissionCreate,
+    MissionRead,
+    MissionUpdate,
+    MissionWithRelationsRead,
+    RelatedNoteRead,
+    TypeaheadSuggestion,
+)
+from app.repositories.base import AsyncSession, Page, PageParams, ReadFanOut
+from app.repositories.mission import MissionRepository, assemble_tree
+from app.repositories.note_index import NoteChange, note_indexes, note_text, record_note_changes, written_note
+from app.repositories.reward import RewardRepository, mission_points
+from app.repositories.title_index import TitleChange, record_title_changes, title_indexes
+
+
+# Built once: validating a whole page of rows in one call keeps the per-row work inside pydantic-core.
+# Projected rows only carry their selected columns, so the rest stay unset in the response.
+MISSION_LIST_ADAPTER = TypeAdapter(list[MissionRead])
 
 
 class MissionService:
@@ -27,16 +42,12 @@ class MissionService:
 
     async def create_mission(self, session: AsyncSession, data: MissionCreate) -> MissionRead:
         """Create a new mission"""
-        mission = await self.mission_repo.create(session, data)
-        
-        # Add points to user's reward
-        await self.reward_repo.add_points_for_mission(
-            session, 
-            data.user_id, 
-            data.type.value,
-            is_subtask=data.parent_project_id is not None
-        )
-        
+        # The insert and the reward points go out as one statement, the voice agent waits on this round-trip
+        points = mission_points(data.type.value, is_subtask=data.parent_project_id is not None)
+        mission = await self.mission_repo.create_with_points(session, data, points)
+        record_title_changes(session, TitleChange(mission.user_id, "mission", mission.id, mission.title))
+        if mission.type == MissionType.NOTE:
+            record_note_changes(session, written_note(mission))
         return MissionRead.model_validate(mission)
 
     async def get_mission(self, session: AsyncSession, mission_id: UUID) -> MissionRead:
@@ -44,85 +55,181 @@ class MissionService:
         mission = await self.mission_repo.get_mission_by_id(session, mission_id)
         return MissionRead.model_validate(mission)
 
-    async def list_user_missions(self, session: AsyncSession, user_id: UUID) -> Sequence[MissionRead]:
-        """List missions for a user"""
-        missions = await self.mission_repo.list_by_user(session, user_id)
+    async def get_mission_with_relations(self, reads: ReadFanOut, mission_id: UUID) -> MissionWithRelationsRead:
+        """Get a mission with its category, parent project and routine, and its whole sub-task tree"""
+        missions, parent_project = await reads.gather(
+            lambda session: self.mission_repo.list_tree(session, mission_id),
+            lambda session: self.mission_repo.get_parent_project(session, mission_id),
+        )
+        return MissionWithRelationsRead.model_validate(assemble_tree(missions, mission_id, parent_project))
+
+    async def get_missions(self, session: AsyncSession, mission_ids: Sequence[UUID]) -> Sequence[MissionRead]:
+        """Get several missions by ID in one query"""
+        missions = await self.mission_repo.get_many_by_uuid(session, mission_ids)
         return [MissionRead.model_validate(mission) for mission in missions]
 
-    async def list_category_missions(self, session: AsyncSession, user_id: UUID, category_id: UUID) -> Sequence[MissionRead]:
+    async def list_user_missions(
+        self, session: AsyncSession, user_id: UUID, page: PageParams | None = None, fields: str | None = None
+    ) -> Page[MissionRead]:
+        """List missions for a user"""
+        columns = self.mission_repo.resolve_fields(fields)
+        missions = await self.mission_repo.list_by_user(session, user_id, page, columns)
+        return missions.map_items(MISSION_LIST_ADAPTER.validate_python)
+
+    async def stream_user_missions(self, session: AsyncSession, user_id: UUID) -> AsyncIterator[MissionRead]:
+        """Stream missions for a user without loading the whole list"""
+        async for mission in self.mission_repo.stream_by_user(session, user_id):
+            yield MissionRead.model_validate(mission)
+
+    async def list_category_missions(
+        self,
+        session: AsyncSession,
+        user_id: UUID,
+        category_id: UUID,
+        page: PageParams | None = None,
+        fields: str | None = None,
+    ) -> Page[MissionRead]:
         """List missions in a category"""
-        missions = await self.mission_repo.list_by_category(session, user_id, category_id)
-        return [MissionRead.model_validate(mission) for mission in missions]
+        columns = self.mission_repo.resolve_fields(fields)
+        missions = await self.mission_repo.list_by_category(session, user_id, category_id, page, columns)
+        return missions.map_items(MISSION_LIST_ADAPTER.validate_python)
 
-    async def list_type_missions(self, session: AsyncSession, user_id: UUID, mission_type: MissionType) -> Sequence[MissionRead]:
+    async def list_type_missions(
+        self,
+        session: AsyncSession,
+        user_id: UUID,
+        mission_type: MissionType,
+        page: PageParams | None = None,
+        fields: str | None = None,
+    ) -> Page[MissionRead]:
         """List missions by type"""
-        missions = await self.mission_repo.list_by_type(session, user_id, mission_type)
-        return [MissionRead.model_validate(mission) for mission in missions]
+        columns = self.mission_repo.resolve_fields(fields)
+        missions = await self.mission_repo.list_by_type(session, user_id, mission_type, page, columns)
+        return missions.map_items(MISSION_LIST_ADAPTER.validate_python)
 
-    async def list_sub_tasks(self, session: AsyncSession, user_id: UUID, parent_project_id: UUID) -> Sequence[MissionRead]:
+    async def list_sub_tasks(
+        self,
+        session: AsyncSession,
+        user_id: UUID,
+        parent_project_id: UUID,
+        page: PageParams | None = None,
+        fields: str | None = None,
+    ) -> Page[MissionRead]:
         """List sub-tasks of a project"""
-        missions = await self.mission_repo.list_sub_tasks(session, user_id, parent_project_id)
-        return [MissionRead.model_validate(mission) for mission in missions]
+        columns = self.mission_repo.resolve_fields(fields)
+        missions = await self.mission_repo.list_sub_tasks(session, user_id, parent_project_id, page, columns)
+        return missions.map_items(MISSION_LIST_ADAPTER.validate_python)
 
-    async def list_routine_generated_missions(self, session: AsyncSession, user_id: UUID, routine_id: UUID) -> Sequence[MissionRead]:
+    async def list_routine_generated_missions(
+        self,
+        session: AsyncSession,
+        user_id: UUID,
+        routine_id: UUID,
+        page: PageParams | None = None,
+        fields: str | None = None,
+    ) -> Page[MissionRead]:
         """List missions generated by a routine"""
-        missions = await self.mission_repo.list_generated_by_routine(session, user_id, routine_id)
-        return [MissionRead.model_validate(mission) for mission in missions]
+        columns = self.mission_repo.resolve_fields(fields)
+        missions = await self.mission_repo.list_generated_by_routine(session, user_id, routine_id, page, columns)
+        return missions.map_items(MISSION_LIST_ADAPTER.validate_python)
 
-    async def list_today_missions(self, session: AsyncSession, user_id: UUID) -> Sequence[MissionRead]:
+    async def list_today_missions(
+        self, session: AsyncSession, user_id: UUID, page: PageParams | None = None, fields: str | None = None
+    ) -> Page[MissionRead]:
         """Get missions due today - ADHD focus"""
-        missions = await self.mission_repo.get_today_missions(session, user_id)
-        return [MissionRead.model_validate(mission) for mission in missions]
+        columns = self.mission_repo.resolve_fields(fields)
+        missions = await self.mission_repo.get_today_missions(session, user_id, page, columns)
+        return missions.map_items(MISSION_LIST_ADAPTER.validate_python)
 
-    async def list_overdue_missions(self, session: AsyncSession, user_id: UUID) -> Sequence[MissionRead]:
+    async def list_overdue_missions(
+        self, session: AsyncSession, user_id: UUID, page: PageParams | None = None, fields: str | None = None
+    ) -> Page[MissionRead]:
         """Get overdue missions - ADHD urgency"""
-        missions = await self.mission_repo.get_overdue_missions(session, user_id)
-        return [MissionRead.model_validate(mission) for mission in missions]
+        columns = self.mission_repo.resolve_fields(fields)
+        missions = await self.mission_repo.get_overdue_missions(session, user_id, page, columns)
+        return missions.map_items(MISSION_LIST_ADAPTER.validate_python)
 
-    async def list_high_priority_missions(self, session: AsyncSession, user_id: UUID) -> Sequence[MissionRead]:
+    async def list_high_priority_missions(
+        self, session: AsyncSession, user_id: UUID, page: PageParams | None = None, fields: str | None = None
+    ) -> Page[MissionRead]:
         """Get high priority missions - ADHD focus"""
-        missions = await self.mission_repo.get_high_priority_missions(session, user_id)
-        return [MissionRead.model_validate(mission) for mission in missions]
+        columns = self.mission_repo.resolve_fields(fields)
+        missions = await self.mission_repo.get_high_priority_missions(session, user_id, page, columns)
+        return missions.map_items(MISSION_LIST_ADAPTER.validate_python)
 
-    async def list_heavy_missions(self, session: AsyncSession, user_id: UUID) -> Sequence[MissionRead]:
+    async def list_heavy_missions(
+        self, session: AsyncSession, user_id: UUID, page: PageParams | None = None, fields: str | None = None
+    ) -> Page[MissionRead]:
         """Get heavy missions that might need breaking down"""
-        missions = await self.mission_repo.get_heavy_missions(session, user_id)
-        return [MissionRead.model_validate(mission) for mission in missions]
+        columns = self.mission_repo.resolve_fields(fields)
+        missions = await self.mission_repo.get_heavy_missions(session, user_id, page, columns)
+        return missions.map_items(MISSION_LIST_ADAPTER.validate_python)
 
-    async def search_missions(self, session: AsyncSession, user_id: UUID, search_term: str) -> Sequence[MissionRead]:
-        """Search missions by title - ADHD context awareness"""
-        missions = await self.mission_repo.search_missions_by_title(session, user_id, search_term)
-        return [MissionRead.model_validate(mission) for mission in missions]
+    async def search_missions(
+        self,
+        session: AsyncSession,
+        user_id: UUID,
+        search_term: str,
+        page: PageParams | None = None,
+        fields: str | None = None,
+    ) -> Page[MissionRead]:
+        """Search missions by title and body, best match first. Results are always paginated."""
+        columns = self.mission_repo.resolve_fields(fields)
+        missions = await self.mission_repo.search(session, user_id, search_term, page or PageParams(), columns)
+        return missions.map_items(MISSION_LIST_ADAPTER.validate_python)
+
+    async def typeahead(self, session: AsyncSession, user_id: UUID, prefix: str, limit: int) -> list[TypeaheadSuggestion]:
+        """Missions and categories of a user with a title word starting with `prefix` (see TitleIndex)"""
+        index = await title_indexes.get(session, user_id)
+        return [
+            TypeaheadSuggestion(kind=kind, id=item_id, title=title)
+            for kind, item_id, title in index.suggest(prefix, limit)
+        ]
 
     async def update_mission(self, session: AsyncSession, mission_id: UUID, data: MissionUpdate) -> MissionRead:
         """Update mission"""
         mission = await self.mission_repo.update_by_uuid(session, mission_id, data)
+        if data.title is not None:
+            record_title_changes(session, TitleChange(mission.user_id, "mission", mission.id, mission.title))
+        if mission.type == MissionType.NOTE:
+            record_note_changes(session, written_note(mission))
+        elif data.type is not None:
+            # No longer a note
+            record_note_changes(session, NoteChange(mission.user_id, mission.id))
         return MissionRead.model_validate(mission)
 
     async def complete_mission(self, session: AsyncSession, mission_id: UUID) -> MissionRead:
         """Mark mission as complete and update rewards"""
-        mission = await self.mission_repo.get_mission_by_id(session, mission_id)
-        
-        # Update mission
-        update_data = MissionUpdate(is_complete=True)
-        updated_mission = await self.mission_repo.update_by_uuid(session, mission_id, update_data)
-        
-        # Increment tasks done counter
-        await self.reward_repo.increment_tasks_done(session, mission.user_id)
-        
-        return MissionRead.model_validate(updated_mission)
+        mission = await self.mission_repo.complete_with_reward(session, mission_id)
+        return MissionRead.model_validate(mission)
 
     async def delete_mission(self, session: AsyncSession, mission_id: UUID) -> None:
         """Delete mission"""
         await self.mission_repo.delete_by_uuid(session, mission_id)
+        record_note_changes(session, NoteChange(None, mission_id))
+        record_title_changes(session, TitleChange(None, "mission", mission_id))
+
+    async def get_related_notes(self, session: AsyncSession, mission_id: UUID, limit: int) -> list[RelatedNoteRead]:
+        """The owner's notes most similar to a mission's title and body, best first (see NoteIndex)"""
+        mission = await self.mission_repo.get_mission_by_id(session, mission_id)
+        index = await note_indexes.get(session, mission.user_id)
+        ranked = index.related(note_text(mission.title, mission.body), limit, exclude=mission.id)
+        if not ranked:
+            return []
+
+        notes = await self.mission_repo.get_many_by_uuid(session, [note_id for note_id, _ in ranked])
+        by_id = {note.id: note for note in notes}
+        return [
+            RelatedNoteRead(**MissionRead.model_validate(by_id[note_id]).model_dump(), score=score)
+            for note_id, score in ranked
+            if note_id in by_id
+        ]
 
     async def break_down_mission(self, session: AsyncSession, mission_id: UUID, subtask_titles: list[str]) -> Sequence[MissionRead]:
-        """Break down a heavy mission into smaller subtasks"""
+        """Break down a heavy mission into smaller subtasks, inserted and rewarded in one statement"""
         parent_mission = await self.mission_repo.get_mission_by_id(session, mission_id)
-        
-        subtasks = []
-        for title in subtask_titles:
-            subtask_data = MissionCreate(
+        subtasks_data = [
+            MissionCreate(
                 title=title,
                 type=MissionType.TASK,
                 user_id=parent_mission.user_id,
@@ -131,20 +238,25 @@ class MissionService:
                 priority=parent_mission.priority,
                 heaviness=1  # Subtasks are lighter
             )
-            subtask = await self.create_mission(session, subtask_data)
-            subtasks.append(subtask)
-        
-        return subtasks
-
-    async def get_context_for_ai(self, session: AsyncSession, user_id: UUID) -> dict:
-        """Get context for AI agent - recent missions, overdue, etc."""
-        recent_missions = await self.mission_repo.get_recent_missions(session, user_id, days=7)
-        overdue_missions = await self.mission_repo.get_overdue_missions(session, user_id)
-        today_missions = await self.mission_repo.get_today_missions(session, user_id)
-        
+            for title in subtask_titles
+        ]
+        points = mission_points(MissionType.TASK.value, is_subtask=True)
+        subtasks = await self.mission_repo.create_many_with_points(session, subtasks_data, points)
+        record_title_changes(
+            session, *[TitleChange(subtask.user_id, "mission", subtask.id, subtask.title) for subtask in subtasks]
+        )
+        return MISSION_LIST_ADAPTER.validate_python(subtasks)
+
+    async def get_context_for_ai(
+        self, session: AsyncSession, user_id: UUID, limits: Mapping[str, int | None] | None = None
+    ) -> dict:
+        """Get context for AI agent - recent missions, overdue, etc. `limits` caps the missions per section."""
+        context = await self.mission_repo.get_ai_context(session, user_id, days=7, limits=limits)
+        sections = context.sections
+
         return {
-            "recent_missions": [MissionRead.model_validate(m) for m in recent_missions],
-            "overdue_missions": [MissionRead.model_validate(m) for m in overdue_missions],
-            "today_missions": [MissionRead.model_validate(m) for m in today_missions],
-            "total_pending": len(await self.mission_repo.list_pending_by_user(session, user_id))
+            "recent_missions": MISSION_LIST_ADAPTER.validate_python(sections["recent"]),
+            "overdue_missions": MISSION_LIST_ADAPTER.validate_python(sections["overdue"]),
+            "today_missions": MISSION_LIST_ADAPTER.validate_python(sections["today"]),
+            **context.counts,
         }
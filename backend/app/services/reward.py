@@ -1,20 +1,36 @@
 from __future__ import annotations
 
-from typing import Sequence
+from datetime import date, timedelta
+from typing import AsyncIterator, Sequence
 from uuid import UUID
 
 from fastapi import Depends
+from pydantic import TypeAdapter
 
-from app.models.neuri.schema import RewardCreate, RewardRead, RewardUpdate
-from app.repositories.base import AsyncSession
-from app.repositories.reward import RewardRepository
+from app.errors import ValidationError
+from app.models.neuri.schema import LeaderboardEntry, PointsHistoryEntry, RewardCreate, RewardRead, RewardUpdate
+from app.repositories.base import AsyncSession, Page, PageParams
+from app.repositories.reward import LeaderboardMetric, RewardRepository
+from app.repositories.reward_ledger import HistoryPeriod, RewardLedgerRepository, week_start
+
+POINTS_HISTORY_ADAPTER = TypeAdapter(list[PointsHistoryEntry])
+LEADERBOARD_ADAPTER = TypeAdapter(list[LeaderboardEntry])
+# Range returned when the client doesn't give a start, ending at `until`
+DEFAULT_HISTORY_DAYS = 30
+DEFAULT_HISTORY_WEEKS = 12
 
 
 class RewardService:
     reward_repo: RewardRepository
+    ledger_repo: RewardLedgerRepository
 
-    def __init__(self, reward_repo: RewardRepository = Depends(RewardRepository)) -> None:
+    def __init__(
+        self,
+        reward_repo: RewardRepository = Depends(RewardRepository),
+        ledger_repo: RewardLedgerRepository = Depends(RewardLedgerRepository),
+    ) -> None:
         self.reward_repo = reward_repo
+        self.ledger_repo = ledger_repo
 
     async def create_reward(self, session: AsyncSession, data: RewardCreate) -> RewardRead:
         """Create a new reward record for user"""
@@ -23,11 +39,7 @@ class RewardService:
 
     async def get_user_reward(self, session: AsyncSession, user_id: UUID) -> RewardRead:
         """Get reward for a user"""
-        reward = await self.reward_repo.get_by_user(session, user_id)
-        if not reward:
-            # Create default reward if doesn't exist
-            reward_data = RewardCreate(user_id=user_id)
-            reward = await self.reward_repo.create(session, reward_data)
+        reward = await self.reward_repo.get_or_create_by_user(session, user_id)
         return RewardRead.model_validate(reward)
 
     async def get_reward(self, session: AsyncSession, reward_id: UUID) -> RewardRead:
@@ -40,6 +52,11 @@ class RewardService:
         rewards = await self.reward_repo.list_rewards(session)
         return [RewardRead.model_validate(reward) for reward in rewards]
 
+    async def stream_rewards(self, session: AsyncSession) -> AsyncIterator[RewardRead]:
+        """Stream all rewards without loading the whole list"""
+        async for reward in self.reward_repo.stream_rewards(session):
+            yield RewardRead.model_validate(reward)
+
     async def update_reward(self, session: AsyncSession, reward_id: UUID, data: RewardUpdate) -> RewardRead:
         """Update reward"""
         reward = await self.reward_repo.update_by_uuid(session, reward_id, data)
@@ -69,6 +86,52 @@ class RewardService:
         reward = await self.reward_repo.add_points_for_mission(session, user_id, mission_type, is_subtask)
         return RewardRead.model_validate(reward)
 
+    async def get_top_users(
+        self, session: AsyncSession, metric: LeaderboardMetric, limit: int
+    ) -> Sequence[LeaderboardEntry]:
+        """Best users by points or streak, always up to date"""
+        rows = await self.reward_repo.list_top(session, metric, limit)
+        return LEADERBOARD_ADAPTER.validate_python(rows)
+
+    async def get_leaderboard(
+        self, session: AsyncSession, metric: LeaderboardMetric, page: PageParams
+    ) -> Page[LeaderboardEntry]:
+        """Full ranking by points or streak, as of the last leaderboard refresh"""
+        rows = await self.reward_repo.list_leaderboard(session, metric, page)
+        return rows.map_items(LEADERBOARD_ADAPTER.validate_python)
+
+    async def get_user_rank(self, session: AsyncSession, user_id: UUID, metric: LeaderboardMetric) -> LeaderboardEntry:
+        """User's rank by points or streak, as of the last leaderboard refresh"""
+        row = await self.reward_repo.get_rank(session, user_id, metric)
+        return LeaderboardEntry.model_validate(row)
+
+    async def get_points_history(
+        self,
+        session: AsyncSession,
+        user_id: UUID,
+        period: HistoryPeriod,
+        since: date | None = None,
+        until: date | None = None,
+    ) -> Sequence[PointsHistoryEntry]:
+        """
+        Points and completed tasks per day or week, read from the ledger rollups.
+        Periods without reward events are left out.
+        """
+        until = until or date.today()
+        if since is None:
+            if period == "day":
+                since = until - timedelta(days=DEFAULT_HISTORY_DAYS - 1)
+            else:
+                since = until - timedelta(weeks=DEFAULT_HISTORY_WEEKS - 1)
+        if period == "week":
+            # Include the week that `since` falls in
+            since = week_start(since)
+        if since > until:
+            raise ValidationError("since must not be after until")
+
+        rows = await self.ledger_repo.list_rollups(session, user_id, period, since, until)
+        return POINTS_HISTORY_ADAPTER.validate_python(rows)
+
     async def get_dashboard_stats(self, session: AsyncSession, user_id: UUID) -> dict:
         """Get dashboard statistics for ADHD user"""
         reward = await self.get_user_reward(session, user_id)
@@ -1,13 +1,13 @@
 from __future__ import annotations
 
-from typing import Sequence
+from typing import AsyncIterator, Sequence
 from uuid import UUID
 import json
 
 from fastapi import Depends
 
 from app.models.neuri.schema import RoutineCreate, RoutineRead, RoutineUpdate, RoutineCreateWithSchedule, RoutineTaskGenerationResponse
-from app.repositories.base import AsyncSession
+from app.repositories.base import AsyncSession, Page, PageParams
 from app.repositories.routine import RoutineRepository
 
 
@@ -27,15 +27,25 @@ class RoutineService:
         routine = await self.routine_repo.get_routine_by_id(session, routine_id)
         return RoutineRead.model_validate(routine)
 
-    async def list_user_routines(self, session: AsyncSession, user_id: UUID) -> Sequence[RoutineRead]:
-        """List routines for a user"""
-        routines = await self.routine_repo.list_by_user(session, user_id)
+    async def get_routines(self, session: AsyncSession, routine_ids: Sequence[UUID]) -> Sequence[RoutineRead]:
+        """Get several routines by ID in one query"""
+        routines = await self.routine_repo.get_many_by_uuid(session, routine_ids)
         return [RoutineRead.model_validate(routine) for routine in routines]
 
-    async def list_category_routines(self, session: AsyncSession, user_id: UUID, category_id: UUID) -> Sequence[RoutineRead]:
+    async def list_user_routines(self, session: AsyncSession, user_id: UUID, page: PageParams | None = None) -> Page[RoutineRead]:
+        """List routines for a user"""
+        routines = await self.routine_repo.list_by_user(session, user_id, page)
+        return routines.map(RoutineRead.model_validate)
+
+    async def stream_user_routines(self, session: AsyncSession, user_id: UUID) -> AsyncIterator[RoutineRead]:
+        """Stream routines for a user without loading the whole list"""
+        async for routine in self.routine_repo.stream_by_user(session, user_id):
+            yield RoutineRead.model_validate(routine)
+
+    async def list_category_routines(self, session: AsyncSession, user_id: UUID, category_id: UUID, page: PageParams | None = None) -> Page[RoutineRead]:
         """List routines in a category"""
-        routines = await self.routine_repo.list_by_category(session, user_id, category_id)
-        return [RoutineRead.model_validate(routine) for routine in routines]
+        routines = await self.routine_repo.list_by_category(session, user_id, category_id, page)
+        return routines.map(RoutineRead.model_validate)
 
     async def update_routine(self, session: AsyncSession, routine_id: UUID, data: RoutineUpdate) -> RoutineRead:
         """Update routine"""
@@ -78,7 +88,7 @@ class RoutineService:
         routines = await self.routine_repo.list_by_user(session, user_id)
         day_routines = []
         
-        for routine in routines:
+        for routine in routines.items:
             routine_read = RoutineRead.model_validate(routine)
             schedule_items = await self.parse_schedule(routine_read)
             
@@ -94,7 +104,7 @@ class RoutineService:
         # Get the routine
         routine = await self.get_routine(session, routine_id)
         
-        # Generate tasks using repository method
+        # Generate tasks using repository method (the routine is served from the session identity map)
         generated_tasks = await self.routine_repo.generate_tasks_for_days(session, routine_id, days)
         
         return RoutineTaskGenerationResponse(
@@ -1,20 +1,39 @@
 from __future__ import annotations
 
-from typing import Sequence
+from typing import AsyncIterator, Sequence
 from uuid import UUID
 
 from fastapi import Depends
 
-from app.models.neuri.schema import UserCreate, UserRead, UserUpdate
-from app.repositories.base import AsyncSession
+from app.models.neuri.schema import RewardRead, UserCreate, UserDashboardRead, UserRead, UserUpdate
+from app.repositories.base import AsyncSession, ReadFanOut
+from app.repositories.category import CategoryRepository
+from app.repositories.mission import MissionRepository
+from app.repositories.reward import RewardRepository
+from app.repositories.routine import RoutineRepository
 from app.repositories.user import UserRepository
 
 
 class UserService:
     user_repo: UserRepository
+    mission_repo: MissionRepository
+    reward_repo: RewardRepository
+    category_repo: CategoryRepository
+    routine_repo: RoutineRepository
 
-    def __init__(self, user_repo: UserRepository = Depends(UserRepository)) -> None:
+    def __init__(
+        self,
+        user_repo: UserRepository = Depends(UserRepository),
+        mission_repo: MissionRepository = Depends(MissionRepository),
+        reward_repo: RewardRepository = Depends(RewardRepository),
+        category_repo: CategoryRepository = Depends(CategoryRepository),
+        routine_repo: RoutineRepository = Depends(RoutineRepository),
+    ) -> None:
         self.user_repo = user_repo
+        self.mission_repo = mission_repo
+        self.reward_repo = reward_repo
+        self.category_repo = category_repo
+        self.routine_repo = routine_repo
 
     async def create_user(self, session: AsyncSession, data: UserCreate) -> UserRead:
         """Create a new user"""
@@ -38,6 +57,31 @@ class UserService:
         users = await self.user_repo.list_users(session)
         return [UserRead.model_validate(user) for user in users]
 
+    async def stream_users(self, session: AsyncSession) -> AsyncIterator[UserRead]:
+        """Stream all users without loading the whole list"""
+        async for user in self.user_repo.stream_users(session):
+            yield UserRead.model_validate(user)
+
+    async def get_dashboard(self, reads: ReadFanOut, user_id: UUID) -> UserDashboardRead:
+        """User dashboard, its independent queries run concurrently"""
+        user, reward, missions, total_categories, total_routines = await reads.gather(
+            lambda session: self.user_repo.get_user_by_id(session, user_id),
+            lambda session: self.reward_repo.get_by_user(session, user_id),
+            lambda session: self.mission_repo.count_by_status(session, user_id),
+            lambda session: self.category_repo.count_by_user(session, user_id),
+            lambda session: self.routine_repo.count_by_user(session, user_id),
+        )
+        return UserDashboardRead(
+            user=UserRead.model_validate(user),
+            reward=RewardRead.model_validate(reward) if reward else None,
+            total_missions=missions["total"],
+            completed_missions=missions["completed"],
+            pending_missions=missions["pending"],
+            total_categories=total_categories,
+            total_routines=total_routines,
+            current_streak=reward.streak if reward else 0,
+        )
+
     async def update_user(self, session: AsyncSession, user_id: UUID, data: UserUpdate) -> UserRead:
         """Update user"""
         user = await self.user_repo.update_by_uuid(session, user_id, data)
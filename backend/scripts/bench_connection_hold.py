@@ -0,0 +1,157 @@
+"""
+Measure how long each request keeps its pooled connection checked out, before and after SessionReleasingRoute.
+
+Before: a plain APIRoute, the session dependency commits and closes after FastAPI has validated and serialized the
+response, so the connection is held through that CPU work.
+After: SessionReleasingRoute commits and closes the session as soon as the endpoint returns.
+
+Both routes return the same mission list through response_model validation and GZip, against the same database.
+Hold time is measured from pool checkout to checkin. The wall time is for concurrent requests sharing a small pool,
+where a held connection makes the next request wait.
+
+Needs an async driver for the database url, the default is a temporary SQLite file through aiosqlite.
+
+Usage (from backend/):
+    uv run --with aiosqlite python -m scripts.bench_connection_hold [rows] [database url]
+"""
+
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import AsyncGenerator
+from uuid import uuid4
+
+import httpx
+from fastapi import APIRouter, Depends, FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.routing import APIRoute
+from sqlalchemy import Column, MetaData, Table, event
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from app.api.routing import SessionReleasingRoute
+from app.models.neuri.model import Mission, MissionType
+from app.models.neuri.schema import MissionRead
+from app.repositories.base import AsyncSession, loaded_columns
+from app.repositories.mission import BY_USER_STMT
+from app.response_models import SuccessListResponse
+
+POOL_SIZE = 2
+REQUESTS = 40
+CONCURRENCY = 8
+USER_ID = uuid4()
+
+# SQLite has no tsvector, so missions is created without the Postgres-only search column, which reads never load
+SQLITE_MISSIONS = Table(
+    "missions", MetaData(), *[Column(col.name, col.type, primary_key=col.primary_key) for col in loaded_columns(Mission)]
+)
+
+
+async def seed(engine: AsyncEngine, count: int) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLITE_MISSIONS.create)
+    now = datetime.now()
+    async with AsyncSession(engine) as session:
+        session.add_all(
+            Mission(
+                title=f"Mission {i}",
+                body="Remember to breathe " * 5,
+                type=MissionType.TASK,
+                user_id=USER_ID,
+                true_deadline=now + timedelta(days=i % 30),
+                personal_deadline=now + timedelta(days=i % 30, hours=-4),
+                is_complete=i % 3 == 0,
+                heaviness=i % 10 + 1,
+                priority=(i * 7) % 10 + 1,
+            )
+            for i in range(count)
+        )
+        await session.commit()
+
+
+def build_app(engine: AsyncEngine) -> FastAPI:
+    sessions = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+    # Same lifecycle as app.repositories.base.get_session, bound to the benchmark engine
+    async def get_bench_session() -> AsyncGenerator[AsyncSession, None]:
+        session = sessions()
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+    async def list_missions(session: AsyncSession = Depends(get_bench_session)) -> SuccessListResponse[MissionRead]:
+        missions = (await session.scalars(BY_USER_STMT, {"user_id": USER_ID})).all()
+        return SuccessListResponse(data=missions)  # type: ignore[arg-type]
+
+    app = FastAPI()
+    app.add_middleware(GZipMiddleware, minimum_size=1000, compresslevel=6)
+    for prefix, route_class in (("/before", APIRoute), ("/after", SessionReleasingRoute)):
+        router = APIRouter(prefix=prefix, route_class=route_class)
+        router.add_api_route("/missions", list_missions, response_model=SuccessListResponse[MissionRead])
+        app.include_router(router)
+    return app
+
+
+class HoldTimes:
+    """Checkout to checkin time of every pooled connection, in seconds"""
+
+    def __init__(self, engine: AsyncEngine) -> None:
+        self.samples: list[float] = []
+        event.listen(engine.sync_engine, "checkout", self._checkout)
+        event.listen(engine.sync_engine, "checkin", self._checkin)
+
+    def _checkout(self, dbapi_connection: object, record: object, proxy: object) -> None:
+        record.info["checked_out_at"] = time.perf_counter()  # type: ignore[attr-defined]
+
+    def _checkin(self, dbapi_connection: object, record: object) -> None:
+        checked_out_at = record.info.pop("checked_out_at", None)  # type: ignore[attr-defined]
+        if checked_out_at is not None:
+            self.samples.append(time.perf_counter() - checked_out_at)
+
+
+async def run(client: httpx.AsyncClient, holds: HoldTimes, path: str) -> tuple[list[float], float]:
+    await client.get(path)  # warm up
+    holds.samples.clear()
+    limit = asyncio.Semaphore(CONCURRENCY)
+
+    async def one() -> None:
+        async with limit:
+            response = await client.get(path, headers={"Accept-Encoding": "gzip"})
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*[one() for _ in range(REQUESTS)])
+    return list(holds.samples), time.perf_counter() - start
+
+
+async def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    url = sys.argv[2] if len(sys.argv) > 2 else f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/bench.db"
+    engine = create_async_engine(url, pool_size=POOL_SIZE, max_overflow=0)
+    await seed(engine, count)
+    holds = HoldTimes(engine)
+
+    transport = httpx.ASGITransport(app=build_app(engine))
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        before, after = (await client.get("/before/missions")).content, (await client.get("/after/missions")).content
+        assert before == after, "releasing the session changed the response body"
+
+        print(f"{count} rows, {REQUESTS} requests, {CONCURRENCY} concurrent, pool of {POOL_SIZE}")
+        print(f"{'route':<10}{'hold mean (ms)':>16}{'hold p95 (ms)':>16}{'wall (ms)':>12}")
+        for name in ("before", "after"):
+            samples, wall = await run(client, holds, f"/{name}/missions")
+            p95 = statistics.quantiles(samples, n=20)[-1]
+            print(f"{name:<10}{statistics.mean(samples) * 1000:>16.1f}{p95 * 1000:>16.1f}{wall * 1000:>12.1f}")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,133 @@
+"""
+Measure a 10k-row mission list from query to JSON body, before and after the row/TypeAdapter path.
+
+Before: the query loads ORM instances, every instance goes through MissionRead.model_validate, then FastAPI dumps the
+response and validates it again against response_model before rendering it.
+After: the query selects plain column rows (list_page_rows), the page is validated in one call with the cached
+list TypeAdapter and trusted_list_response serializes it once.
+
+Both paths run the same statement against an in-memory SQLite database through a real FastAPI route and must
+produce the same body. SQLite stands in for Postgres here; its driver decodes UUIDs and datetimes in Python, which
+asyncpg does in C, so "fetch" overstates the time both paths spend in the driver.
+
+Usage (from backend/):
+    uv run python -m scripts.bench_response_conversion [rows]
+"""
+
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Callable
+from uuid import uuid4
+
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+from sqlalchemy import Column, MetaData, Table, create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.models.neuri.model import Mission, MissionType
+from app.models.neuri.schema import MissionRead
+from app.repositories.base import Row, loaded_columns
+from app.repositories.mission import BY_USER_STMT
+from app.response_models import SuccessListResponse, trusted_list_response
+from app.services.mission import MISSION_LIST_ADAPTER
+
+REPEAT = 5
+USER_ID = uuid4()
+
+# One shared connection, so route threads see the seeded in-memory database
+engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+ROW_STMT = BY_USER_STMT.with_only_columns(*loaded_columns(Mission))
+# SQLite has no tsvector, so missions is created without the Postgres-only search column, which reads never load
+SQLITE_MISSIONS = Table(
+    "missions", MetaData(), *[Column(col.name, col.type, primary_key=col.primary_key) for col in loaded_columns(Mission)]
+)
+
+
+def seed(count: int) -> None:
+    SQLITE_MISSIONS.create(engine)
+    now = datetime.now()
+    with Session(engine) as session:
+        session.add_all(
+            Mission(
+                title=f"Mission {i}",
+                body="Remember to breathe " * 5,
+                type=MissionType.TASK,
+                user_id=USER_ID,
+                true_deadline=now + timedelta(days=i % 30),
+                personal_deadline=now + timedelta(days=i % 30, hours=-4),
+                is_complete=i % 3 == 0,
+                heaviness=i % 10 + 1,
+                priority=(i * 7) % 10 + 1,
+            )
+            for i in range(count)
+        )
+        session.commit()
+
+
+def fetch_instances() -> list[Mission]:
+    with Session(engine) as session:
+        return list(session.scalars(BY_USER_STMT, {"user_id": USER_ID}).all())
+
+
+def fetch_rows() -> list[Row]:
+    with Session(engine) as session:
+        result = session.execute(ROW_STMT, {"user_id": USER_ID})
+        keys = list(result.keys())
+        return [dict(zip(keys, row)) for row in result.all()]
+
+
+def orm_convert() -> list[MissionRead]:
+    return [MissionRead.model_validate(m) for m in fetch_instances()]
+
+
+def row_convert() -> list[MissionRead]:
+    return MISSION_LIST_ADAPTER.validate_python(fetch_rows())
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/before", response_model=SuccessListResponse[MissionRead])
+    def before() -> SuccessListResponse[MissionRead]:
+        return SuccessListResponse(data=orm_convert())
+
+    @app.get("/after", response_model=SuccessListResponse[MissionRead])
+    def after() -> Response:
+        return trusted_list_response(MissionRead, row_convert())
+
+    return app
+
+
+def best_of(fn: Callable[[], object]) -> float:
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    seed(count)
+    client = TestClient(build_app())
+    assert client.get("/before").content == client.get("/after").content, "row path changed the response body"
+
+    instances, rows = fetch_instances(), fetch_rows()
+    stages = [
+        ("fetch", fetch_instances, fetch_rows),
+        ("convert", lambda: [MissionRead.model_validate(m) for m in instances],
+         lambda: MISSION_LIST_ADAPTER.validate_python(rows)),
+        ("full request", lambda: client.get("/before"), lambda: client.get("/after")),
+    ]
+    print(f"{count} rows, best of {REPEAT}")
+    print(f"{'stage':<16}{'before (ms)':>14}{'after (ms)':>14}{'speedup':>10}")
+    for name, before, after in stages:
+        before_ms, after_ms = best_of(before), best_of(after)
+        print(f"{name:<16}{before_ms:>14.1f}{after_ms:>14.1f}{before_ms / after_ms:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Measure the per-query Python overhead of the mission repository statements, before and after pre-building them.
+
+Every execution builds (or reuses) a statement and computes its cache key to look up the compiled SQL in the
+engine's compiled cache; that is the Python work that happens before anything goes to the database, so this
+benchmark needs no database connection.
+
+Usage (from backend/):
+    uv run python -m scripts.bench_statement_cache [iterations]
+"""
+
+import sys
+import timeit
+from datetime import date, datetime
+from uuid import uuid4
+
+from sqlalchemy import func, select
+
+from app.models.neuri.model import Mission
+from app.repositories import mission as mission_repo
+
+USER_ID = uuid4()
+
+
+def build_list_by_user() -> None:
+    stmt = select(Mission).where(Mission.user_id == USER_ID)
+    stmt._generate_cache_key()
+
+
+def build_overdue() -> None:
+    stmt = select(Mission).where(
+        Mission.user_id == USER_ID,
+        Mission.true_deadline < datetime.now(),
+        Mission.is_complete == False,  # noqa: E712
+    )
+    stmt._generate_cache_key()
+
+
+def build_today() -> None:
+    stmt = select(Mission).where(
+        Mission.user_id == USER_ID,
+        Mission.personal_deadline.isnot(None),
+        func.date(Mission.personal_deadline) == date.today(),
+    )
+    stmt._generate_cache_key()
+
+
+def prebuilt_list_by_user() -> None:
+    mission_repo.BY_USER_STMT._generate_cache_key()
+
+
+def prebuilt_overdue() -> None:
+    mission_repo.OVERDUE_STMT._generate_cache_key()
+
+
+def prebuilt_today() -> None:
+    mission_repo.TODAY_STMT._generate_cache_key()
+
+
+CASES = [
+    ("list_by_user", build_list_by_user, prebuilt_list_by_user),
+    ("get_overdue_missions", build_overdue, prebuilt_overdue),
+    ("get_today_missions", build_today, prebuilt_today),
+]
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    print(f"{'query':<24}{'before (us)':>14}{'after (us)':>14}{'speedup':>10}")
+    for name, before, after in CASES:
+        before_us = min(timeit.repeat(before, number=iterations, repeat=3)) / iterations * 1e6
+        after_us = min(timeit.repeat(after, number=iterations, repeat=3)) / iterations * 1e6
+        print(f"{name:<24}{before_us:>14.2f}{after_us:>14.2f}{before_us / after_us:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
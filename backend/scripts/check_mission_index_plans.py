@@ -0,0 +1,244 @@
+"""
+Check that every MissionRepository read is planned on the index built for it.
+
+Seeds users with categories and missions (random types, completion, priority, heaviness and deadlines), runs
+ANALYZE, then calls each repository method the way the API does and captures the SQL it sends. Each statement is
+prepared server-side and explained twice: with a custom plan for the actual values, and with the generic plan that
+asyncpg's prepared statements switch to after a few executions. Both plans must scan the expected index.
+
+Needs the configured Postgres database with migrations applied. Everything runs in one transaction that is rolled back.
+
+Usage (from backend/):
+    uv run python -m scripts.check_mission_index_plans [users] [missions per user]
+"""
+
+import asyncio
+import json
+import sys
+from datetime import date, datetime
+from typing import Any, Awaitable, Callable, Iterator, Sequence
+from uuid import UUID, uuid4
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.neuri.model import MissionType
+from app.repositories.base import PageParams, SessionCreator, engine
+from app.repositories.mission import MissionRepository
+
+repo = MissionRepository()
+page = PageParams(limit=20)
+
+SEED_USERS = text(
+    """
+    INSERT INTO users (id, email, name, created_at, updated_at)
+    SELECT gen_random_uuid(), 'plan-check-' || g || '-' || :tag || '@example.com', :tag, now(), now()
+    FROM generate_series(1, :users) g
+    """
+)
+SEED_CATEGORIES = text(
+    """
+    INSERT INTO categories (id, name, user_id, created_at, updated_at)
+    SELECT gen_random_uuid(), 'category ' || g, u.id, now(), now()
+    FROM users u CROSS JOIN generate_series(1, 5) g
+    WHERE u.name = :tag
+    """
+)
+SEED_MISSIONS = text(
+    """
+    INSERT INTO missions (
+        id, title, type, user_id, category_id, true_deadline, personal_deadline, is_complete, heaviness, priority,
+        created_at, updated_at
+    )
+    SELECT
+        gen_random_uuid(),
+        'mission ' || g,
+        (ARRAY['TASK', 'PROJECT', 'NOTE', 'REMINDER'])[1 + g % 4]::missiontype,
+        u.id,
+        CASE WHEN g % 3 > 0 THEN c.ids[1 + g % 5] END,
+        CASE WHEN random() < 0.8 THEN now() - interval '30 days' + random() * interval '60 days' END,
+        CASE WHEN random() < 0.6 THEN now() - interval '30 days' + random() * interval '60 days' END,
+        random() < 0.7,
+        1 + floor(random() * 10)::int,
+        1 + floor(random() * 10)::int,
+        now() - random() * interval '365 days',
+        now()
+    FROM users u
+    CROSS JOIN LATERAL (SELECT array_agg(id ORDER BY id) AS ids FROM categories WHERE user_id = u.id) c
+    CROSS JOIN generate_series(1, :missions) g
+    WHERE u.name = :tag
+    """
+)
+# Attach a few of the user's missions to one of their projects
+SEED_SUB_TASKS = text(
+    """
+    UPDATE missions SET parent_project_id = :project_id
+    WHERE id IN (
+        SELECT id FROM missions WHERE user_id = :user_id AND id <> :project_id ORDER BY created_at LIMIT 10
+    )
+    """
+)
+
+
+def checks(
+    user_id: UUID, category_id: UUID, project_id: UUID
+) -> list[tuple[str, Callable[[AsyncSession], Awaitable[object]], set[str]]]:
+    return [
+        ("list_by_user", lambda s: repo.list_by_user(s, user_id, page), {"ix_missions_user_id_created_at"}),
+        (
+            "list_by_category",
+            lambda s: repo.list_by_category(s, user_id, category_id, page),
+            {"ix_missions_user_id_category_id_created_at"},
+        ),
+        (
+            "list_by_type",
+            lambda s: repo.list_by_type(s, user_id, MissionType.TASK, page),
+            {"ix_missions_user_id_type_created_at"},
+        ),
+        (
+            "list_by_user_and_type",
+            lambda s: repo.list_by_user_and_type(s, user_id, MissionType.NOTE),
+            {"ix_missions_user_id_type_created_at"},
+        ),
+        (
+            "list_sub_tasks",
+            lambda s: repo.list_sub_tasks(s, user_id, project_id, page),
+            {"ix_missions_parent_project_id"},
+        ),
+        (
+            "list_pending_by_user",
+            lambda s: repo.list_pending_by_user(s, user_id),
+            {"ix_missions_user_id_created_at_pending"},
+        ),
+        (
+            "get_today_missions",
+            lambda s: repo.get_today_missions(s, user_id, page),
+            {"ix_missions_user_id_personal_deadline"},
+        ),
+        (
+            "get_overdue_missions",
+            lambda s: repo.get_overdue_missions(s, user_id, page),
+            {"ix_missions_user_id_true_deadline_pending"},
+        ),
+        (
+            "get_high_priority_missions",
+            lambda s: repo.get_high_priority_missions(s, user_id, page),
+            {"ix_missions_user_id_created_at_high_priority"},
+        ),
+        (
+            "get_heavy_missions",
+            lambda s: repo.get_heavy_missions(s, user_id, page),
+            {"ix_missions_user_id_created_at_heavy"},
+        ),
+        (
+            "search",
+            lambda s: repo.search(s, user_id, "mision 42", page),
+            {"ix_missions_user_id_search_vector", "ix_missions_user_id_title_trgm"},
+        ),
+        ("get_recent_missions", lambda s: repo.get_recent_missions(s, user_id), {"ix_missions_user_id_created_at"}),
+        ("count_by_status", lambda s: repo.count_by_status(s, user_id), {"ix_missions_user_id_created_at"}),
+        (
+            "get_ai_context",
+            lambda s: repo.get_ai_context(s, user_id, limits={"recent": 10, "overdue": 10, "today": 10}),
+            {
+                "ix_missions_user_id_created_at",
+                "ix_missions_user_id_true_deadline_pending",
+                "ix_missions_user_id_personal_deadline",
+            },
+        ),
+    ]
+
+
+def literal(value: object) -> str:
+    """Render a driver parameter as an SQL literal for EXECUTE, the server infers its type from the statement"""
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, (str, UUID, datetime, date)):
+        return "'" + str(value).replace("'", "''") + "'"
+    raise TypeError(f"Unsupported parameter {value!r}")
+
+
+def index_names(plan: dict[str, Any]) -> Iterator[str]:  # type: ignore[explicit-any]
+    if "Index Name" in plan:
+        yield plan["Index Name"]
+    for child in plan.get("Plans", ()):
+        yield from index_names(child)
+
+
+async def explain(session: AsyncSession, statement: str, parameters: tuple[object, ...], mode: str) -> set[str]:
+    conn = await session.connection()
+    await conn.exec_driver_sql(f"SET LOCAL plan_cache_mode = {mode}")
+    await conn.exec_driver_sql(f"PREPARE plan_check AS {statement}")
+    try:
+        args = f"({', '.join(literal(value) for value in parameters)})" if parameters else ""
+        raw = (await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) EXECUTE plan_check{args}")).scalar_one()
+    finally:
+        await conn.exec_driver_sql("DEALLOCATE plan_check")
+    plan = json.loads(raw) if isinstance(raw, str) else raw
+    return set(index_names(plan[0]["Plan"]))
+
+
+async def main() -> None:
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    missions = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    tag = f"plan-check-{uuid4()}"
+
+    captured: list[tuple[str, tuple[object, ...]]] = []
+
+    def capture(conn: object, cursor: object, statement: str, parameters: Sequence[object], *args: object) -> None:
+        captured.append((statement, tuple(parameters or ())))
+
+    failed = False
+    async with SessionCreator() as session:
+        try:
+            await session.execute(text("SELECT setseed(0.42)"))
+            await session.execute(SEED_USERS, {"tag": tag, "users": users})
+            await session.execute(SEED_CATEGORIES, {"tag": tag})
+            await session.execute(SEED_MISSIONS, {"tag": tag, "missions": missions})
+            user_id, category_id = (
+                await session.execute(
+                    text(
+                        "SELECT u.id, c.id FROM users u JOIN categories c ON c.user_id = u.id "
+                        "WHERE u.name = :tag ORDER BY u.id, c.id LIMIT 1"
+                    ),
+                    {"tag": tag},
+                )
+            ).one()
+            project_id = (
+                await session.execute(
+                    text("SELECT id FROM missions WHERE user_id = :user_id AND type = 'PROJECT' LIMIT 1"),
+                    {"user_id": user_id},
+                )
+            ).scalar_one()
+            await session.execute(SEED_SUB_TASKS, {"user_id": user_id, "project_id": project_id})
+            await session.execute(text("ANALYZE users, categories, missions"))
+            print(f"seeded {users} users x {missions} missions")
+
+            for name, call, expected in checks(user_id, category_id, project_id):
+                captured.clear()
+                event.listen(engine.sync_engine, "before_cursor_execute", capture)
+                try:
+                    await call(session)
+                finally:
+                    event.remove(engine.sync_engine, "before_cursor_execute", capture)
+                statement, parameters = captured[-1]
+
+                for mode in ("force_custom_plan", "force_generic_plan"):
+                    used = await explain(session, statement, parameters, mode)
+                    ok = expected <= used
+                    failed |= not ok
+                    status = "ok" if ok else f"MISSING {sorted(expected - used)}"
+                    print(f"{name:<28} {mode:<20} {status:<10} uses {sorted(used)}")
+        finally:
+            await session.rollback()
+
+    if failed:
+        raise SystemExit("some MissionRepository queries don't use their index")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,147 @@
+"""
+Hammer one user's reward counters from many concurrent transactions and check that no increment is lost.
+
+Every worker opens its own session and adds 1 point and 1 completed task, the way concurrent mission completions
+do. The user starts without a reward row, so the first writes also race to create it. The atomic path
+(RewardRepository.increment) is asserted: no worker fails, the user ends with a single reward row holding exactly one
+point and one task per worker, and the points returned to the workers are exactly 1..workers (every increment saw all
+the ones committed before it). Any mismatch exits non-zero. For comparison, the same load is first run through the
+previous read-modify-write pattern, whose lost updates are reported but not treated as a failure.
+
+Needs the configured Postgres database with migrations applied. The throwaway user and its reward are deleted after.
+
+Usage (from backend/):
+    uv run python -m scripts.stress_reward_counters [workers]
+"""
+
+import asyncio
+import sys
+from typing import Awaitable, Callable
+from uuid import UUID, uuid4
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import IntegrityError
+
+from app.models.neuri.model import Reward, User
+from app.repositories.base import AsyncSession, managed_session
+from app.repositories.reward import RewardRepository
+
+repo = RewardRepository()
+
+
+async def atomic(session: AsyncSession, user_id: UUID) -> int:
+    reward = await repo.increment(session, user_id, points=1, total_tasks_done=1)
+    return reward.points
+
+
+async def read_modify_write(session: AsyncSession, user_id: UUID) -> None:
+    # What add_points_for_mission and increment_tasks_done used to do
+    reward = await repo.get_by_user(session, user_id)
+    if reward is None:
+        reward = Reward(user_id=user_id, points=0, streak=0, total_tasks_done=0)
+        session.add(reward)
+    reward.points += 1
+    reward.total_tasks_done += 1
+
+
+async def run(name: str, write: Callable[[AsyncSession, UUID], Awaitable[None]], workers: int) -> None:
+    """Run `workers` concurrent writes for a fresh user and report the lost updates"""
+    async with managed_session() as session:
+        user = User(email=f"stress-{uuid4()}@example.com", name="reward stress test")
+        session.add(user)
+        await session.flush()
+        user_id = user.id
+
+    start = asyncio.Event()
+    failed = 0
+
+    async def worker() -> None:
+        nonlocal failed
+        await start.wait()
+        try:
+            async with managed_session() as session:
+                await write(session, user_id)
+        except IntegrityError:
+            # Lost the race to create the reward row
+            failed += 1
+
+    tasks = [asyncio.create_task(worker()) for _ in range(workers)]
+    start.set()
+    await asyncio.gather(*tasks)
+
+    try:
+        async with managed_session() as session:
+            reward = await repo.get_by_user(session, user_id)
+            points = reward.points if reward else 0
+            tasks_done = reward.total_tasks_done if reward else 0
+    finally:
+        async with managed_session() as session:
+            await session.execute(delete(User).where(User.id == user_id))
+
+    lost = workers - failed - points
+    print(
+        f"{name:<20} workers={workers} failed={failed} points={points} tasks_done={tasks_done} "
+        f"lost_updates={lost}"
+    )
+
+
+async def check_atomic(workers: int) -> list[str]:
+    """Run `workers` concurrent increments for a fresh user and return the violated expectations"""
+    async with managed_session() as session:
+        user = User(email=f"stress-{uuid4()}@example.com", name="reward stress test")
+        session.add(user)
+        await session.flush()
+        user_id = user.id
+
+    start = asyncio.Event()
+
+    async def worker() -> int:
+        await start.wait()
+        async with managed_session() as session:
+            return await atomic(session, user_id)
+
+    tasks = [asyncio.create_task(worker()) for _ in range(workers)]
+    start.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    try:
+        async with managed_session() as session:
+            rows = (await session.execute(select(func.count()).where(Reward.user_id == user_id))).scalar_one()
+            reward = await repo.get_by_user(session, user_id) if rows == 1 else None
+    finally:
+        async with managed_session() as session:
+            await session.execute(delete(User).where(User.id == user_id))
+
+    errors = [result for result in results if isinstance(result, BaseException)]
+    returned = sorted(result for result in results if isinstance(result, int))
+    failures = []
+    if errors:
+        failures.append(f"{len(errors)} of {workers} increments failed, first: {errors[0]!r}")
+    if rows != 1:
+        failures.append(f"expected 1 reward row, found {rows}")
+    if reward is not None:
+        if reward.points != workers:
+            failures.append(f"expected points={workers}, found {reward.points}")
+        if reward.total_tasks_done != workers:
+            failures.append(f"expected total_tasks_done={workers}, found {reward.total_tasks_done}")
+        if reward.streak != 0:
+            failures.append(f"expected streak=0, found {reward.streak}")
+    if not errors and returned != list(range(1, workers + 1)):
+        failures.append("increments returned duplicate or missing point totals")
+
+    print(f"{'atomic upsert':<20} workers={workers} rows={rows} " + ("ok" if not failures else "FAILED"))
+    return failures
+
+
+async def main() -> None:
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    await run("read-modify-write", read_modify_write, workers)
+    failures = await check_atomic(workers)
+    for failure in failures:
+        print(f"  {failure}", file=sys.stderr)
+    if failures:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())